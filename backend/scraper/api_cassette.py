@@ -0,0 +1,105 @@
+"""
+Record/replay support for Congress.gov API traffic.
+
+A cassette is a gzip-compressed JSON-lines file where every line holds one
+API response keyed by its endpoint and query parameters. Recording a live run
+produces a cassette that can later be replayed without network access, which
+makes scraper runs repeatable for profiling and regression tracking.
+"""
+
+import gzip
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Parameters that never influence the response body and must not be stored
+_IGNORED_PARAMS = {'api_key', 'format'}
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replayed request has no recorded response."""
+
+
+def request_key(endpoint: str, params: Optional[Dict] = None) -> str:
+    """Build a stable key for a request from its endpoint and parameters."""
+    params = params or {}
+    kept = sorted((k, str(v)) for k, v in params.items() if k not in _IGNORED_PARAMS)
+    query = '&'.join(f"{k}={v}" for k, v in kept)
+    endpoint = endpoint.strip('/')
+    return f"{endpoint}?{query}" if query else endpoint
+
+
+class CassetteRecorder:
+    """Appends every API response to a compressed cassette file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._lock = threading.Lock()
+        self.recorded = 0
+        logger.info(f"Recording API responses to {path}")
+
+    def record(self, endpoint: str, params: Optional[Dict], response: Dict):
+        line = json.dumps({'key': request_key(endpoint, params), 'response': response})
+        with self._lock:
+            self._file.write(line + '\n')
+            self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                logger.info(f"Recorded {self.recorded} API responses to {self.path}")
+
+
+class CassettePlayer:
+    """Serves recorded API responses with optional synthetic latency."""
+
+    def __init__(self, path: str, latency: float = 0.0):
+        self.path = path
+        self.latency = latency
+        self._responses = defaultdict(deque)
+        self._last = {}
+        self._lock = threading.Lock()
+        self.served = 0
+        self.misses = 0
+
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._responses[entry['key']].append(entry['response'])
+
+        logger.info(f"Loaded {sum(len(v) for v in self._responses.values())} recorded responses from {path}")
+
+    def play(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+        """Return the next recorded response for a request.
+
+        Responses recorded several times for the same key are served in
+        recording order; once exhausted, the last one is repeated.
+        """
+        key = request_key(endpoint, params)
+        with self._lock:
+            queue = self._responses.get(key)
+            if queue:
+                response = queue.popleft()
+                self._last[key] = response
+            elif key in self._last:
+                response = self._last[key]
+            else:
+                self.misses += 1
+                raise CassetteMissError(f"No recorded response for {key}")
+            self.served += 1
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+        return response
+
+    def close(self):
+        logger.info(f"Replayed {self.served} API responses from {self.path} ({self.misses} misses)")
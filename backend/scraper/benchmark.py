@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Scraper throughput benchmark.
+
+Starts the local mock Congress API (mock_congress_api.py), runs a
+CongressScraperApp mode against it once per concurrency/batch-size setting and
+reports bills/minute, p50/p95 per-bill enrichment latency, p50/p95 batch write
+latency and peak RSS. Each setting runs in its own subprocess so peak RSS is
+not polluted by earlier runs.
+
+Writes go to the Supabase instance configured in the environment, which must
+be a local stack (`supabase start`) unless --allow-remote is given. Results are
+appended as JSON lines to --results so numbers can be tracked over time.
+
+Usage:
+    python benchmark.py --mode daily --bills 500 --workers 1 4 8 --batch-sizes 25 100
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+from urllib.parse import urlparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+logger = logging.getLogger(__name__)
+
+LOCAL_HOSTS = {'localhost', '127.0.0.1', '0.0.0.0', 'host.docker.internal'}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return 'unknown'
+
+
+def run_one(mode: str, days: int, limit: int, query: str) -> Dict:
+    """Run a single scraper mode in this process and collect timings."""
+    from main import CongressScraperApp
+
+    app = CongressScraperApp()
+    enrich_latencies = []
+    write_latencies = []
+    stored = []
+
+    enrich_bill = app._enrich_bill
+    insert_bills = app.db.insert_bills
+
+    def timed_enrich(bill, *args):
+        started = time.perf_counter()
+        try:
+            return enrich_bill(bill, *args)
+        finally:
+            enrich_latencies.append(time.perf_counter() - started)
+
+    def timed_insert(bills):
+        started = time.perf_counter()
+        try:
+            bill_ids = insert_bills(bills)
+            stored.extend(bill_ids)
+            return bill_ids
+        finally:
+            write_latencies.append(time.perf_counter() - started)
+
+    app._enrich_bill = timed_enrich
+    app.db.insert_bills = timed_insert
+
+    started = time.perf_counter()
+    try:
+        if mode == 'daily':
+            app.daily_update_with_notifications(days=days, mode='benchmark')
+        elif mode == 'initial':
+            app.initial_data_load()
+        elif mode == 'test':
+            app.test_mode(limit=limit)
+        elif mode == 'search':
+            app.search_and_store_bills(query)
+    finally:
+        duration = time.perf_counter() - started
+        app.close()
+
+    return {
+        'bills_enriched': len(enrich_latencies),
+        'bills_stored': len(stored),
+        'api_calls': app.scraper.request_count,
+        'duration_seconds': round(duration, 3),
+        'bills_per_minute': round(len(enrich_latencies) / duration * 60, 1) if duration else 0.0,
+        'enrich_p50_ms': round(_percentile(enrich_latencies, 50) * 1000, 1),
+        'enrich_p95_ms': round(_percentile(enrich_latencies, 95) * 1000, 1),
+        'write_p50_ms': round(_percentile(write_latencies, 50) * 1000, 1),
+        'write_p95_ms': round(_percentile(write_latencies, 95) * 1000, 1),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+    }
+
+
+def _check_database_target(allow_remote: bool):
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL', '')
+    host = urlparse(url).hostname or ''
+    if host not in LOCAL_HOSTS and not allow_remote:
+        raise SystemExit(f"Refusing to benchmark against non-local Supabase at '{url}'. "
+                         "Point NEXT_PUBLIC_SUPABASE_URL at a local stack or pass --allow-remote.")
+
+
+def run_suite(args) -> List[Dict]:
+    from mock_congress_api import MockCongressServer, SyntheticCongress
+
+    data = SyntheticCongress(bills=args.bills, days=args.days, actions=args.actions,
+                             cosponsors=args.cosponsors)
+    server = MockCongressServer(data, latency=args.api_latency)
+    server.start_background()
+
+    revision = _git_revision()
+    results = []
+    # Deferred bills are synthetic; keep them out of the real queue and out of later runs
+    queue_dir = tempfile.TemporaryDirectory(prefix='benchmark-deferred-')
+    try:
+        for run, (workers, batch_size) in enumerate(itertools.product(args.workers, args.batch_sizes)):
+            env = dict(os.environ)
+            env.update({
+                'CONGRESS_API_BASE_URL': server.base_url + '/',
+                'CONGRESS_API_KEY': env.get('CONGRESS_API_KEY') or 'benchmark',
+                'REQUEST_DELAY': '0',
+                'MAX_WORKERS': str(workers),
+                'BATCH_SIZE': str(batch_size),
+                'LOG_LEVEL': args.log_level,
+                'DEFERRED_QUEUE_BACKEND': 'file',
+                'DEFERRED_QUEUE_PATH': os.path.join(queue_dir.name, f"deferred_bills_{run}.json"),
+            })
+            env.pop('DISCORD_WEBHOOK_URL', None)
+
+            command = [sys.executable, os.path.abspath(__file__), '--run-one',
+                       '--mode', args.mode, '--days', str(args.days),
+                       '--limit', str(args.limit), '--query', args.query]
+            logger.info(f"Running {args.mode} with workers={workers} batch_size={batch_size}...")
+            output = subprocess.run(command, env=env, capture_output=True, text=True)
+            if output.returncode != 0:
+                logger.error(f"Benchmark run failed:\n{output.stderr[-2000:]}")
+                continue
+
+            metrics = json.loads(output.stdout.strip().splitlines()[-1])
+            results.append({
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'revision': revision,
+                'mode': args.mode,
+                'bills': args.bills,
+                'api_latency_ms': round(args.api_latency * 1000, 1),
+                'workers': workers,
+                'batch_size': batch_size,
+                **metrics,
+            })
+    finally:
+        server.shutdown()
+        queue_dir.cleanup()
+
+    return results
+
+
+def _print_table(results: List[Dict]):
+    columns = ['workers', 'batch_size', 'bills_enriched', 'api_calls', 'bills_per_minute',
+               'enrich_p50_ms', 'enrich_p95_ms', 'write_p50_ms', 'write_p95_ms', 'peak_rss_mb']
+    print(' | '.join(f"{c:>14}" for c in columns))
+    for row in results:
+        print(' | '.join(f"{row.get(c, ''):>14}" for c in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Congress scraper throughput benchmark')
+    parser.add_argument('--mode', choices=['daily', 'initial', 'test', 'search'], default='daily')
+    parser.add_argument('--bills', type=int, default=200, help='Number of synthetic bills served by the mock API')
+    parser.add_argument('--days', type=int, default=30, help='Window the synthetic bills are spread over')
+    parser.add_argument('--actions', type=int, default=8, help='Actions per synthetic bill')
+    parser.add_argument('--cosponsors', type=int, default=12, help='Cosponsors per synthetic bill')
+    parser.add_argument('--limit', type=int, default=20, help='Bill limit for test mode')
+    parser.add_argument('--query', type=str, default='synthetic', help='Query for search mode')
+    parser.add_argument('--api-latency', type=float, default=0.05, help='Mock API latency per request in seconds')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4], help='MAX_WORKERS settings to sweep')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[100], help='BATCH_SIZE settings to sweep')
+    parser.add_argument('--results', type=str, default='benchmark_results.jsonl', help='JSON-lines file results are appended to')
+    parser.add_argument('--allow-remote', action='store_true', help='Allow writing to a non-local Supabase instance')
+    parser.add_argument('--log-level', type=str, default='WARNING')
+    parser.add_argument('--run-one', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        metrics = run_one(args.mode, args.days, args.limit, args.query)
+        print(json.dumps(metrics))
+        return
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    _check_database_target(args.allow_remote)
+
+    results = run_suite(args)
+    if not results:
+        raise SystemExit("No benchmark runs completed")
+
+    _print_table(results)
+    with open(args.results, 'a') as f:
+        for row in results:
+            f.write(json.dumps(row) + '\n')
+    logger.info(f"Appended {len(results)} results to {args.results}")
+
+
+if __name__ == '__main__':
+    main()
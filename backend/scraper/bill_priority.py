@@ -0,0 +1,127 @@
+"""
+Priority scoring for the bill enrichment stage.
+
+Bills are scored by how recently their latest action happened, how significant
+that action is (a bill becoming law matters more than a referral) and how much
+frontend engagement (votes, page views, analysis requests) they already have.
+Higher scores are enriched and persisted first so that runs constrained by API
+quota or time spend their budget on the most valuable bills.
+"""
+
+import heapq
+import itertools
+import math
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from dateutil.parser import parse as parse_date
+
+# Substrings of latestAction text mapped to significance, checked in order
+ACTION_SIGNIFICANCE = [
+    ('became public law', 1.0),
+    ('became private law', 1.0),
+    ('signed by president', 1.0),
+    ('vetoed', 0.95),
+    ('presented to president', 0.9),
+    ('resolving differences', 0.85),
+    ('conference report', 0.85),
+    ('passed senate', 0.8),
+    ('passed house', 0.8),
+    ('passed/agreed to', 0.8),
+    ('cloture', 0.7),
+    ('received in the', 0.6),
+    ('placed on', 0.5),
+    ('reported', 0.5),
+    ('markup', 0.4),
+    ('hearings held', 0.35),
+    ('subcommittee', 0.25),
+    ('referred to', 0.1),
+    ('introduced', 0.1),
+]
+DEFAULT_ACTION_SIGNIFICANCE = 0.2
+
+# Relative weights of the three components
+RECENCY_WEIGHT = 0.4
+SIGNIFICANCE_WEIGHT = 0.4
+ENGAGEMENT_WEIGHT = 0.2
+
+# Days after which an action's recency contribution halves
+RECENCY_HALF_LIFE_DAYS = 7.0
+
+# Engagement units (votes count double) that saturate the engagement score
+ENGAGEMENT_SATURATION = 500
+
+
+def _latest_action(bill: Dict) -> Tuple[Optional[str], str]:
+    latest_action = bill.get('latestAction') or {}
+    if isinstance(latest_action, dict):
+        return latest_action.get('actionDate'), latest_action.get('text') or ''
+    return None, str(latest_action)
+
+
+def action_significance(text: str) -> float:
+    """Score how far along the legislative process an action text is."""
+    text = (text or '').lower()
+    for needle, score in ACTION_SIGNIFICANCE:
+        if needle in text:
+            return score
+    return DEFAULT_ACTION_SIGNIFICANCE
+
+
+def recency_score(action_date: Optional[str], now: Optional[datetime] = None) -> float:
+    """Exponentially decaying score of how recent an action date is."""
+    if not action_date:
+        return 0.0
+    try:
+        acted = parse_date(action_date).replace(tzinfo=None)
+    except (ValueError, OverflowError):
+        return 0.0
+    age_days = max(0.0, ((now or datetime.now()) - acted).total_seconds() / 86400)
+    return 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+def engagement_score(metrics: Optional[Dict]) -> float:
+    """Log-scaled engagement from bill_engagement_metrics, in [0, 1]."""
+    if not metrics:
+        return 0.0
+    units = (2 * (metrics.get('total_votes') or 0)
+             + (metrics.get('analysis_requests') or 0)
+             + 0.1 * (metrics.get('page_views') or 0))
+    return min(1.0, math.log1p(units) / math.log1p(ENGAGEMENT_SATURATION))
+
+
+def score_bill(bill: Dict, engagement: Optional[Dict] = None, now: Optional[datetime] = None) -> float:
+    """Combined priority score for a bill listing entry."""
+    action_date, action_text = _latest_action(bill)
+    if not action_date:
+        action_date = bill.get('updateDate') or bill.get('introducedDate')
+    return (RECENCY_WEIGHT * recency_score(action_date, now)
+            + SIGNIFICANCE_WEIGHT * action_significance(action_text)
+            + ENGAGEMENT_WEIGHT * engagement_score(engagement))
+
+
+class EnrichmentQueue:
+    """Max-priority queue of bills awaiting enrichment.
+
+    Ties keep listing order, so with no signal the queue behaves like the
+    plain API listing.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+
+    def push(self, bill: Dict, score: float):
+        heapq.heappush(self._heap, (-score, next(self._counter), bill))
+
+    def pop(self) -> Dict:
+        return heapq.heappop(self._heap)[2]
+
+    def pop_many(self, count: int) -> List[Dict]:
+        return [self.pop() for _ in range(min(count, len(self._heap)))]
+
+    def drain(self) -> List[Dict]:
+        return self.pop_many(len(self._heap))
+
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -0,0 +1,218 @@
+"""
+Importer for GovInfo BILLSTATUS bulk data.
+
+GovInfo publishes the same bill data the Congress.gov API serves as BILLSTATUS
+XML files, one per bill, bundled in zip archives per congress and bill type
+(https://www.govinfo.gov/bulkdata/BILLSTATUS). This module stream-parses
+locally downloaded zips, directories of XML files or single XML files and maps
+each bill onto the API-shaped dict that CongressScraper.get_enriched_bill_data
+returns, so DatabaseManager.insert_bills writes exactly the same rows without
+any API calls.
+
+Zip members are read through ZipFile.open and parsed incrementally with
+ElementTree.iterparse; each <bill> element is converted and cleared as soon as
+it closes, so memory stays flat however large the archive is.
+"""
+
+import logging
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+API_BILL_URL = "https://api.congress.gov/v3/bill/{congress}/{type}/{number}?format=json"
+
+# Elements whose children are repeated records rather than named fields
+_LIST_ITEM_TAGS = {'item', 'summary'}
+
+# Text version format URLs have no type in BILLSTATUS; the API labels them by file
+_FORMAT_TYPES = {
+    '.htm': 'Formatted Text',
+    '.html': 'Formatted Text',
+    '.pdf': 'PDF',
+    '.xml': 'Formatted XML',
+}
+
+
+def _element_to_value(element: ET.Element):
+    """Convert an element to a str, a dict of fields or a list of records."""
+    children = list(element)
+    if not children:
+        return (element.text or '').strip()
+    records = [child for child in children if child.tag in _LIST_ITEM_TAGS]
+    if records:
+        # Older schema puts aggregates such as <actionTypeCounts> next to the
+        # <item> records; they are derivable from the records, so drop them
+        return [_element_to_value(child) for child in records]
+
+    value: Dict = {}
+    repeated = set()
+    for child in children:
+        child_value = _element_to_value(child)
+        if child.tag not in value:
+            value[child.tag] = child_value
+        elif child.tag in repeated:
+            value[child.tag].append(child_value)
+        else:
+            value[child.tag] = [value[child.tag], child_value]
+            repeated.add(child.tag)
+    return value
+
+
+def _as_list(value) -> List:
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict) and value:
+        return [value]
+    return []
+
+
+def _subjects(bill: Dict) -> List[Dict]:
+    subjects = bill.get('subjects') or bill.get('billSubjects') or {}
+    if not isinstance(subjects, dict):
+        return []
+    return [{'name': item.get('name')} for item in _as_list(subjects.get('legislativeSubjects'))
+            if isinstance(item, dict) and item.get('name')]
+
+
+def _summaries(bill: Dict) -> List[Dict]:
+    summaries = bill.get('summaries') or bill.get('billSummaries') or []
+    if isinstance(summaries, dict):
+        # Older schema: <summaries><billSummaries><item>...
+        summaries = summaries.get('billSummaries') or summaries.get('summary') or []
+    records = []
+    for summary in _as_list(summaries):
+        if not isinstance(summary, dict):
+            continue
+        records.append({
+            'versionCode': summary.get('versionCode'),
+            'actionDate': summary.get('actionDate'),
+            'actionDesc': summary.get('actionDesc') or summary.get('name'),
+            'updateDate': summary.get('updateDateTime') or summary.get('updateDate') or summary.get('lastSummaryUpdateDate'),
+            'text': summary.get('text'),
+        })
+    return records
+
+
+def _text_versions(bill: Dict) -> List[Dict]:
+    versions = []
+    for version in _as_list(bill.get('textVersions')):
+        if not isinstance(version, dict):
+            continue
+        formats = []
+        for fmt in _as_list(version.get('formats')):
+            if not isinstance(fmt, dict) or not fmt.get('url'):
+                continue
+            extension = os.path.splitext(fmt['url'])[1].lower()
+            formats.append({'url': fmt['url'], 'type': fmt.get('type') or _FORMAT_TYPES.get(extension, extension.lstrip('.'))})
+        versions.append({'type': version.get('type'), 'date': version.get('date'), 'formats': formats})
+    return versions
+
+
+def billstatus_to_api_bill(bill: Dict) -> Optional[Dict]:
+    """Map a parsed BILLSTATUS <bill> element onto the API's enriched bill shape."""
+    bill_type = bill.get('type') or bill.get('billType')
+    number = bill.get('number') or bill.get('billNumber')
+    congress = bill.get('congress')
+    if not (bill_type and number and congress):
+        return None
+
+    policy_area = bill.get('policyArea')
+    latest_action = bill.get('latestAction')
+
+    return {
+        'congress': int(congress),
+        'type': bill_type.upper(),
+        'number': str(number),
+        'url': API_BILL_URL.format(congress=congress, type=bill_type.lower(), number=number),
+        'title': bill.get('title'),
+        'introducedDate': bill.get('introducedDate'),
+        'updateDate': bill.get('updateDate'),
+        'originChamber': bill.get('originChamber'),
+        'latestAction': latest_action if isinstance(latest_action, dict) else {},
+        'policyArea': policy_area if isinstance(policy_area, dict) else {},
+        'constitutionalAuthorityStatementText': bill.get('constitutionalAuthorityStatementText') or None,
+        'sponsors': _as_list(bill.get('sponsors')),
+        'cosponsors': _as_list(bill.get('cosponsors')),
+        'actions': _as_list(bill.get('actions')),
+        'cboCostEstimates': _as_list(bill.get('cboCostEstimates')),
+        'subjects': _subjects(bill),
+        'summaries': _summaries(bill),
+        'textVersions': _text_versions(bill),
+        'source': 'govinfo-billstatus',
+    }
+
+
+def parse_billstatus(stream) -> Iterator[Dict]:
+    """Yield API-shaped bills from a BILLSTATUS XML stream."""
+    context = ET.iterparse(stream, events=('start', 'end'))
+    root = None
+    depth = 0
+    for event, element in context:
+        if event == 'start':
+            if root is None:
+                root = element
+            depth += 1
+            continue
+
+        depth -= 1
+        # <billStatus><bill>: the bill element sits directly under the root
+        if element.tag == 'bill' and depth == 1:
+            bill = billstatus_to_api_bill(_element_to_value(element))
+            if bill:
+                yield bill
+            root.clear()
+
+
+def iter_billstatus_files(paths: Iterable[str]) -> Iterator[Dict]:
+    """Yield API-shaped bills from zip archives, directories and XML files."""
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(os.listdir(path))
+            yield from iter_billstatus_files(
+                os.path.join(path, name) for name in names
+                if name.lower().endswith(('.zip', '.xml'))
+            )
+        elif path.lower().endswith('.zip'):
+            logger.info(f"Importing BILLSTATUS archive {path}")
+            with zipfile.ZipFile(path) as archive:
+                for name in archive.namelist():
+                    if not name.lower().endswith('.xml'):
+                        continue
+                    try:
+                        with archive.open(name) as member:
+                            yield from parse_billstatus(member)
+                    except ET.ParseError as e:
+                        logger.error(f"Skipping malformed {name} in {path}: {e}")
+        elif path.lower().endswith('.xml'):
+            try:
+                with open(path, 'rb') as f:
+                    yield from parse_billstatus(f)
+            except ET.ParseError as e:
+                logger.error(f"Skipping malformed {path}: {e}")
+        else:
+            logger.warning(f"Skipping {path}: expected a .zip, .xml or directory")
+
+
+def bulk_import(db, paths: Iterable[str], batch_size: int = 100) -> Dict:
+    """Stream bills from BILLSTATUS files into the database in batches."""
+    stats = {'bills_parsed': 0, 'bills_stored': 0}
+    batch: List[Dict] = []
+
+    def flush():
+        stored = db.insert_bills(batch)
+        stats['bills_stored'] += len(stored)
+        logger.info(f"Imported {stats['bills_stored']}/{stats['bills_parsed']} bills")
+        batch.clear()
+
+    for bill in iter_billstatus_files(paths):
+        stats['bills_parsed'] += 1
+        batch.append(bill)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    return stats
@@ -0,0 +1,116 @@
+"""
+Per-endpoint circuit breakers for the Congress.gov API.
+
+After CIRCUIT_FAILURE_THRESHOLD consecutive outage-like failures (timeouts,
+connection errors, 429 and 5xx responses) an endpoint's breaker opens and
+requests to it fail immediately with CircuitOpenError instead of being retried.
+Once CIRCUIT_RECOVERY_TIMEOUT seconds have passed the breaker goes half-open and
+lets a single probe request through: success closes it, failure re-opens it.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Dict
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+_BILL_PATH = re.compile(r'^bill/\d+/[A-Za-z]+/\d+')
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+
+def endpoint_key(endpoint: str) -> str:
+    """Group concrete endpoints into families, e.g. bill/118/hr/1/actions -> bill/{bill}/actions."""
+    path = _BILL_PATH.sub('bill/{bill}', endpoint.strip('/'))
+    return '/'.join('{id}' if any(ch.isdigit() for ch in part) else part for part in path.split('/'))
+
+
+def is_outage(error: Exception) -> bool:
+    """Whether a request error suggests the API is down rather than a bad request."""
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for a single endpoint family."""
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+                logger.info(f"Circuit for {self.name} half-open, probing for recovery")
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit for {self.name} closed, endpoint recovered")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning(f"Circuit for {self.name} opened after {self.consecutive_failures} consecutive failures")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+
+class CircuitBreakerRegistry:
+    """Lazily creates one breaker per endpoint family."""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        key = endpoint_key(endpoint)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(key, self.failure_threshold, self.recovery_timeout)
+                self._breakers[key] = breaker
+            return breaker
+
+    def open_circuits(self):
+        with self._lock:
+            return [name for name, breaker in self._breakers.items() if breaker.is_open]
@@ -1,4 +1,5 @@
 import os
+import socket
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -23,19 +24,50 @@ class Config:
     MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
     REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', '1'))
     BATCH_SIZE = int(os.getenv('BATCH_SIZE', '100'))
+    MAX_WORKERS = int(os.getenv('MAX_WORKERS', '1'))
+    SUBRESOURCE_PAGE_SIZE = int(os.getenv('SUBRESOURCE_PAGE_SIZE', '250'))
+    PAGE_FETCH_WORKERS = int(os.getenv('PAGE_FETCH_WORKERS', '4'))
+    # Requests/second across all resource crawler threads (0 = unlimited); the
+    # default keeps a single key under Congress.gov's 5,000 requests/hour
+    CRAWL_RATE_LIMIT = float(os.getenv('CRAWL_RATE_LIMIT', '1.25'))
+    
+    # Enrichment prioritisation and per-run budgets (0 = unlimited)
+    PRIORITIZE_BILLS = os.getenv('PRIORITIZE_BILLS', 'true').lower() == 'true'
+    MAX_BILLS_PER_RUN = int(os.getenv('MAX_BILLS_PER_RUN', '0'))
+    RUN_TIME_BUDGET = float(os.getenv('RUN_TIME_BUDGET', '0'))
+    API_CALL_BUDGET = int(os.getenv('API_CALL_BUDGET', '0'))
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     
+    # Multi-worker coordination through database work leases
+    ENABLE_WORK_LEASES = os.getenv('ENABLE_WORK_LEASES', 'false').lower() == 'true'
+    WORKER_ID = os.getenv('WORKER_ID', f"{socket.gethostname()}-{os.getpid()}")
+    LEASE_SECONDS = int(os.getenv('LEASE_SECONDS', '300'))
+    LEASE_COOLDOWN_SECONDS = int(os.getenv('LEASE_COOLDOWN_SECONDS', '21600'))
+    
+    # Per-endpoint circuit breakers and the queue of bills deferred during outages
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))
+    CIRCUIT_RECOVERY_TIMEOUT = float(os.getenv('CIRCUIT_RECOVERY_TIMEOUT', '60'))
+    # 'database' (scraper_deferred_bills, survives fresh CI runners) or 'file' (DEFERRED_QUEUE_PATH)
+    DEFERRED_QUEUE_BACKEND = os.getenv('DEFERRED_QUEUE_BACKEND', 'database').lower()
+    DEFERRED_QUEUE_PATH = os.getenv('DEFERRED_QUEUE_PATH', str(Path(__file__).parent / 'deferred_bills.json'))
+    
+    # Record/replay of API traffic (set from --record / --replay)
+    RECORD_CASSETTE = os.getenv('RECORD_CASSETTE')
+    REPLAY_CASSETTE = os.getenv('REPLAY_CASSETTE')
+    REPLAY_LATENCY = float(os.getenv('REPLAY_LATENCY', '0'))
+    
     # Database Configuration
     DISABLE_DATABASE = os.getenv('DISABLE_DATABASE', 'false').lower() == 'true'
     
     # Validation
     @classmethod
     def validate(cls):
-        required_vars = [
-            'CONGRESS_API_KEY',
-            'NEXT_PUBLIC_SUPABASE_URL',
-            'SUPABASE_SERVICE_ROLE_KEY'
-        ]
+        required_vars = []
+        # Replayed runs never call the API; DISABLE_DATABASE runs never touch Supabase
+        if not cls.REPLAY_CASSETTE:
+            required_vars.append('CONGRESS_API_KEY')
+        if not cls.DISABLE_DATABASE:
+            required_vars.extend(['NEXT_PUBLIC_SUPABASE_URL', 'SUPABASE_SERVICE_ROLE_KEY'])
         
         missing_vars = [var for var in required_vars if not os.getenv(var)]
         
@@ -1,5 +1,7 @@
 import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
@@ -8,8 +10,14 @@ import json
 
 try:
     from .config import Config
+    from .api_cassette import CassetteRecorder, CassettePlayer
+    from .enrichment_plan import FULL_PLAN, SUBRESOURCE_ENDPOINTS, detail_count
+    from .circuit_breaker import CircuitBreakerRegistry, CircuitOpenError, is_outage
 except ImportError:
     from config import Config
+    from api_cassette import CassetteRecorder, CassettePlayer
+    from enrichment_plan import FULL_PLAN, SUBRESOURCE_ENDPOINTS, detail_count
+    from circuit_breaker import CircuitBreakerRegistry, CircuitOpenError, is_outage
 
 logger = logging.getLogger(__name__)
 
@@ -23,32 +31,79 @@ class CongressScraper:
             'User-Agent': 'Congress-Scraper/1.0'
         })
         
+        # Number of API requests made, shared across worker threads
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        
+        # Shared pool for fetching the remaining pages of paginated sub-resources
+        self._page_executor = ThreadPoolExecutor(max_workers=max(1, Config.PAGE_FETCH_WORKERS))
+        
+        # Fail fast on endpoints that keep timing out or returning 5xx/429
+        self.breakers = CircuitBreakerRegistry(Config.CIRCUIT_FAILURE_THRESHOLD, Config.CIRCUIT_RECOVERY_TIMEOUT)
+        
+        # Optional record/replay of API traffic (see api_cassette.py)
+        self.recorder = CassetteRecorder(Config.RECORD_CASSETTE) if Config.RECORD_CASSETTE else None
+        self.player = CassettePlayer(Config.REPLAY_CASSETTE, Config.REPLAY_LATENCY) if Config.REPLAY_CASSETTE else None
+        
+    def close(self):
+        """Stop the page fetch pool and flush any open cassette files."""
+        self._page_executor.shutdown(wait=True)
+        if self.recorder:
+            self.recorder.close()
+        if self.player:
+            self.player.close()
+        
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """Make a request to the Congress.gov API with retry logic and timeout."""
         if params is None:
             params = {}
         
+        with self._count_lock:
+            self.request_count += 1
+        
+        if self.player:
+            return self.player.play(endpoint, params)
+        
         params['api_key'] = self.api_key
         params['format'] = 'json'
         
         url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
         
+        breaker = self.breakers.get(endpoint)
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit open for {breaker.name}, not requesting {endpoint}")
+        
         for attempt in range(Config.MAX_RETRIES):
             try:
                 # Add timeout to prevent hanging
                 response = self.session.get(url, params=params, timeout=30)
                 response.raise_for_status()
+                data = response.json()
+                
+                breaker.record_success()
+                
+                if self.recorder:
+                    self.recorder.record(endpoint, params, data)
                 
                 time.sleep(Config.REQUEST_DELAY)
-                return response.json()
+                return data
                 
             except requests.exceptions.Timeout:
                 logger.warning(f"Request timed out (attempt {attempt + 1}/{Config.MAX_RETRIES}): {url}")
+                breaker.record_failure()
+                if breaker.is_open:
+                    raise CircuitOpenError(f"Circuit opened for {breaker.name} after timeouts")
                 if attempt == Config.MAX_RETRIES - 1:
                     raise
                 time.sleep(2 ** attempt)  # Exponential backoff
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Request failed (attempt {attempt + 1}/{Config.MAX_RETRIES}): {e}")
+                if is_outage(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if breaker.is_open:
+                    raise CircuitOpenError(f"Circuit opened for {breaker.name}: {e}") from e
                 if attempt == Config.MAX_RETRIES - 1:
                     raise
                 time.sleep(2 ** attempt)  # Exponential backoff
@@ -122,32 +177,32 @@ class CongressScraper:
     def get_bill_actions(self, congress: int, bill_type: str, bill_number: int) -> Dict:
         """Fetch actions for a specific bill."""
         endpoint = f"bill/{congress}/{bill_type}/{bill_number}/actions"
-        return self._make_request(endpoint)
+        return self.get_paginated(endpoint, 'actions')
     
     def get_bill_amendments(self, congress: int, bill_type: str, bill_number: int) -> Dict:
         """Fetch amendments for a specific bill."""
         endpoint = f"bill/{congress}/{bill_type}/{bill_number}/amendments"
-        return self._make_request(endpoint)
+        return self.get_paginated(endpoint, 'amendments')
     
     def get_bill_cosponsors(self, congress: int, bill_type: str, bill_number: int) -> Dict:
         """Fetch cosponsors for a specific bill."""
         endpoint = f"bill/{congress}/{bill_type}/{bill_number}/cosponsors"
-        return self._make_request(endpoint)
+        return self.get_paginated(endpoint, 'cosponsors')
     
     def get_bill_subjects(self, congress: int, bill_type: str, bill_number: int) -> Dict:
         """Fetch subjects/topics for a specific bill."""
         endpoint = f"bill/{congress}/{bill_type}/{bill_number}/subjects"
-        return self._make_request(endpoint)
+        return self.get_paginated(endpoint, 'subjects')
     
     def get_bill_summaries(self, congress: int, bill_type: str, bill_number: int) -> Dict:
         """Fetch summaries for a specific bill."""
         endpoint = f"bill/{congress}/{bill_type}/{bill_number}/summaries"
-        return self._make_request(endpoint)
+        return self.get_paginated(endpoint, 'summaries')
     
     def get_bill_text(self, congress: int, bill_type: str, bill_number: int) -> Dict:
         """Fetch text versions for a specific bill."""
         endpoint = f"bill/{congress}/{bill_type}/{bill_number}/text"
-        return self._make_request(endpoint)
+        return self.get_paginated(endpoint, 'textVersions')
     
     def get_members(self, congress: int, chamber: Optional[str] = None) -> Dict:
         """Fetch members of Congress."""
@@ -157,6 +212,10 @@ class CongressScraper:
             params["chamber"] = chamber
         return self._make_request(endpoint, params)
     
+    def get_endpoint(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+        """Fetch an arbitrary API endpoint (used by the resource crawler)."""
+        return self._make_request(endpoint, dict(params or {}))
+    
     def get_member_details(self, member_id: str) -> Dict:
         """Fetch detailed information about a specific member."""
         endpoint = f"member/{member_id}"
@@ -195,44 +254,95 @@ class CongressScraper:
         }
         return self._make_request(endpoint, params)
     
-    def get_enriched_bill_data(self, bill: Dict) -> Dict:
-        """Fetch all related data for a bill (actions, amendments, cosponsors, etc.)."""
+    def get_paginated(self, endpoint: str, key: str, max_pages: int = 0,
+                      params: Optional[Dict] = None) -> Dict:
+        """Fetch every page of a list endpoint, merged in order.
+        
+        The first page's pagination count determines the remaining offsets,
+        which are then requested concurrently. max_pages caps the number of
+        pages (0 means all of them).
+        """
+        limit = Config.SUBRESOURCE_PAGE_SIZE
+        base_params = dict(params or {})
+        
+        first = self._make_request(endpoint, {**base_params, 'limit': limit, 'offset': 0})
+        items = self._page_items(first, key)
+        count = first.get('pagination', {}).get('count')
+        
+        if count is None or len(items) >= count or len(items) < limit:
+            return {key: items, 'pagination': {'count': count if count is not None else len(items)}}
+        
+        offsets = list(range(limit, count, limit))
+        if max_pages > 0:
+            offsets = offsets[:max_pages - 1]
+        
+        futures = [
+            self._page_executor.submit(self._make_request, endpoint, {**base_params, 'limit': limit, 'offset': offset})
+            for offset in offsets
+        ]
+        for future in futures:
+            items.extend(self._page_items(future.result(), key))
+        
+        return {key: items, 'pagination': {'count': count}}
+    
+    @staticmethod
+    def _page_items(page: Dict, key: str) -> List[Dict]:
+        """Items of one page; the subjects endpoint nests them under legislativeSubjects."""
+        items = page.get(key, [])
+        if isinstance(items, dict):
+            items = items.get('legislativeSubjects', [])
+        return list(items)
+    
+    def get_bill_subresource(self, congress: int, bill_type: str, bill_number: int,
+                             key: str, max_pages: int = 0) -> List[Dict]:
+        """Fetch a bill sub-resource (actions, cosponsors, ...) across all pages."""
+        endpoint = f"bill/{congress}/{bill_type}/{bill_number}/{SUBRESOURCE_ENDPOINTS[key]}"
+        return self.get_paginated(endpoint, key, max_pages)[key]
+    
+    def get_enriched_bill_data(self, bill: Dict, plan: Optional[Dict] = None,
+                               previous: Optional[Dict] = None) -> Dict:
+        """Fetch the related data for a bill that an enrichment plan asks for.
+        
+        Without a plan every sub-resource is fetched. `previous` is the bill's
+        stored raw_data; with a plan's skip_unchanged set, sub-resources whose
+        count in the details payload matches the stored copy are reused instead
+        of being fetched again.
+        """
         congress = bill['congress']
         bill_type = bill['type']
         bill_number = bill['number']
+        plan = plan or FULL_PLAN
         
         enriched_bill = bill.copy()
         
         try:
             # Get detailed bill information
-            details = self.get_bill_details(congress, bill_type, bill_number)
-            enriched_bill.update(details.get('bill', {}))
-            
-            # Get actions
-            actions = self.get_bill_actions(congress, bill_type, bill_number)
-            enriched_bill['actions'] = actions.get('actions', [])
-            
-            # Get amendments
-            amendments = self.get_bill_amendments(congress, bill_type, bill_number)
-            enriched_bill['amendments'] = amendments.get('amendments', [])
+            details = self.get_bill_details(congress, bill_type, bill_number).get('bill', {})
+            enriched_bill.update(details)
             
-            # Get cosponsors
-            cosponsors = self.get_bill_cosponsors(congress, bill_type, bill_number)
-            enriched_bill['cosponsors'] = cosponsors.get('cosponsors', [])
-            
-            # Get subjects
-            subjects = self.get_bill_subjects(congress, bill_type, bill_number)
-            enriched_bill['subjects'] = subjects.get('subjects', [])
-            
-            # Get summaries
-            summaries = self.get_bill_summaries(congress, bill_type, bill_number)
-            enriched_bill['summaries'] = summaries.get('summaries', [])
-            
-            # Get text versions
-            text_versions = self.get_bill_text(congress, bill_type, bill_number)
-            enriched_bill['textVersions'] = text_versions.get('textVersions', [])
+            for key, spec in plan['resources'].items():
+                if not spec.get('fetch', True):
+                    continue
+                
+                count = detail_count(details, key)
+                if count == 0:
+                    enriched_bill[key] = []
+                    continue
+                
+                stored = (previous or {}).get(key)
+                if (plan.get('skip_unchanged') and count is not None
+                        and isinstance(stored, list) and len(stored) == count):
+                    enriched_bill[key] = stored
+                    continue
+                
+                enriched_bill[key] = self.get_bill_subresource(
+                    congress, bill_type, bill_number, key, spec.get('max_pages', 0)
+                )
             
+        except CircuitOpenError:
+            # Let the caller defer the bill rather than store a partial copy
+            raise
         except Exception as e:
             logger.error(f"Error enriching bill data for {bill_type}{bill_number}: {e}")
             
-        return enriched_bill 
\ No newline at end of file
+        return enriched_bill
@@ -11,9 +11,35 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+class _DisabledQuery:
+    """Stands in for a Supabase query builder when DISABLE_DATABASE is set."""
+    data: List = []
+    
+    def __getattr__(self, name):
+        # table(...).select(...).in_(...), upsert(...), rpc(...): every builder call chains
+        return lambda *args, **kwargs: self
+    
+    def execute(self):
+        return self
+
+
+class _DisabledClient:
+    """Supabase client replacement whose queries return no rows and store nothing."""
+    
+    def table(self, name: str) -> _DisabledQuery:
+        return _DisabledQuery()
+    
+    def rpc(self, name: str, params: Optional[Dict] = None) -> _DisabledQuery:
+        return _DisabledQuery()
+
+
 class DatabaseManager:
     def __init__(self):
         Config.validate()
+        if Config.DISABLE_DATABASE:
+            logger.warning("DISABLE_DATABASE is set - database reads return nothing and writes are discarded")
+            self.supabase = _DisabledClient()
+            return
         if not Config.SUPABASE_SERVICE_ROLE_KEY:
             raise ValueError("SUPABASE_SERVICE_ROLE_KEY is required for database operations")
         if not Config.SUPABASE_URL:
@@ -147,58 +173,67 @@ class DatabaseManager:
         logger.info("Database schemas defined. Create these tables in your Supabase instance.")
         return schemas
     
+    def bill_id_for(self, bill_data: Dict) -> str:
+        """Derive the bill_id key used in the bills table."""
+        bill_url = bill_data.get('url', '')
+        return bill_url.split('/')[-1] if bill_url else f"{bill_data.get('congress', '')}-{bill_data.get('type', '')}-{bill_data.get('number', '')}"
+    
+    def _build_bill_record(self, bill_data: Dict) -> Optional[Dict]:
+        """Build the bills row for a bill, or None if it lacks substantial text."""
+        bill_id = self.bill_id_for(bill_data)
+        
+        # Extract latest summary
+        summaries = bill_data.get('summaries', [])
+        latest_summary = self._extract_latest_summary(summaries) if summaries else None
+        
+        # Extract text content - try to get full text
+        bill_text = self._extract_bill_text(bill_data)
+        
+        # VALIDATE TEXT QUALITY - Only proceed if we have substantial text
+        if not self._has_substantial_text(bill_text or ''):
+            logger.warning(f"Skipping bill {bill_id} - no substantial text content")
+            return None
+        
+        # Handle latestAction - it can be a string or a dict
+        latest_action = bill_data.get('latestAction', {})
+        if isinstance(latest_action, dict):
+            latest_action_date = latest_action.get('actionDate')
+            latest_action_text = latest_action.get('text') or 'No action recorded'
+        else:
+            # If it's a string, use it as the text and set date to None
+            latest_action_date = None
+            latest_action_text = str(latest_action) if latest_action else 'No action recorded'
+        
+        return {
+            'bill_id': bill_id,
+            'congress': bill_data.get('congress'),
+            'type': bill_data.get('type'),
+            'number': bill_data.get('number'),
+            'title': bill_data.get('title'),
+            'introduced_date': bill_data.get('introducedDate'),
+            'latest_action_date': latest_action_date,
+            'latest_action': latest_action_text,
+            'sponsor_id': bill_data.get('sponsors', [{}])[0].get('bioguideId') if bill_data.get('sponsors') else None,
+            'sponsor_name': bill_data.get('sponsors', [{}])[0].get('fullName') if bill_data.get('sponsors') else None,
+            'sponsor_party': bill_data.get('sponsors', [{}])[0].get('party') if bill_data.get('sponsors') else None,
+            'sponsor_state': bill_data.get('sponsors', [{}])[0].get('state') if bill_data.get('sponsors') else None,
+            'summary': latest_summary,
+            'text': bill_text,
+            'jurisdiction': bill_data.get('jurisdiction', 'US'),  # Default to US (federal) bills
+            'policy_area': bill_data.get('policyArea', {}).get('name'),
+            'cboc_estimate_url': bill_data.get('cboCostEstimates', [{}])[0].get('url') if bill_data.get('cboCostEstimates') else None,
+            'constitutional_authority_text': bill_data.get('constitutionalAuthorityStatementText'),
+            'origin_chamber': bill_data.get('originChamber'),
+            'raw_data': bill_data
+        }
+    
     def insert_bill(self, bill_data: Dict) -> bool:
         """Insert a bill into the database - only if it has substantial text content."""
         try:
-            # Extract main bill data
-            bill_url = bill_data.get('url', '')
-            bill_id = bill_url.split('/')[-1] if bill_url else f"{bill_data.get('congress', '')}-{bill_data.get('type', '')}-{bill_data.get('number', '')}"
-            
-            # Extract latest summary
-            summaries = bill_data.get('summaries', [])
-            latest_summary = self._extract_latest_summary(summaries) if summaries else None
-            
-            # Extract text content - try to get full text
-            bill_text = self._extract_bill_text(bill_data)
-            
-            # VALIDATE TEXT QUALITY - Only proceed if we have substantial text
-            if not self._has_substantial_text(bill_text or ''):
-                logger.warning(f"Skipping bill {bill_id} - no substantial text content")
+            bill_record = self._build_bill_record(bill_data)
+            if bill_record is None:
                 return False
             
-            # Handle latestAction - it can be a string or a dict
-            latest_action = bill_data.get('latestAction', {})
-            if isinstance(latest_action, dict):
-                latest_action_date = latest_action.get('actionDate')
-                latest_action_text = latest_action.get('text') or 'No action recorded'
-            else:
-                # If it's a string, use it as the text and set date to None
-                latest_action_date = None
-                latest_action_text = str(latest_action) if latest_action else 'No action recorded'
-            
-            bill_record = {
-                'bill_id': bill_id,
-                'congress': bill_data.get('congress'),
-                'type': bill_data.get('type'),
-                'number': bill_data.get('number'),
-                'title': bill_data.get('title'),
-                'introduced_date': bill_data.get('introducedDate'),
-                'latest_action_date': latest_action_date,
-                'latest_action': latest_action_text,
-                'sponsor_id': bill_data.get('sponsors', [{}])[0].get('bioguideId') if bill_data.get('sponsors') else None,
-                'sponsor_name': bill_data.get('sponsors', [{}])[0].get('fullName') if bill_data.get('sponsors') else None,
-                'sponsor_party': bill_data.get('sponsors', [{}])[0].get('party') if bill_data.get('sponsors') else None,
-                'sponsor_state': bill_data.get('sponsors', [{}])[0].get('state') if bill_data.get('sponsors') else None,
-                'summary': latest_summary,
-                'text': bill_text,
-                'jurisdiction': bill_data.get('jurisdiction', 'US'),  # Default to US (federal) bills
-                'policy_area': bill_data.get('policyArea', {}).get('name'),
-                'cboc_estimate_url': bill_data.get('cboCostEstimates', [{}])[0].get('url') if bill_data.get('cboCostEstimates') else None,
-                'constitutional_authority_text': bill_data.get('constitutionalAuthorityStatementText'),
-                'origin_chamber': bill_data.get('originChamber'),
-                'raw_data': bill_data
-            }
-            
             # Upsert bill record
             result = self.supabase.table('bills').upsert(bill_record).execute()
             
@@ -228,21 +263,84 @@ class DatabaseManager:
             logger.error(f"Error inserting bill: {e}")
             return False
     
+    def insert_bills(self, bills: List[Dict]) -> List[str]:
+        """Insert a batch of bills with one upsert per table.
+        
+        Produces the same rows as calling insert_bill for each bill. Returns the
+        bill_ids that were stored; if the batched upsert fails, falls back to
+        per-bill inserts so a single bad record does not sink the whole batch.
+        """
+        # Keyed by bill_id so a bill listed twice is only upserted once
+        prepared = {}
+        for bill_data in bills:
+            try:
+                bill_record = self._build_bill_record(bill_data)
+            except Exception as e:
+                logger.error(f"Error preparing bill {bill_data.get('number', 'unknown')}: {e}")
+                continue
+            if bill_record is not None:
+                prepared[bill_record['bill_id']] = (bill_record, bill_data)
+        
+        if not prepared:
+            return []
+        
+        records = [bill_record for bill_record, _ in prepared.values()]
+        related = [(bill_id, bill_data) for bill_id, (_, bill_data) in prepared.items()]
+        
+        try:
+            self.supabase.table('bills').upsert(records).execute()
+        except Exception as e:
+            logger.error(f"Batched bill upsert failed, falling back to single inserts: {e}")
+            return [bill_id for bill_id, bill_data in related if self.insert_bill(bill_data)]
+        
+        action_records = []
+        cosponsor_records = []
+        subject_records = []
+        summary_records = []
+        for bill_id, bill_data in related:
+            if 'actions' in bill_data:
+                action_records.extend(self._build_action_records(bill_id, bill_data['actions']))
+            if 'cosponsors' in bill_data:
+                cosponsor_records.extend(self._build_cosponsor_records(bill_id, bill_data['cosponsors']))
+            if 'subjects' in bill_data:
+                subject_records.extend(self._build_subject_records(bill_id, bill_data['subjects']))
+            if 'summaries' in bill_data:
+                summary_records.extend(self._build_summary_records(bill_id, bill_data['summaries']))
+        
+        for table, table_records in (('bill_actions', action_records),
+                                     ('bill_cosponsors', cosponsor_records),
+                                     ('bill_subjects', subject_records),
+                                     ('bill_summaries', summary_records)):
+            if not table_records:
+                continue
+            try:
+                self.supabase.table(table).upsert(table_records).execute()
+            except Exception as e:
+                logger.error(f"Error inserting {table} batch: {e}")
+        
+        logger.info(f"Successfully inserted batch of {len(records)} bills")
+        return [record['bill_id'] for record in records]
+    
+    def _build_action_records(self, bill_id: str, actions: List[Dict]) -> List[Dict]:
+        """Build bill_actions rows for a bill."""
+        action_records = []
+        for action in actions:
+            action_record = {
+                'bill_id': bill_id,
+                'action_date': action.get('actionDate'),
+                'action_code': action.get('actionCode'),
+                'action_text': action.get('text'),
+                'source_system': action.get('sourceSystem', {}).get('name'),
+                'committee_code': action.get('committees', [{}])[0].get('systemCode') if action.get('committees') else None,
+                'committee_name': action.get('committees', [{}])[0].get('name') if action.get('committees') else None
+            }
+            action_records.append(action_record)
+        return action_records
+    
     def _insert_bill_actions(self, bill_id: str, actions: List[Dict]):
         """Insert bill actions."""
         try:
-            action_records = []
-            for action in actions:
-                action_record = {
-                    'bill_id': bill_id,
-                    'action_date': action.get('actionDate'),
-                    'action_code': action.get('actionCode'),
-                    'action_text': action.get('text'),
-                    'source_system': action.get('sourceSystem', {}).get('name'),
-                    'committee_code': action.get('committees', [{}])[0].get('systemCode') if action.get('committees') else None,
-                    'committee_name': action.get('committees', [{}])[0].get('name') if action.get('committees') else None
-                }
-                action_records.append(action_record)
+            action_records = self._build_action_records(bill_id, actions)
             
             if action_records:
                 self.supabase.table('bill_actions').upsert(action_records).execute()
@@ -250,22 +348,27 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Error inserting bill actions: {e}")
     
+    def _build_cosponsor_records(self, bill_id: str, cosponsors: List[Dict]) -> List[Dict]:
+        """Build bill_cosponsors rows for a bill."""
+        cosponsor_records = []
+        for cosponsor in cosponsors:
+            cosponsor_record = {
+                'bill_id': bill_id,
+                'member_id': cosponsor.get('bioguideId'),
+                'member_name': cosponsor.get('fullName'),
+                'party': cosponsor.get('party'),
+                'state': cosponsor.get('state'),
+                'district': cosponsor.get('district'),
+                'sponsorship_date': cosponsor.get('sponsorshipDate'),
+                'is_withdrawn': cosponsor.get('sponsorshipWithdrawnDate') is not None
+            }
+            cosponsor_records.append(cosponsor_record)
+        return cosponsor_records
+    
     def _insert_bill_cosponsors(self, bill_id: str, cosponsors: List[Dict]):
         """Insert bill cosponsors."""
         try:
-            cosponsor_records = []
-            for cosponsor in cosponsors:
-                cosponsor_record = {
-                    'bill_id': bill_id,
-                    'member_id': cosponsor.get('bioguideId'),
-                    'member_name': cosponsor.get('fullName'),
-                    'party': cosponsor.get('party'),
-                    'state': cosponsor.get('state'),
-                    'district': cosponsor.get('district'),
-                    'sponsorship_date': cosponsor.get('sponsorshipDate'),
-                    'is_withdrawn': cosponsor.get('sponsorshipWithdrawnDate') is not None
-                }
-                cosponsor_records.append(cosponsor_record)
+            cosponsor_records = self._build_cosponsor_records(bill_id, cosponsors)
             
             if cosponsor_records:
                 self.supabase.table('bill_cosponsors').upsert(cosponsor_records).execute()
@@ -273,16 +376,21 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Error inserting bill cosponsors: {e}")
     
+    def _build_subject_records(self, bill_id: str, subjects: List[Dict]) -> List[Dict]:
+        """Build bill_subjects rows for a bill."""
+        subject_records = []
+        for subject in subjects:
+            subject_record = {
+                'bill_id': bill_id,
+                'subject_name': subject.get('name')
+            }
+            subject_records.append(subject_record)
+        return subject_records
+    
     def _insert_bill_subjects(self, bill_id: str, subjects: List[Dict]):
         """Insert bill subjects."""
         try:
-            subject_records = []
-            for subject in subjects:
-                subject_record = {
-                    'bill_id': bill_id,
-                    'subject_name': subject.get('name')
-                }
-                subject_records.append(subject_record)
+            subject_records = self._build_subject_records(bill_id, subjects)
             
             if subject_records:
                 self.supabase.table('bill_subjects').upsert(subject_records).execute()
@@ -290,20 +398,25 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Error inserting bill subjects: {e}")
     
+    def _build_summary_records(self, bill_id: str, summaries: List[Dict]) -> List[Dict]:
+        """Build bill_summaries rows for a bill."""
+        summary_records = []
+        for summary in summaries:
+            summary_record = {
+                'bill_id': bill_id,
+                'version_code': summary.get('versionCode'),
+                'action_date': summary.get('actionDate'),
+                'action_desc': summary.get('actionDesc'),
+                'update_date': summary.get('updateDate'),
+                'summary_text': summary.get('text')
+            }
+            summary_records.append(summary_record)
+        return summary_records
+    
     def _insert_bill_summaries(self, bill_id: str, summaries: List[Dict]):
         """Insert bill summaries."""
         try:
-            summary_records = []
-            for summary in summaries:
-                summary_record = {
-                    'bill_id': bill_id,
-                    'version_code': summary.get('versionCode'),
-                    'action_date': summary.get('actionDate'),
-                    'action_desc': summary.get('actionDesc'),
-                    'update_date': summary.get('updateDate'),
-                    'summary_text': summary.get('text')
-                }
-                summary_records.append(summary_record)
+            summary_records = self._build_summary_records(bill_id, summaries)
             
             if summary_records:
                 self.supabase.table('bill_summaries').upsert(summary_records).execute()
@@ -329,7 +442,7 @@ class DatabaseManager:
             return None
             
         # Sort by date, most recent first
-        sorted_summaries = sorted(dict_summaries, key=lambda x: x.get('updateDate', x.get('actionDate', '')), reverse=True)
+        sorted_summaries = sorted(dict_summaries, key=lambda x: x.get('updateDate') or x.get('actionDate') or '', reverse=True)
         
         # Return the text of the most recent summary
         if sorted_summaries:
@@ -419,6 +532,94 @@ class DatabaseManager:
             logger.error(f"Error fetching recent bills: {e}")
             return []
     
+    def get_bills_raw_data(self, bill_ids: List[str]) -> Dict[str, Dict]:
+        """Get the stored raw_data payload of bills keyed by bill_id."""
+        raw_data = {}
+        try:
+            # Chunked to keep the PostgREST filter URL short
+            for start in range(0, len(bill_ids), 100):
+                chunk = bill_ids[start:start + 100]
+                result = self.supabase.table('bills').select('bill_id, raw_data').in_('bill_id', chunk).execute()
+                for row in result.data:
+                    if isinstance(row.get('raw_data'), dict):
+                        raw_data[row['bill_id']] = row['raw_data']
+        except Exception as e:
+            logger.error(f"Error fetching stored bill data: {e}")
+        return raw_data
+    
+    def get_engagement_metrics(self, bill_ids: List[str]) -> Dict[str, Dict]:
+        """Get frontend engagement metrics keyed by bill_id."""
+        metrics = {}
+        try:
+            # Chunked to keep the PostgREST filter URL short
+            for start in range(0, len(bill_ids), 100):
+                chunk = bill_ids[start:start + 100]
+                result = self.supabase.table('bill_engagement_metrics') \
+                    .select('bill_id, total_votes, page_views, analysis_requests') \
+                    .in_('bill_id', chunk).execute()
+                for row in result.data:
+                    metrics[row['bill_id']] = row
+        except Exception as e:
+            logger.error(f"Error fetching engagement metrics: {e}")
+        return metrics
+    
+    def claim_work_leases(self, worker_id: str, bill_keys: List[str], lease_seconds: int) -> List[str]:
+        """Claim expiring work leases on bill keys; returns the keys this worker now holds."""
+        result = self.supabase.rpc('claim_scraper_leases', {
+            'p_worker_id': worker_id,
+            'p_bill_keys': bill_keys,
+            'p_lease_seconds': lease_seconds
+        }).execute()
+        return [row if isinstance(row, str) else row.get('claim_scraper_leases') for row in (result.data or [])]
+    
+    def heartbeat_work_leases(self, worker_id: str, lease_seconds: int) -> int:
+        """Extend all active leases held by a worker."""
+        result = self.supabase.rpc('heartbeat_scraper_leases', {
+            'p_worker_id': worker_id,
+            'p_lease_seconds': lease_seconds
+        }).execute()
+        return result.data or 0
+    
+    def release_work_leases(self, worker_id: str, bill_keys: List[str], completed: bool, cooldown_seconds: int) -> int:
+        """Release leases, marking them done (kept for a cooldown) or immediately claimable."""
+        result = self.supabase.rpc('release_scraper_leases', {
+            'p_worker_id': worker_id,
+            'p_bill_keys': bill_keys,
+            'p_completed': completed,
+            'p_cooldown_seconds': cooldown_seconds
+        }).execute()
+        return result.data or 0
+
+    def get_deferred_bills(self) -> Dict[str, Dict]:
+        """Get the deferred bill queue as bill listing entries keyed by bill_id."""
+        try:
+            result = self.supabase.table('scraper_deferred_bills').select('bill_id, bill_data').execute()
+            return {row['bill_id']: row['bill_data'] for row in result.data if isinstance(row.get('bill_data'), dict)}
+        except Exception as e:
+            logger.error(f"Error fetching deferred bills: {e}")
+            return {}
+
+    def upsert_deferred_bills(self, bills: Dict[str, Dict]):
+        """Add or refresh bills in the deferred queue."""
+        if not bills:
+            return
+        records = [{'bill_id': bill_id, 'bill_data': bill_data, 'deferred_at': datetime.now().isoformat()}
+                   for bill_id, bill_data in bills.items()]
+        try:
+            self.supabase.table('scraper_deferred_bills').upsert(records, on_conflict='bill_id').execute()
+        except Exception as e:
+            logger.error(f"Error saving {len(records)} deferred bills: {e}")
+
+    def delete_deferred_bills(self, bill_ids: List[str]):
+        """Remove bills from the deferred queue."""
+        try:
+            # Chunked to keep the PostgREST filter URL short
+            for start in range(0, len(bill_ids), 100):
+                chunk = bill_ids[start:start + 100]
+                self.supabase.table('scraper_deferred_bills').delete().in_('bill_id', chunk).execute()
+        except Exception as e:
+            logger.error(f"Error removing deferred bills: {e}")
+
     def get_bill_by_id(self, bill_id: str) -> Optional[Dict]:
         """Get a specific bill by ID."""
         try:
@@ -455,30 +656,45 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Error updating bill status: {e}")
     
+    def _build_member_record(self, member_data: Dict, congress: Optional[int] = None) -> Dict:
+        """Build the members row from a member list entry, optionally merged with its details."""
+        terms = member_data.get('terms', [])
+        term_items = terms.get('item', []) if isinstance(terms, dict) else terms
+        latest_term = term_items[-1] if term_items else {}
+        
+        chamber = member_data.get('chamber') or latest_term.get('chamber')
+        if chamber == 'House of Representatives':
+            chamber = 'House'
+        
+        party_history = member_data.get('partyHistory') or []
+        party = party_history[-1].get('partyAbbreviation') if party_history else None
+        
+        return {
+            'member_id': member_data.get('bioguideId'),
+            'congress': member_data.get('congress') or latest_term.get('congress') or congress,
+            'chamber': chamber,
+            'title': member_data.get('title'),
+            'first_name': member_data.get('firstName'),
+            'middle_name': member_data.get('middleName'),
+            'last_name': member_data.get('lastName'),
+            'suffix': member_data.get('suffix'),
+            'nickname': member_data.get('nickname'),
+            'full_name': member_data.get('name') or member_data.get('directOrderName'),
+            'birth_year': member_data.get('birthYear'),
+            'death_year': member_data.get('deathYear'),
+            'party': party or member_data.get('partyName'),
+            'state': latest_term.get('stateCode') or member_data.get('state'),
+            'district': member_data.get('district'),
+            'leadership_role': member_data.get('leadership', {}).get('role') if isinstance(member_data.get('leadership'), dict) else None,
+            'terms': terms
+        }
+    
     def insert_member(self, member_data: Dict) -> bool:
         """Insert a member into the database."""
         try:
-            member_record = {
-                'member_id': member_data.get('bioguideId'),
-                'congress': member_data.get('congress'),
-                'chamber': member_data.get('chamber'),
-                'title': member_data.get('title'),
-                'first_name': member_data.get('firstName'),
-                'middle_name': member_data.get('middleName'),
-                'last_name': member_data.get('lastName'),
-                'suffix': member_data.get('suffix'),
-                'nickname': member_data.get('nickname'),
-                'full_name': member_data.get('name'),
-                'birth_year': member_data.get('birthYear'),
-                'death_year': member_data.get('deathYear'),
-                'party': member_data.get('partyName'),
-                'state': member_data.get('state'),
-                'district': member_data.get('district'),
-                'leadership_role': member_data.get('leadership', {}).get('role') if member_data.get('leadership') else None,
-                'terms': member_data.get('terms', [])
-            }
+            member_record = self._build_member_record(member_data)
             
-            self.supabase.table('members').upsert(member_record).execute()
+            self.supabase.table('members').upsert(member_record, on_conflict='member_id').execute()
             logger.info(f"Successfully inserted member {member_record['member_id']}")
             return True
             
@@ -486,25 +702,87 @@ class DatabaseManager:
             logger.error(f"Error inserting member: {e}")
             return False
     
+    def insert_members(self, members: List[Dict], congress: Optional[int] = None) -> int:
+        """Upsert a batch of members, returning how many were stored."""
+        records = [self._build_member_record(member, congress) for member in members]
+        return self._upsert_batch('members', records, 'member_id')
+    
+    def _build_committee_record(self, committee_data: Dict, congress: Optional[int] = None) -> Dict:
+        """Build the committees row from a committee list entry."""
+        return {
+            'committee_code': committee_data.get('systemCode'),
+            'congress': committee_data.get('congress') or congress,
+            'chamber': committee_data.get('chamber'),
+            'name': committee_data.get('name'),
+            'committee_type': committee_data.get('type') or committee_data.get('committeeTypeCode'),
+            'parent_committee_code': committee_data.get('parent', {}).get('systemCode') if committee_data.get('parent') else None
+        }
+    
     def insert_committee(self, committee_data: Dict) -> bool:
         """Insert a committee into the database."""
         try:
-            committee_record = {
-                'committee_code': committee_data.get('systemCode'),
-                'congress': committee_data.get('congress'),
-                'chamber': committee_data.get('chamber'),
-                'name': committee_data.get('name'),
-                'committee_type': committee_data.get('type'),
-                'parent_committee_code': committee_data.get('parent', {}).get('systemCode') if committee_data.get('parent') else None
-            }
+            committee_record = self._build_committee_record(committee_data)
             
-            self.supabase.table('committees').upsert(committee_record).execute()
+            self.supabase.table('committees').upsert(committee_record, on_conflict='committee_code').execute()
             logger.info(f"Successfully inserted committee {committee_record['committee_code']}")
             return True
             
         except Exception as e:
             logger.error(f"Error inserting committee: {e}")
             return False
+    
+    def insert_committees(self, committees: List[Dict], congress: Optional[int] = None) -> int:
+        """Upsert a batch of committees, returning how many were stored."""
+        records = [self._build_committee_record(committee, congress) for committee in committees]
+        return self._upsert_batch('committees', records, 'committee_code')
+    
+    def _build_nomination_record(self, nomination_data: Dict) -> Dict:
+        """Build the nominations row from a nomination list entry or detail payload."""
+        latest_action = nomination_data.get('latestAction') or {}
+        nomination_type = nomination_data.get('nominationType') or {}
+        return {
+            'citation': nomination_data.get('citation'),
+            'congress': nomination_data.get('congress'),
+            'number': nomination_data.get('number'),
+            'part_number': nomination_data.get('partNumber'),
+            'description': nomination_data.get('description'),
+            'organization': nomination_data.get('organization'),
+            'is_civilian': nomination_type.get('isCivilian'),
+            'is_military': nomination_type.get('isMilitary'),
+            'received_date': nomination_data.get('receivedDate'),
+            'latest_action_date': latest_action.get('actionDate'),
+            'latest_action_text': latest_action.get('text'),
+            'update_date': nomination_data.get('updateDate'),
+            'raw_data': nomination_data
+        }
+    
+    def insert_nominations(self, nominations: List[Dict]) -> int:
+        """Upsert a batch of nominations, returning how many were stored."""
+        records = [self._build_nomination_record(nomination) for nomination in nominations]
+        return self._upsert_batch('nominations', records, 'citation')
+    
+    def _upsert_batch(self, table: str, records: List[Dict], key: str) -> int:
+        """Upsert records in one request, falling back to one request per record on failure."""
+        # Keyed so a record listed twice is only upserted once
+        records = list({record[key]: record for record in records if record.get(key)}.values())
+        if not records:
+            return 0
+        
+        try:
+            self.supabase.table(table).upsert(records, on_conflict=key).execute()
+            logger.info(f"Successfully upserted batch of {len(records)} {table}")
+            return len(records)
+        except Exception as e:
+            logger.error(f"Batched {table} upsert failed, falling back to single upserts: {e}")
+        
+        stored = 0
+        for record in records:
+            try:
+                self.supabase.table(table).upsert(record, on_conflict=key).execute()
+                stored += 1
+            except Exception as e:
+                logger.error(f"Error upserting {table} record {record[key]}: {e}")
+        return stored
 
     def get_statistics(self) -> Dict:
         """Get database statistics."""
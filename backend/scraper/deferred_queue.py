@@ -0,0 +1,122 @@
+"""
+Bills deferred to the next run.
+
+Bills whose enrichment was short-circuited by an open circuit breaker, or left
+over when a run budget ran out, are persisted here as their listing entries
+keyed by bill_id. The next run merges them back into its bill list so the
+work resumes instead of waiting for the bills to show up in a listing again.
+
+The queue lives in the scraper_deferred_bills table, so it survives the fresh
+runner each scheduled run gets; a local JSON file can be used instead
+(DEFERRED_QUEUE_BACKEND=file) for benchmarks and runs without a database.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Set
+
+logger = logging.getLogger(__name__)
+
+
+class FileDeferredStore:
+    """Keeps the whole queue in one JSON file, deleted once the queue is empty."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Dict[str, Dict]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                bills = json.load(f)
+            if bills:
+                logger.info(f"Loaded {len(bills)} deferred bills from {self.path}")
+            return bills if isinstance(bills, dict) else {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable deferred queue {self.path}: {e}")
+            return {}
+
+    def save(self, bills: Dict[str, Dict], added: Dict[str, Dict], removed: Set[str]):
+        try:
+            if not bills:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(bills, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error saving deferred queue to {self.path}: {e}")
+
+
+class DatabaseDeferredStore:
+    """Keeps the queue in scraper_deferred_bills, writing only what changed.
+
+    Writing deltas rather than the whole queue lets several workers share it.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def load(self) -> Dict[str, Dict]:
+        bills = self.db.get_deferred_bills()
+        if bills:
+            logger.info(f"Loaded {len(bills)} deferred bills from the database")
+        return bills
+
+    def save(self, bills: Dict[str, Dict], added: Dict[str, Dict], removed: Set[str]):
+        self.db.delete_deferred_bills(list(removed))
+        self.db.upsert_deferred_bills(added)
+
+
+class DeferredQueue:
+    """Set of bill listing entries awaiting enrichment, persisted through a store."""
+
+    def __init__(self, store, key: Callable[[Dict], str]):
+        self.store = store
+        self.key = key
+        self._lock = threading.Lock()
+        self._bills: Dict[str, Dict] = store.load()
+        # Changes since the last save
+        self._added: Dict[str, Dict] = {}
+        self._removed: Set[str] = set()
+
+    def merge_into(self, bills: List[Dict]) -> List[Dict]:
+        """Append deferred bills not already present in a listing."""
+        with self._lock:
+            present = {self.key(bill) for bill in bills}
+            extra = [bill for key, bill in self._bills.items() if key not in present]
+        if extra:
+            logger.info(f"Resuming {len(extra)} bills deferred by a previous run")
+        return list(bills) + extra
+
+    def add(self, bills: Iterable[Dict]):
+        with self._lock:
+            for bill in bills:
+                key = self.key(bill)
+                self._bills[key] = bill
+                self._added[key] = bill
+                self._removed.discard(key)
+
+    def remove(self, keys: Iterable[str]):
+        with self._lock:
+            for key in keys:
+                if self._bills.pop(key, None) is not None:
+                    self._removed.add(key)
+                self._added.pop(key, None)
+
+    def save(self):
+        """Persist the queue's changes since the last save."""
+        with self._lock:
+            bills = dict(self._bills)
+            added, removed = self._added, self._removed
+            self._added, self._removed = {}, set()
+        self.store.save(bills, added, removed)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._bills)
@@ -0,0 +1,99 @@
+"""
+Declarative enrichment plans.
+
+A plan says, per scraper mode, which bill sub-resources get_enriched_bill_data
+fetches and how many pages of each (0 = all pages). Sub-resources whose count
+in the bill details payload is zero, or unchanged from the copy already stored
+in bills.raw_data, are filled in without an API call.
+
+Plans can be adjusted without code changes through the ENRICHMENT_PLAN
+environment variable, a JSON object of per-mode overrides, e.g.
+    ENRICHMENT_PLAN='{"test": {"actions": {"max_pages": 1}}}'
+"""
+
+import copy
+import json
+import logging
+import os
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# Sub-resource key in the bill payload -> endpoint suffix under bill/{congress}/{type}/{number}/
+SUBRESOURCE_ENDPOINTS = {
+    'actions': 'actions',
+    'amendments': 'amendments',
+    'cosponsors': 'cosponsors',
+    'subjects': 'subjects',
+    'summaries': 'summaries',
+    'textVersions': 'text',
+}
+
+# Every sub-resource, every page
+FULL_PLAN = {
+    'skip_unchanged': False,
+    'resources': {key: {'fetch': True, 'max_pages': 0} for key in SUBRESOURCE_ENDPOINTS},
+}
+
+# Amendments are never persisted by DatabaseManager, so regular runs skip them.
+# Text versions are only used for the text URL but are still needed for it.
+_STORED_RESOURCES = {
+    'actions': {'fetch': True, 'max_pages': 0},
+    'amendments': {'fetch': False, 'max_pages': 0},
+    'cosponsors': {'fetch': True, 'max_pages': 0},
+    'subjects': {'fetch': True, 'max_pages': 0},
+    'summaries': {'fetch': True, 'max_pages': 0},
+    'textVersions': {'fetch': True, 'max_pages': 0},
+}
+
+ENRICHMENT_PLANS = {
+    'daily': {
+        'skip_unchanged': True,
+        'resources': _STORED_RESOURCES,
+    },
+    'initial': {
+        'skip_unchanged': True,
+        'resources': _STORED_RESOURCES,
+    },
+    'search': {
+        'skip_unchanged': True,
+        'resources': _STORED_RESOURCES,
+    },
+    'test': {
+        'skip_unchanged': False,
+        'resources': _STORED_RESOURCES,
+    },
+}
+
+
+def _load_overrides() -> Dict:
+    raw = os.getenv('ENRICHMENT_PLAN')
+    if not raw:
+        return {}
+    try:
+        overrides = json.loads(raw)
+    except json.JSONDecodeError as e:
+        logger.error(f"Ignoring invalid ENRICHMENT_PLAN: {e}")
+        return {}
+    return overrides if isinstance(overrides, dict) else {}
+
+
+def get_plan(mode: str) -> Dict:
+    """Return the enrichment plan for a scraper mode (unknown modes use 'daily')."""
+    plan = copy.deepcopy(ENRICHMENT_PLANS.get(mode, ENRICHMENT_PLANS['daily']))
+
+    for key, value in _load_overrides().get(mode, {}).items():
+        if key == 'skip_unchanged':
+            plan['skip_unchanged'] = bool(value)
+        elif key in plan['resources'] and isinstance(value, dict):
+            plan['resources'][key].update(value)
+
+    return plan
+
+
+def detail_count(details: Dict, key: str):
+    """Count of a sub-resource as reported in the bill details payload, if any."""
+    value = details.get(key)
+    if isinstance(value, dict) and isinstance(value.get('count'), int):
+        return value['count']
+    return None
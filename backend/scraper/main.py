@@ -8,6 +8,7 @@ import logging
 import schedule
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Optional
 import asyncio
@@ -17,12 +18,26 @@ try:
     from .database_manager import DatabaseManager
     from .config import Config
     from .notifications import NotificationManager
+    from .bill_priority import EnrichmentQueue, score_bill
+    from .work_leases import LeaseManager
+    from .enrichment_plan import get_plan
+    from .circuit_breaker import CircuitOpenError
+    from .deferred_queue import DatabaseDeferredStore, DeferredQueue, FileDeferredStore
+    from .bulk_import import bulk_import
+    from .resource_crawler import CrawlSpec, ResourceCrawler
 except ImportError:
     # Handle direct execution without package structure
     from congress_scraper import CongressScraper
     from database_manager import DatabaseManager
     from config import Config
     from notifications import NotificationManager
+    from bill_priority import EnrichmentQueue, score_bill
+    from work_leases import LeaseManager
+    from enrichment_plan import get_plan
+    from circuit_breaker import CircuitOpenError
+    from deferred_queue import DatabaseDeferredStore, DeferredQueue, FileDeferredStore
+    from bulk_import import bulk_import
+    from resource_crawler import CrawlSpec, ResourceCrawler
 
 # Configure logging
 logging.basicConfig(
@@ -41,6 +56,15 @@ class CongressScraperApp:
         self.scraper = CongressScraper()
         self.db = DatabaseManager()
         self.notifier = NotificationManager()
+        self.crawler = ResourceCrawler(self.scraper)
+        if Config.DEFERRED_QUEUE_BACKEND == 'file' or Config.DISABLE_DATABASE:
+            deferred_store = FileDeferredStore(Config.DEFERRED_QUEUE_PATH)
+        else:
+            deferred_store = DatabaseDeferredStore(self.db)
+        self.deferred = DeferredQueue(deferred_store, self.db.bill_id_for)
+        self.leases = None
+        if Config.ENABLE_WORK_LEASES and not Config.DISABLE_DATABASE:
+            self.leases = LeaseManager(self.db, Config.WORKER_ID, Config.LEASE_SECONDS, Config.LEASE_COOLDOWN_SECONDS)
         
     def initial_data_load(self):
         """Perform initial data load of recent bills and members."""
@@ -48,7 +72,7 @@ class CongressScraperApp:
         
         try:
             # Load recent bills (last 90 days)
-            self.sync_recent_bills(days=90)
+            self.sync_recent_bills(days=90, mode='initial')
             
             # Load current Congress members
             self.sync_members()
@@ -56,6 +80,9 @@ class CongressScraperApp:
             # Load committees
             self.sync_committees()
             
+            # Load nominations
+            self.sync_nominations()
+            
             logger.info("Initial data load completed successfully")
             
         except Exception as e:
@@ -71,23 +98,7 @@ class CongressScraperApp:
             latest_bills = self.scraper.get_latest_bills(limit=limit)
             logger.info(f"Found {len(latest_bills)} latest bills")
             
-            processed = 0
-            for bill in latest_bills:
-                try:
-                    # Get enriched bill data
-                    enriched_bill = self.scraper.get_enriched_bill_data(bill)
-                    
-                    # Store in database
-                    if self.db.insert_bill(enriched_bill):
-                        processed += 1
-                        logger.info(f"Processed bill: {bill.get('title', 'Unknown')}")
-                        
-                    # Add small delay to be respectful to the API
-                    time.sleep(Config.REQUEST_DELAY)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing bill {bill.get('number', 'unknown')}: {e}")
-                    continue
+            processed = self.process_bills(latest_bills, mode='test')
             
             logger.info(f"Test mode completed - successfully processed {processed} bills")
             
@@ -95,7 +106,7 @@ class CongressScraperApp:
             logger.error(f"Error in test mode: {e}")
             raise
     
-    def sync_recent_bills(self, days: int = 30, max_bills: Optional[int] = None):
+    def sync_recent_bills(self, days: int = 30, max_bills: Optional[int] = None, mode: str = 'daily'):
         """Sync bills from the last N days."""
         logger.info(f"Syncing bills from the last {days} days...")
         
@@ -103,22 +114,7 @@ class CongressScraperApp:
             recent_bills = self.scraper.get_recent_bills(days=days, max_bills=max_bills)
             logger.info(f"Found {len(recent_bills)} recent bills")
             
-            processed = 0
-            for bill in recent_bills:
-                try:
-                    # Get enriched bill data
-                    enriched_bill = self.scraper.get_enriched_bill_data(bill)
-                    
-                    # Store in database
-                    if self.db.insert_bill(enriched_bill):
-                        processed += 1
-                        
-                    # Add small delay to be respectful to the API
-                    time.sleep(Config.REQUEST_DELAY)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing bill {bill.get('number', 'unknown')}: {e}")
-                    continue
+            processed = self.process_bills(recent_bills, mode=mode)
             
             logger.info(f"Successfully processed {processed} bills")
             
@@ -126,32 +122,172 @@ class CongressScraperApp:
             logger.error(f"Error syncing recent bills: {e}")
             raise
     
+    def process_bills(self, bills: List[Dict], stats: Optional[Dict] = None, mode: str = 'daily') -> int:
+        """Enrich and store bills, returning how many were stored.
+        
+        Bills are taken from a priority queue (see bill_priority.py) in batches
+        of Config.BATCH_SIZE. Each batch is enriched by up to Config.MAX_WORKERS
+        concurrent workers and then written with one batched upsert per table.
+        Once a per-run budget (bills, seconds or API calls) is exhausted, the
+        remaining lower-priority bills are deferred. With work leases enabled,
+        bills leased by other workers are skipped. The mode selects the
+        enrichment plan (see enrichment_plan.py).
+        
+        If a Congress API circuit breaker opens, the affected bills and the
+        rest of the queue are deferred instead of failing one by one. Deferred
+        bills are saved (see deferred_queue.py) and, except in search mode,
+        picked up again by the next run.
+        """
+        plan = get_plan(mode)
+        if mode != 'search':
+            bills = self.deferred.merge_into(bills)
+        queue = self._build_enrichment_queue(bills)
+        processed = 0
+        attempted = 0
+        deferred_count = 0
+        batch_size = max(1, Config.BATCH_SIZE)
+        workers = max(1, Config.MAX_WORKERS)
+        started_at = time.time()
+        requests_at_start = self.scraper.request_count
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while queue:
+                allowance = self._remaining_bill_budget(attempted, started_at, requests_at_start)
+                if allowance <= 0:
+                    break
+                
+                batch = queue.pop_many(min(batch_size, allowance))
+                if self.leases:
+                    batch = self._claim_batch(batch)
+                    if not batch:
+                        continue
+                
+                attempted += len(batch)
+                keys = [self.db.bill_id_for(bill) for bill in batch]
+                previous = self.db.get_bills_raw_data(keys) if plan['skip_unchanged'] else {}
+                futures = [executor.submit(self._enrich_bill, bill, plan, previous.get(key))
+                           for bill, key in zip(batch, keys)]
+                
+                enriched_batch = []
+                failed_batch = []
+                short_circuited = []
+                for bill, future in zip(batch, futures):
+                    try:
+                        enriched_batch.append(future.result())
+                    except CircuitOpenError as e:
+                        short_circuited.append(bill)
+                        logger.warning(f"Deferring bill {bill.get('number', 'unknown')}: {e}")
+                    except Exception as e:
+                        failed_batch.append(bill)
+                        logger.error(f"Error processing bill {bill.get('number', 'unknown')}: {e}")
+                        if stats is not None:
+                            stats['errors'] += 1
+                
+                stored = self.db.insert_bills(enriched_batch)
+                self.deferred.remove(stored)
+                self.deferred.add(short_circuited)
+                
+                if self.leases:
+                    self.leases.release([self.db.bill_id_for(bill) for bill in enriched_batch], completed=True)
+                    self.leases.release([self.db.bill_id_for(bill) for bill in failed_batch + short_circuited],
+                                        completed=False)
+                processed += len(stored)
+                logger.info(f"Processed {processed}/{len(bills)} bills")
+                
+                if stats is not None:
+                    stats['bills_processed'] += len(stored)
+                    stats['new_bills'] += len(stored)  # Simplified - could be enhanced to track new vs updated
+                    
+                    # Send warning if too many errors
+                    if stats['errors'] > 5:
+                        self.notifier.send_warning_notification(
+                            f"High error count during scraping: {stats['errors']} errors", 
+                            stats
+                        )
+                
+                if short_circuited:
+                    deferred_count += len(short_circuited)
+                    open_circuits = self.scraper.breakers.open_circuits()
+                    if open_circuits:
+                        logger.warning(f"Congress API circuits open ({', '.join(open_circuits)}) - deferring remaining bills")
+                        break
+        
+        if queue:
+            deferred = queue.drain()
+            deferred_count += len(deferred)
+            self.deferred.add(deferred)
+            logger.warning(f"Deferred {len(deferred)} lower-priority bills to the next run")
+        
+        self.deferred.save()
+        if stats is not None:
+            stats['deferred_bills'] = stats.get('deferred_bills', 0) + deferred_count
+        
+        return processed
+    
+    def _claim_batch(self, batch: List[Dict]) -> List[Dict]:
+        """Keep only the bills this worker managed to lease."""
+        keys = [self.db.bill_id_for(bill) for bill in batch]
+        claimed = self.leases.claim(keys)
+        return [bill for bill, key in zip(batch, keys) if key in claimed]
+    
+    def _build_enrichment_queue(self, bills: List[Dict]) -> EnrichmentQueue:
+        """Queue bills by priority score, or in listing order if prioritisation is off."""
+        queue = EnrichmentQueue()
+        if not Config.PRIORITIZE_BILLS:
+            for bill in bills:
+                queue.push(bill, 0.0)
+            return queue
+        
+        bill_ids = [self.db.bill_id_for(bill) for bill in bills]
+        engagement = self.db.get_engagement_metrics(list(set(bill_ids)))
+        now = datetime.now()
+        for bill, bill_id in zip(bills, bill_ids):
+            queue.push(bill, score_bill(bill, engagement.get(bill_id), now))
+        return queue
+    
+    def _remaining_bill_budget(self, attempted: int, started_at: float, requests_at_start: int) -> int:
+        """How many more bills may be enriched under the configured run budgets."""
+        allowance = sys.maxsize
+        
+        if Config.MAX_BILLS_PER_RUN > 0:
+            allowance = min(allowance, Config.MAX_BILLS_PER_RUN - attempted)
+        
+        if Config.RUN_TIME_BUDGET > 0 and time.time() - started_at >= Config.RUN_TIME_BUDGET:
+            return 0
+        
+        if Config.API_CALL_BUDGET > 0:
+            used = self.scraper.request_count - requests_at_start
+            remaining = Config.API_CALL_BUDGET - used
+            # Estimate from calls per bill so far; assume a full enrichment before that
+            calls_per_bill = used / attempted if attempted and used else 7
+            allowance = min(allowance, int(remaining // calls_per_bill))
+        
+        return allowance
+    
+    def _enrich_bill(self, bill: Dict, plan: Optional[Dict] = None, previous: Optional[Dict] = None) -> Dict:
+        """Fetch the related data for a single bill."""
+        enriched_bill = self.scraper.get_enriched_bill_data(bill, plan, previous)
+        
+        # Add small delay to be respectful to the API
+        time.sleep(Config.REQUEST_DELAY)
+        return enriched_bill
+    
     def sync_members(self, congress: int = 118):
-        """Sync current Congress members."""
+        """Sync members of a Congress, with their detail records."""
         logger.info(f"Syncing members for Congress {congress}...")
         
         try:
-            # Get House members
-            house_members = self.scraper.get_members(congress, 'house')
-            logger.info(f"Found {len(house_members.get('members', []))} House members")
-            
-            # Get Senate members
-            senate_members = self.scraper.get_members(congress, 'senate')
-            logger.info(f"Found {len(senate_members.get('members', []))} Senate members")
-            
-            # Store members
-            processed = 0
-            for member in house_members.get('members', []):
-                if self.db.insert_member(member):
-                    processed += 1
-                time.sleep(Config.REQUEST_DELAY)
-            
-            for member in senate_members.get('members', []):
-                if self.db.insert_member(member):
-                    processed += 1
-                time.sleep(Config.REQUEST_DELAY)
-            
-            logger.info(f"Successfully processed {processed} members")
+            stats = self.crawler.crawl(CrawlSpec(
+                'members',
+                f"member/congress/{congress}",
+                'members',
+                sink=lambda members: self.db.insert_members(members, congress),
+                detail_endpoint=lambda member: f"member/{member['bioguideId']}" if member.get('bioguideId') else None,
+                detail_key='member'
+            ))
+            
+            logger.info(f"Successfully processed {stats['stored']} members")
+            return stats
             
         except Exception as e:
             logger.error(f"Error syncing members: {e}")
@@ -162,32 +298,42 @@ class CongressScraperApp:
         logger.info(f"Syncing committees for Congress {congress}...")
         
         try:
-            # Get House committees
-            house_committees = self.scraper.get_committees(congress, 'house')
-            logger.info(f"Found {len(house_committees.get('committees', []))} House committees")
-            
-            # Get Senate committees
-            senate_committees = self.scraper.get_committees(congress, 'senate')
-            logger.info(f"Found {len(senate_committees.get('committees', []))} Senate committees")
-            
-            # Store committees
             processed = 0
-            for committee in house_committees.get('committees', []):
-                if self.db.insert_committee(committee):
-                    processed += 1
-                time.sleep(Config.REQUEST_DELAY)
-            
-            for committee in senate_committees.get('committees', []):
-                if self.db.insert_committee(committee):
-                    processed += 1
-                time.sleep(Config.REQUEST_DELAY)
+            for chamber in ('house', 'senate'):
+                stats = self.crawler.crawl(CrawlSpec(
+                    f"{chamber.capitalize()} committees",
+                    f"committee/{congress}/{chamber}",
+                    'committees',
+                    sink=lambda committees: self.db.insert_committees(committees, congress)
+                ))
+                processed += stats['stored']
             
             logger.info(f"Successfully processed {processed} committees")
+            return processed
             
         except Exception as e:
             logger.error(f"Error syncing committees: {e}")
             raise
     
+    def sync_nominations(self, congress: int = 118):
+        """Sync presidential nominations for a Congress."""
+        logger.info(f"Syncing nominations for Congress {congress}...")
+        
+        try:
+            stats = self.crawler.crawl(CrawlSpec(
+                'nominations',
+                f"nomination/{congress}",
+                'nominations',
+                sink=self.db.insert_nominations
+            ))
+            
+            logger.info(f"Successfully processed {stats['stored']} nominations")
+            return stats
+            
+        except Exception as e:
+            logger.error(f"Error syncing nominations: {e}")
+            raise
+    
     def daily_update(self):
         """Daily update job - sync bills from the last 3 days."""
         logger.info("Running daily update...")
@@ -205,6 +351,7 @@ class CongressScraperApp:
             'updated_bills': 0,
             'api_calls': 0,
             'errors': 0,
+            'deferred_bills': 0,
             'duration_seconds': 0,
             'mode': mode,
             'days': days
@@ -215,46 +362,24 @@ class CongressScraperApp:
             self.notifier.send_start_notification(mode, days)
             logger.info(f"Starting {mode} scraper for last {days} days...")
             
+            requests_at_start = self.scraper.request_count
+            
             # Get recent bills
             recent_bills = self.scraper.get_recent_bills(days=days)
             logger.info(f"Found {len(recent_bills)} recent bills")
-            stats['api_calls'] += 1
             
-            if not recent_bills:
+            if not recent_bills and not len(self.deferred):
                 logger.info("No recent bills found")
+                stats['api_calls'] = self.scraper.request_count - requests_at_start
                 stats['duration_seconds'] = time.time() - start_time
                 self.notifier.send_success_notification(stats)
                 return stats
             
-            # Process each bill
-            for bill in recent_bills:
-                try:
-                    # Get enriched bill data
-                    enriched_bill = self.scraper.get_enriched_bill_data(bill)
-                    stats['api_calls'] += 3  # Approximate API calls for enriched data
-                    
-                    # Store in database
-                    if self.db.insert_bill(enriched_bill):
-                        stats['bills_processed'] += 1
-                        stats['new_bills'] += 1  # Simplified - could be enhanced to track new vs updated
-                        logger.info(f"Processed bill: {bill.get('number', 'Unknown')} - {bill.get('title', 'No title')[:100]}")
-                    
-                    # Respectful delay
-                    time.sleep(Config.REQUEST_DELAY)
-                    
-                    # Send warning if too many errors
-                    if stats['errors'] > 5:
-                        self.notifier.send_warning_notification(
-                            f"High error count during scraping: {stats['errors']} errors", 
-                            stats
-                        )
-                        
-                except Exception as e:
-                    stats['errors'] += 1
-                    logger.error(f"Error processing bill {bill.get('number', 'unknown')}: {e}")
-                    continue
+            # Enrich and store bills in batches
+            self.process_bills(recent_bills, stats, mode=mode)
             
             # Calculate final stats
+            stats['api_calls'] = self.scraper.request_count - requests_at_start
             stats['duration_seconds'] = time.time() - start_time
             
             # Send success notification
@@ -307,21 +432,7 @@ class CongressScraperApp:
             bills = search_results.get('bills', [])
             logger.info(f"Found {len(bills)} bills matching query")
             
-            processed = 0
-            for bill in bills:
-                try:
-                    # Get enriched bill data
-                    enriched_bill = self.scraper.get_enriched_bill_data(bill)
-                    
-                    # Store in database
-                    if self.db.insert_bill(enriched_bill):
-                        processed += 1
-                        
-                    time.sleep(Config.REQUEST_DELAY)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing search result bill {bill.get('number', 'unknown')}: {e}")
-                    continue
+            processed = self.process_bills(bills, mode='search')
             
             logger.info(f"Successfully processed {processed} bills from search")
             return processed
@@ -330,9 +441,31 @@ class CongressScraperApp:
             logger.error(f"Error during bill search: {e}")
             return 0
     
+    def bulk_import_bills(self, paths: List[str]) -> Dict:
+        """Import bills from downloaded GovInfo BILLSTATUS zips or XML files."""
+        logger.info(f"Bulk importing BILLSTATUS data from {', '.join(paths)}")
+        start_time = time.time()
+        
+        try:
+            stats = bulk_import(self.db, paths, max(1, Config.BATCH_SIZE))
+            stats['duration_seconds'] = time.time() - start_time
+            logger.info(f"Bulk import completed - stored {stats['bills_stored']} of {stats['bills_parsed']} "
+                        f"bills in {stats['duration_seconds']:.1f}s")
+            return stats
+            
+        except Exception as e:
+            logger.error(f"Error during bulk import: {e}")
+            raise
+    
     def get_database_stats(self) -> Dict:
         """Get database statistics."""
         return self.db.get_statistics()
+    
+    def close(self):
+        """Release resources held by the scraper (e.g. cassette files, work leases)."""
+        if self.leases:
+            self.leases.close()
+        self.scraper.close()
 
 async def cleanup_bills_without_text():
     """Remove bills that don't have substantial text content."""
@@ -367,17 +500,37 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='Congress.gov API Scraper')
-    parser.add_argument('--mode', choices=['initial', 'scheduler', 'daily', 'search', 'test', 'cleanup'], 
+    parser.add_argument('--mode', choices=['initial', 'scheduler', 'daily', 'search', 'test', 'cleanup', 'bulk-import'], 
                        default='daily', help='Operation mode')
     parser.add_argument('--days', type=int, default=1, 
                        help='Number of days to scrape (for daily mode)')
     parser.add_argument('--query', type=str, 
                        help='Search query for bills (use with --mode search)')
+    parser.add_argument('--bulk-path', type=str, nargs='+', metavar='PATH',
+                       help='BILLSTATUS zip files, XML files or directories (use with --mode bulk-import)')
     parser.add_argument('--stats', action='store_true', 
                        help='Show database statistics')
+    parser.add_argument('--record', type=str, metavar='CASSETTE',
+                       help='Record every API response to a compressed cassette file')
+    parser.add_argument('--replay', type=str, metavar='CASSETTE',
+                       help='Serve API responses from a recorded cassette instead of the network')
+    parser.add_argument('--replay-latency', type=float, default=Config.REPLAY_LATENCY,
+                       help='Synthetic latency in seconds added to each replayed response')
     
     args = parser.parse_args()
     
+    if args.record and args.replay:
+        parser.error("--record and --replay cannot be used together")
+    
+    if args.record:
+        Config.RECORD_CASSETTE = args.record
+    if args.replay:
+        Config.REPLAY_CASSETTE = args.replay
+        Config.REPLAY_LATENCY = args.replay_latency
+        # No network involved, so the politeness delay would only skew timings
+        Config.REQUEST_DELAY = 0
+    
+    app = None
     try:
         Config.validate()
         app = CongressScraperApp()
@@ -414,11 +567,20 @@ def main():
         elif args.mode == 'cleanup':
             asyncio.run(cleanup_bills_without_text())
         
+        elif args.mode == 'bulk-import':
+            if not args.bulk_path:
+                logger.error("--bulk-path required when using bulk-import mode")
+                sys.exit(1)
+            app.bulk_import_bills(args.bulk_path)
+        
         logger.info("Operation completed successfully")
         
     except Exception as e:
         logger.error(f"Application error: {e}")
         sys.exit(1)
+    finally:
+        if app:
+            app.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the api.congress.gov v3 API.
+
+Serves deterministic synthetic bills together with their actions, cosponsors,
+subjects, summaries, text versions and amendments, plus small member,
+committee and nomination listings. Used by benchmark.py to exercise the scraper without
+network access or API quota.
+"""
+
+import json
+import logging
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+BILL_TYPES = ['HR', 'S', 'HRES', 'SRES', 'HJRES', 'SJRES']
+STATES = ['CA', 'TX', 'NY', 'FL', 'WA', 'OH', 'PA', 'IL', 'GA', 'MI']
+PARTIES = ['D', 'R', 'I']
+POLICY_AREAS = ['Health', 'Taxation', 'Armed Forces and National Security', 'Education',
+                'Environmental Protection', 'Agriculture and Food', 'Transportation and Public Works']
+ACTION_TEXTS = ['Introduced in House', 'Referred to the Committee on Energy and Commerce.',
+                'Ordered to be Reported.', 'Passed/agreed to in House.',
+                'Received in the Senate.', 'Became Public Law No: 118-1.']
+
+_DETAIL_RE = re.compile(r'^bill/(\d+)/([a-zA-Z]+)/(\d+)(?:/([a-z]+))?$')
+
+
+class SyntheticCongress:
+    """Deterministic synthetic dataset sized by the benchmark settings."""
+
+    def __init__(self, bills: int = 500, congress: int = 118, days: int = 30,
+                 actions: int = 8, cosponsors: int = 12, subjects: int = 6,
+                 summaries: int = 2, text_versions: int = 2, amendments: int = 1,
+                 seed: int = 42):
+        self.bill_count = bills
+        self.congress = congress
+        self.days = days
+        self.sizes = {
+            'actions': actions,
+            'cosponsors': cosponsors,
+            'subjects': subjects,
+            'summaries': summaries,
+            'text': text_versions,
+            'amendments': amendments,
+        }
+        self.seed = seed
+        self.base_url = 'http://localhost/v3'
+        self.now = datetime.now()
+
+    def _rng(self, number: int, salt: str = '') -> random.Random:
+        return random.Random(f"{self.seed}:{number}:{salt}")
+
+    def _bill_key(self, number: int) -> Tuple[str, int]:
+        return BILL_TYPES[number % len(BILL_TYPES)], number
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}/{path}?format=json"
+
+    def _member(self, rng: random.Random) -> Dict:
+        last = rng.choice(['Smith', 'Garcia', 'Lee', 'Johnson', 'Nguyen', 'Patel', 'Brown'])
+        first = rng.choice(['Alex', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley'])
+        state = rng.choice(STATES)
+        party = rng.choice(PARTIES)
+        return {
+            'bioguideId': f"{last[0]}{rng.randint(100000, 999999)}",
+            'firstName': first,
+            'lastName': last,
+            'fullName': f"Rep. {last}, {first} [{party}-{state}-{rng.randint(1, 20)}]",
+            'party': party,
+            'state': state,
+            'district': rng.randint(1, 20),
+        }
+
+    def list_item(self, number: int) -> Dict:
+        """Bill as it appears in the bill listing endpoint, newest first."""
+        bill_type, bill_number = self._bill_key(number)
+        # Spread introduction dates over the configured window, newest first
+        offset = timedelta(days=self.days * number / max(1, self.bill_count))
+        introduced = (self.now - offset).date().isoformat()
+        rng = self._rng(number)
+        return {
+            'congress': self.congress,
+            'type': bill_type,
+            'number': bill_number,
+            'title': f"Synthetic {rng.choice(POLICY_AREAS)} Act of {2023 + number % 3} (No. {number})",
+            'introducedDate': introduced,
+            'originChamber': 'House' if bill_type.startswith('H') else 'Senate',
+            'latestAction': {'actionDate': introduced, 'text': rng.choice(ACTION_TEXTS)},
+            'updateDate': introduced,
+            'url': self._url(f"bill/{self.congress}/{bill_type.lower()}/{bill_number}"),
+        }
+
+    def details(self, number: int) -> Dict:
+        bill = self.list_item(number)
+        rng = self._rng(number, 'details')
+        path = f"bill/{self.congress}/{bill['type'].lower()}/{bill['number']}"
+        bill.update({
+            'policyArea': {'name': rng.choice(POLICY_AREAS)},
+            'sponsors': [self._member(rng)],
+            'constitutionalAuthorityStatementText': 'Congress has the power to enact this legislation pursuant to Article I, Section 8.',
+            'cboCostEstimates': [],
+        })
+        for name, size in self.sizes.items():
+            key = 'textVersions' if name == 'text' else name
+            bill[key] = {'count': size, 'url': self._url(f"{path}/{name}")}
+        return bill
+
+    def subresource(self, number: int, name: str) -> List[Dict]:
+        size = self.sizes.get(name, 0)
+        rng = self._rng(number, name)
+        introduced = self.list_item(number)['introducedDate']
+        items = []
+        for i in range(size):
+            if name == 'actions':
+                items.append({
+                    'actionDate': introduced,
+                    'actionCode': f"H{11000 + i}",
+                    'text': ACTION_TEXTS[i % len(ACTION_TEXTS)],
+                    'type': 'IntroReferral',
+                    'sourceSystem': {'code': 2, 'name': 'House floor actions'},
+                    'committees': [{'systemCode': 'hsif00', 'name': 'Energy and Commerce Committee'}] if i % 2 else [],
+                })
+            elif name == 'cosponsors':
+                member = self._member(rng)
+                member.update({'sponsorshipDate': introduced, 'isOriginalCosponsor': i < 3})
+                items.append(member)
+            elif name == 'subjects':
+                items.append({'name': f"{rng.choice(POLICY_AREAS)} subject {i}"})
+            elif name == 'summaries':
+                items.append({
+                    'versionCode': f"{i:02d}",
+                    'actionDate': introduced,
+                    'actionDesc': 'Introduced in House',
+                    'updateDate': f"{introduced}T12:00:0{i % 10}Z",
+                    'text': ' '.join(['<p>This bill makes synthetic changes to federal programs for benchmarking purposes.</p>'] * 6),
+                })
+            elif name == 'text':
+                items.append({
+                    'date': f"{introduced}T04:00:00Z",
+                    'type': 'Introduced in House',
+                    'formats': [
+                        {'type': 'PDF', 'url': f"https://www.congress.gov/{number}/BILLS-{number}ih.pdf"},
+                        {'type': 'Formatted XML', 'url': f"https://www.congress.gov/{number}/BILLS-{number}ih.xml"},
+                    ],
+                })
+            elif name == 'amendments':
+                items.append({'congress': self.congress, 'number': str(1000 + i), 'type': 'HAMDT'})
+        return items
+
+    def number_for(self, bill_type: str, bill_number: int) -> Optional[int]:
+        if 1 <= bill_number <= self.bill_count and self._bill_key(bill_number)[0].lower() == bill_type:
+            return bill_number
+        return None
+
+
+def _page(items: List, query: Dict, key: str) -> Dict:
+    limit = int(query.get('limit', ['20'])[0])
+    offset = int(query.get('offset', ['0'])[0])
+    return {key: items[offset:offset + limit], 'pagination': {'count': len(items)}}
+
+
+class MockCongressHandler(BaseHTTPRequestHandler):
+    """Routes v3 API paths to the server's SyntheticCongress dataset."""
+
+    server_version = 'MockCongressAPI/1.0'
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        path = parsed.path.strip('/')
+        if path.startswith('v3/'):
+            path = path[3:]
+
+        data: SyntheticCongress = self.server.data
+        if self.server.latency > 0:
+            time.sleep(self.server.latency)
+        self.server.count_request()
+
+        body = self._route(data, path, query)
+        if body is None:
+            self.send_error(404, f"Unknown endpoint: {path}")
+            return
+
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _route(self, data: SyntheticCongress, path: str, query: Dict) -> Optional[Dict]:
+        if path in (f"bill/{data.congress}", 'bill'):
+            bills = [data.list_item(n) for n in range(1, data.bill_count + 1)]
+            return _page(bills, query, 'bills')
+
+        match = _DETAIL_RE.match(path)
+        if match:
+            _, bill_type, bill_number, sub = match.groups()
+            number = data.number_for(bill_type.lower(), int(bill_number))
+            if number is None:
+                return None
+            if sub is None:
+                return {'bill': data.details(number)}
+            key = 'textVersions' if sub == 'text' else sub
+            return _page(data.subresource(number, sub), query, key)
+
+        if path == 'member' or path.startswith('member/'):
+            rng = random.Random(data.seed)
+            members = [data._member(rng) for _ in range(50)]
+            return _page(members, query, 'members')
+
+        if path.startswith('committee/'):
+            committees = [{'systemCode': f"hs{i:02d}00", 'name': f"Committee {i}", 'chamber': 'House',
+                           'committeeTypeCode': 'Standing'} for i in range(20)]
+            return _page(committees, query, 'committees')
+
+        if path.startswith('nomination/'):
+            rng = random.Random(f"{data.seed}:nominations")
+            received = data.now.date().isoformat()
+            nominations = [{
+                'citation': f"PN{i + 1}",
+                'congress': data.congress,
+                'number': i + 1,
+                'partNumber': '00',
+                'description': f"Synthetic nomination {i + 1}",
+                'organization': rng.choice(['Department of State', 'Department of Defense', 'The Judiciary']),
+                'nominationType': {'isCivilian': i % 4 != 0, 'isMilitary': i % 4 == 0},
+                'receivedDate': received,
+                'latestAction': {'actionDate': received, 'text': 'Received in the Senate and referred to the Committee.'},
+                'updateDate': received,
+                'url': data._url(f"nomination/{data.congress}/{i + 1}"),
+            } for i in range(20)]
+            return _page(nominations, query, 'nominations')
+
+        return None
+
+
+class MockCongressServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, data: SyntheticCongress, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0):
+        super().__init__((host, port), MockCongressHandler)
+        self.data = data
+        self.latency = latency
+        self.request_count = 0
+        self._lock = threading.Lock()
+        data.base_url = f"{self.base_url}"
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v3"
+
+    def count_request(self):
+        with self._lock:
+            self.request_count += 1
+
+    def start_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        logger.info(f"Mock Congress API listening on {self.base_url}")
+        return thread
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Local mock of the Congress.gov API')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--bills', type=int, default=500, help='Number of synthetic bills')
+    parser.add_argument('--days', type=int, default=30, help='Spread introduction dates over N days')
+    parser.add_argument('--latency', type=float, default=0.0, help='Synthetic latency per request in seconds')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    server = MockCongressServer(SyntheticCongress(bills=args.bills, days=args.days), port=args.port, latency=args.latency)
+    logger.info(f"Mock Congress API listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -92,7 +92,7 @@ class NotificationManager:
             minutes = stats.get('duration_seconds', 0) / 60
             duration_str = f"{minutes:.1f}m"
         
-        return {
+        message = {
             "content": "✅ **Daily Bill Scraper Completed Successfully**",
             "embeds": [
                 {
@@ -131,6 +131,14 @@ class NotificationManager:
                 }
             ]
         }
+        
+        if stats.get('deferred_bills'):
+            message["embeds"][0]["fields"].append({
+                "name": "Deferred Bills",
+                "value": str(stats['deferred_bills'])
+            })
+        
+        return message
     
     def _format_failure_message(self, error: str, stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Format failure message for Discord"""
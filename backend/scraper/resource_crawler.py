@@ -0,0 +1,118 @@
+"""
+Generic crawler for Congress.gov list endpoints.
+
+A CrawlSpec names a list endpoint, an optional per-item detail endpoint and a
+sink that persists a batch of items. ResourceCrawler pages through the list
+(CongressScraper.get_paginated), fetches details concurrently on up to
+Config.MAX_WORKERS threads under a shared rate limit, and hands the merged
+items to the sink in batches of Config.BATCH_SIZE. Members, committees and
+nominations are all synced this way instead of with hand-written loops.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+try:
+    from .config import Config
+except ImportError:
+    from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all threads (rate 0 = unlimited)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait_for = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+class CrawlSpec:
+    """What to crawl and where to put it.
+
+    detail_endpoint maps a list item to its detail endpoint (None skips the
+    detail fetch); the detail payload under detail_key is merged over the
+    list item. sink persists a batch of items and returns how many it stored.
+    """
+
+    def __init__(self, name: str, list_endpoint: str, list_key: str,
+                 sink: Callable[[List[Dict]], int],
+                 detail_endpoint: Optional[Callable[[Dict], Optional[str]]] = None,
+                 detail_key: Optional[str] = None,
+                 params: Optional[Dict] = None,
+                 max_pages: int = 0):
+        self.name = name
+        self.list_endpoint = list_endpoint
+        self.list_key = list_key
+        self.sink = sink
+        self.detail_endpoint = detail_endpoint
+        self.detail_key = detail_key
+        self.params = params or {}
+        self.max_pages = max_pages
+
+
+class ResourceCrawler:
+    """Runs CrawlSpecs against a CongressScraper."""
+
+    def __init__(self, scraper, workers: Optional[int] = None, batch_size: Optional[int] = None,
+                 rate_limit: Optional[float] = None):
+        self.scraper = scraper
+        self.workers = max(1, workers or Config.MAX_WORKERS)
+        self.batch_size = max(1, batch_size or Config.BATCH_SIZE)
+        self.rate_limiter = RateLimiter(Config.CRAWL_RATE_LIMIT if rate_limit is None else rate_limit)
+
+    def crawl(self, spec: CrawlSpec) -> Dict:
+        """Crawl one resource, returning listed/detailed/stored/error counts."""
+        stats = {'listed': 0, 'detailed': 0, 'stored': 0, 'errors': 0}
+
+        items = self.scraper.get_paginated(spec.list_endpoint, spec.list_key, spec.max_pages, spec.params)[spec.list_key]
+        stats['listed'] = len(items)
+        logger.info(f"Found {len(items)} {spec.name}")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start:start + self.batch_size]
+
+                if spec.detail_endpoint:
+                    results = list(executor.map(lambda item: self._with_details(spec, item), batch))
+                    batch = [item for item, _ in results]
+                    stats['detailed'] += sum(1 for _, ok in results if ok)
+                    stats['errors'] += sum(1 for _, ok in results if not ok)
+
+                try:
+                    stats['stored'] += spec.sink(batch)
+                except Exception as e:
+                    stats['errors'] += len(batch)
+                    logger.error(f"Error storing batch of {spec.name}: {e}")
+
+                logger.info(f"Stored {stats['stored']}/{len(items)} {spec.name}")
+
+        return stats
+
+    def _with_details(self, spec: CrawlSpec, item: Dict):
+        """Merge an item's detail payload over it; falls back to the list item on error."""
+        endpoint = spec.detail_endpoint(item)
+        if not endpoint:
+            return item, False
+        try:
+            self.rate_limiter.wait()
+            details = self.scraper.get_endpoint(endpoint)
+            return {**item, **details.get(spec.detail_key, {})}, True
+        except Exception as e:
+            logger.error(f"Error fetching {spec.name} details from {endpoint}: {e}")
+            return item, False
@@ -0,0 +1,77 @@
+"""
+Database-coordinated work leases for running several scrapers at once.
+
+Each worker claims batches of bill keys in the scraper_work_leases table before
+enriching them. A background thread heartbeats the worker's leases while it
+holds any, and keys are released when the batch is stored. If a worker
+crashes its heartbeats stop, its leases expire and other workers reclaim them.
+"""
+
+import logging
+import threading
+from typing import Iterable, List, Set
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseManager:
+    """Claims, heartbeats and releases work leases for one worker."""
+
+    def __init__(self, db, worker_id: str, lease_seconds: int = 300, cooldown_seconds: int = 21600):
+        self.db = db
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self._held: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._heartbeat_loop, name='lease-heartbeat', daemon=True)
+        self._thread.start()
+        logger.info(f"Work leases enabled for worker {worker_id}")
+
+    def claim(self, bill_keys: List[str]) -> Set[str]:
+        """Claim as many of the keys as possible; returns those now held."""
+        if not bill_keys:
+            return set()
+        try:
+            claimed = set(self.db.claim_work_leases(self.worker_id, bill_keys, self.lease_seconds))
+        except Exception as e:
+            logger.error(f"Error claiming work leases: {e}")
+            return set()
+        with self._lock:
+            self._held.update(claimed)
+        skipped = len(set(bill_keys)) - len(claimed)
+        if skipped:
+            logger.info(f"Skipped {skipped} bills leased by other workers")
+        return claimed
+
+    def release(self, bill_keys: Iterable[str], completed: bool = True):
+        """Release held keys, marking them done or handing them back unfinished."""
+        with self._lock:
+            keys = [key for key in bill_keys if key in self._held]
+            self._held.difference_update(keys)
+        if not keys:
+            return
+        try:
+            self.db.release_work_leases(self.worker_id, keys, completed, self.cooldown_seconds)
+        except Exception as e:
+            # The leases simply expire if this fails
+            logger.error(f"Error releasing work leases: {e}")
+
+    def close(self):
+        """Stop heartbeating and hand back anything still held."""
+        self._stop.set()
+        with self._lock:
+            held = list(self._held)
+        self.release(held, completed=False)
+
+    def _heartbeat_loop(self):
+        interval = max(1.0, self.lease_seconds / 3)
+        while not self._stop.wait(interval):
+            with self._lock:
+                if not self._held:
+                    continue
+            try:
+                self.db.heartbeat_work_leases(self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"Lease heartbeat failed: {e}")
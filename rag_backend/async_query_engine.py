@@ -0,0 +1,501 @@
+# Async variant of the '/search_bills' pipeline in query_engine.py, built on
+# the async OpenAI client and asyncpg. Independent stages overlap instead of
+# waiting on each other: the raw query is embedded and searched as a topic
+# while persona facets are extracted (the speculative result is dropped if the
+# query turns out to be a persona), and the full-text search runs alongside
+# the vector search. Prompts, ranking, parsing and caches are shared with the
+# synchronous engine.
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import asyncpg
+from openai import AsyncOpenAI
+
+from query_engine import (
+    CANDIDATE_BILL_COUNT_PER_FACET,
+    CANDIDATE_POOL_SIZE,
+    DB_CONNECTION_MAX_LIFETIME,
+    DB_POOL_MAX_CONNECTIONS,
+    DB_POOL_MIN_CONNECTIONS,
+    EMBEDDINGS_WATERMARK_SQL,
+    EMBEDDING_MODEL,
+    ENABLE_HYBRID_SEARCH,
+    IVFFLAT_PROBES,
+    LEXICAL_CANDIDATE_COUNT,
+    MAX_FINAL_RESULTS,
+    OPENAI_API_KEY,
+    PREPARED_STATEMENTS,
+    SUPABASE_DB_URL,
+    USE_PREPARED_STATEMENTS,
+    _bill_details_from_rows,
+    _cache_results,
+    _cached_persona_facets,
+    _cached_results,
+    _cached_watermark,
+    _candidates_for_synthesis,
+    _facet_extraction_request,
+    _merge_synthesis,
+    _fuse_rankings,
+    _hnsw_ef_search,
+    _index_search_for_facets,
+    _index_search_for_topic,
+    _parse_facets,
+    _parse_synthesis,
+    _rank_persona_candidates,
+    _rank_topic_candidates,
+    _rerank_candidates,
+    _record_watermark,
+    _remember_facets,
+    _remember_synthesis,
+    _search_limits,
+    _split_synthesis_cache,
+    _synthesis_request,
+    _synthesis_result,
+    _top_results,
+    _use_vector_index,
+    embedding_cache,
+    load_reranker,
+    start_vector_index,
+)
+from caches import normalize_text
+from json_stream import JsonArrayStream
+
+# Embed and search the raw query as a topic while facets are being extracted.
+# Costs one wasted embedding + search for persona queries.
+SPECULATIVE_TOPIC_SEARCH = os.getenv("SPECULATIVE_TOPIC_SEARCH", "true").lower() == "true"
+# Maximum concurrent LLM calls (facet extraction, synthesis) in a batch search
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+async_openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+
+def _session_settings() -> str:
+    """The ANN session settings as one SET statement batch ('' when there are none)."""
+    statements = []
+    if _hnsw_ef_search():
+        statements.append(f"SET hnsw.ef_search = {_hnsw_ef_search()}")
+    if IVFFLAT_PROBES:
+        statements.append(f"SET ivfflat.probes = {int(IVFFLAT_PROBES)}")
+    return "; ".join(statements)
+
+
+class _RecycledConnection(asyncpg.Connection):
+    """Connection that closes itself on release once past DB_CONNECTION_MAX_LIFETIME.
+
+    asyncpg's max_inactive_connection_lifetime only retires idle connections;
+    this matches the sync pool, which also rotates busy ones. The pool opens a
+    replacement the next time the slot is acquired.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._opened_at = time.monotonic()
+
+    async def reset(self, *, timeout=None):
+        # Called by the pool on every release
+        if time.monotonic() - self._opened_at > DB_CONNECTION_MAX_LIFETIME:
+            await self.close(timeout=timeout)
+            return
+        await super().reset(timeout=timeout)
+        # reset() runs RESET ALL, which drops the ANN settings applied in _setup_connection
+        settings = _session_settings()
+        if settings:
+            await self.execute(settings, timeout=timeout)
+
+
+async def _setup_connection(conn):
+    """Sends vectors as text literals and applies the ANN session settings on a new connection."""
+    await conn.set_type_codec("vector", schema="public", encoder=str, decoder=json.loads, format="text")
+    settings = _session_settings()
+    if settings:
+        await conn.execute(settings)
+
+
+async def _get_pool() -> asyncpg.Pool:
+    """Returns the process-wide asyncpg pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                try:
+                    _pool = await asyncpg.create_pool(
+                        SUPABASE_DB_URL,
+                        min_size=DB_POOL_MIN_CONNECTIONS,
+                        max_size=DB_POOL_MAX_CONNECTIONS,
+                        connection_class=_RecycledConnection,
+                        # asyncpg prepares and caches statements per connection;
+                        # transaction-mode poolers cannot keep them
+                        statement_cache_size=100 if USE_PREPARED_STATEMENTS else 0,
+                        init=_setup_connection,
+                    )
+                except (OSError, asyncpg.PostgresError) as e:
+                    logging.error(f"Database connection failed: {e}")
+                    raise
+    return _pool
+
+
+async def warm_up():
+    """Opens the pool, loads the reranker and starts the vector index so requests skip setup."""
+    await asyncio.gather(_get_pool(), asyncio.to_thread(load_reranker))
+    start_vector_index()
+
+
+async def close():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def _discard(task: Optional["asyncio.Task"]):
+    """Cancels a speculative task we no longer need, without leaving its exception unretrieved."""
+    if task is not None:
+        task.cancel()
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def _get_embeddings_watermark(pool: asyncpg.Pool) -> Any:
+    """Async counterpart of query_engine._get_embeddings_watermark."""
+    fresh, value = _cached_watermark()
+    if fresh:
+        return value
+    value = tuple(await pool.fetchrow(EMBEDDINGS_WATERMARK_SQL))
+    _record_watermark(value)
+    return value
+
+
+async def _get_persona_facets(query: str) -> List[str]:
+    """Routed, memoized facet extraction; see query_engine._get_persona_facets."""
+    facets = _cached_persona_facets(query)
+    if facets is None:
+        facets = await _extract_persona_facets(query)
+    return facets
+
+
+async def _extract_persona_facets(query: str) -> List[str]:
+    response = await async_openai_client.chat.completions.create(**_facet_extraction_request(query))
+    facets = _parse_facets(response.choices[0].message.content)
+    _remember_facets(query, facets)
+    return facets
+
+
+async def _embed_texts_uncached(texts: List[str]) -> List[List[float]]:
+    response = await async_openai_client.embeddings.create(model=EMBEDDING_MODEL, input=texts)
+    return [item.embedding for item in response.data]
+
+
+async def _embed_texts(texts: List[str], persist: bool = True) -> List[List[float]]:
+    return await embedding_cache.embed_async(EMBEDDING_MODEL, texts, _embed_texts_uncached, persist)
+
+
+async def _search_for_topic(query: str, pool: asyncpg.Pool, speculative: bool = False) -> List[asyncpg.Record]:
+    """Embeds a query and returns (bill_table_id, similarity, chunk_text) rows.
+
+    Speculative searches may be for persona text, which is kept out of the on-disk cache.
+    """
+    query_embedding = (await _embed_texts([query], persist=not speculative))[0]
+    if _use_vector_index():
+        return await asyncio.to_thread(_index_search_for_topic, query_embedding)
+    return await pool.fetch(
+        PREPARED_STATEMENTS["search_chunks"], query_embedding, *_search_limits(CANDIDATE_BILL_COUNT_PER_FACET * 2)
+    )
+
+
+async def _search_for_facets(facets: List[str], pool: asyncpg.Pool) -> List[asyncpg.Record]:
+    """Embeds facets and returns (facet_index, bill_table_id, similarity, chunk_text) rows."""
+    return await _search_vectors(await _embed_texts(facets), CANDIDATE_BILL_COUNT_PER_FACET, pool)
+
+
+async def _search_vectors(embeddings: List[List[float]], limit: int, pool: asyncpg.Pool) -> List[Any]:
+    """Top limit bills for each embedding in one search, as (embedding_index, bill_table_id, similarity, chunk_text)."""
+    if _use_vector_index():
+        return await asyncio.to_thread(_index_search_for_facets, embeddings, limit)
+    return await pool.fetch(
+        PREPARED_STATEMENTS["search_facets"],
+        [str(embedding) for embedding in embeddings],
+        *_search_limits(limit),
+    )
+
+
+async def _search_lexical(query: str, pool: asyncpg.Pool) -> List[asyncpg.Record]:
+    """Full-text (bill_table_id, text_rank, snippet) rows; see query_engine._search_lexical."""
+    return await pool.fetch(PREPARED_STATEMENTS["search_lexical"], query, LEXICAL_CANDIDATE_COUNT)
+
+
+async def _get_bill_details(bill_ids: Set[int], pool: asyncpg.Pool) -> Dict[int, Dict[str, Any]]:
+    if not bill_ids:
+        return {}
+    return _bill_details_from_rows(await pool.fetch(PREPARED_STATEMENTS["bill_details"], list(bill_ids)))
+
+
+async def _synthesize(query: str, candidates: List[Dict[str, Any]], is_persona: bool) -> List[Dict[str, Any]]:
+    """Generates results for the candidates not in the synthesis cache in one LLM call."""
+    if not candidates:
+        return []
+    cached, misses = _split_synthesis_cache(query, candidates, is_persona)
+    fresh = []
+    if misses:
+        response = await async_openai_client.chat.completions.create(**_synthesis_request(query, misses, is_persona))
+        fresh = _parse_synthesis(response.choices[0].message.content, misses)
+        _remember_synthesis(query, misses, is_persona, fresh)
+    return _merge_synthesis(candidates, cached, fresh)
+
+
+# --- Main Orchestration Function ---
+
+async def intelligent_bill_search_async(query: str) -> List[Dict[str, Any]]:
+    """Async counterpart of query_engine.intelligent_bill_search, sharing its caches."""
+    logging.info(f"Received query: '{query}'")
+    key = normalize_text(query)
+    pool = await _get_pool()
+
+    watermark = await _get_embeddings_watermark(pool)
+    cached = _cached_results(key, watermark)
+    if cached is not None:
+        return cached
+
+    results = await _search_bills(query, pool)
+    _cache_results(key, watermark, results)
+    return results
+
+
+async def _search_bills(query: str, pool: asyncpg.Pool) -> List[Dict[str, Any]]:
+    """Runs the persona or topic pipeline, overlapping the stages that do not depend on each other."""
+    candidates_for_synthesis, is_persona = await _retrieve_candidates(query, pool)
+    if not candidates_for_synthesis:
+        return []
+
+    logging.info(f"Synthesizing final results for {'persona' if is_persona else 'topic'} with LLM...")
+    final_results = await _synthesize(query, candidates_for_synthesis, is_persona)
+
+    logging.info(f"Successfully generated {len(final_results)} results. Returning top {MAX_FINAL_RESULTS}.")
+    return _top_results(final_results)
+
+
+async def _retrieve_candidates(query: str, pool: asyncpg.Pool) -> Tuple[List[Dict[str, Any]], bool]:
+    """Returns the ranked candidates for synthesis (with bill details) and whether the query is a persona."""
+    # Topic searches (vector and full-text) start before we know it is a topic
+    topic_search = asyncio.create_task(_search_for_topic(query, pool, speculative=True)) if SPECULATIVE_TOPIC_SEARCH else None
+    lexical_search = asyncio.create_task(_search_lexical(query, pool)) if SPECULATIVE_TOPIC_SEARCH and ENABLE_HYBRID_SEARCH else None
+    try:
+        facets = await _get_persona_facets(query)
+    except BaseException:
+        _discard(topic_search)
+        _discard(lexical_search)
+        raise
+
+    lexical_rows = []
+    if facets:
+        logging.info(f"Query identified as PERSONA. Facets: {facets}")
+        _discard(topic_search)
+        _discard(lexical_search)
+        rows = await _search_for_facets(facets, pool)
+    else:
+        logging.info(f"Query identified as TOPIC: {query}")
+        topic_search = topic_search or asyncio.create_task(_search_for_topic(query, pool))
+        if ENABLE_HYBRID_SEARCH and lexical_search is None:
+            lexical_search = asyncio.create_task(_search_lexical(query, pool))
+        try:
+            rows = await topic_search
+            if lexical_search is not None:
+                lexical_rows = await lexical_search
+        except BaseException:
+            _discard(lexical_search)
+            raise
+
+    if not rows and not lexical_rows:
+        logging.info("No bills found matching the query.")
+        return [], bool(facets)
+
+    if facets:
+        ranked_candidates = _rank_persona_candidates(facets, rows)
+    else:
+        ranked_candidates = _rank_topic_candidates(rows)
+        if ENABLE_HYBRID_SEARCH:
+            ranked_candidates = _fuse_rankings(ranked_candidates, lexical_rows)
+    # Only the ranked pool can reach synthesis, so only its details are fetched
+    top_candidate_ids = {bill_id for bill_id, _ in ranked_candidates[:CANDIDATE_POOL_SIZE]}
+    candidates = _candidates_for_synthesis(ranked_candidates, await _get_bill_details(top_candidate_ids, pool))
+    # The cross-encoder is CPU-bound; keep it off the event loop
+    return await asyncio.to_thread(_rerank_candidates, query, candidates), bool(facets)
+
+
+async def stream_bill_search(query: str) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Streaming counterpart of intelligent_bill_search_async. Yields (event, data):
+      "candidates" - ranked bills (bill_id, bill_short_name, title, similarity) right after retrieval
+      "result"     - one bill's summary_point and relevance_score as soon as the LLM has written it
+      "done"       - the final results, sorted and capped as /search_bills would return them
+    Cached queries skip straight to "result" and "done" events.
+    """
+    logging.info(f"Received streaming query: '{query}'")
+    key = normalize_text(query)
+    pool = await _get_pool()
+
+    watermark = await _get_embeddings_watermark(pool)
+    cached = _cached_results(key, watermark)
+    if cached is not None:
+        for result in cached:
+            yield "result", result
+        yield "done", cached
+        return
+
+    candidates_for_synthesis, is_persona = await _retrieve_candidates(query, pool)
+    yield "candidates", [
+        {
+            "bill_id": cand["bill_id"],
+            "bill_short_name": cand["details"]["bill_short_name"],
+            "title": cand["details"]["title"],
+            "similarity": cand["max_similarity"],
+        }
+        for cand in candidates_for_synthesis
+    ]
+
+    # Cached sentences go out first; only the misses are streamed from the LLM
+    cached, misses = _split_synthesis_cache(query, candidates_for_synthesis, is_persona)
+    for result in _merge_synthesis(candidates_for_synthesis, cached, []):
+        yield "result", result
+
+    fresh = []
+    if misses:
+        parser = JsonArrayStream()
+        stream = await async_openai_client.chat.completions.create(
+            **_synthesis_request(query, misses, is_persona), stream=True
+        )
+        async for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            for res in parser.feed(chunk.choices[0].delta.content):
+                result = _synthesis_result(res, misses)
+                if result is None:
+                    logging.error(f"Skipping malformed streamed synthesis result: {res}")
+                    continue
+                # The first result for each candidate wins
+                if any(previous["bill_id"] == result["bill_id"] for previous in fresh):
+                    continue
+                fresh.append(result)
+                yield "result", result
+        _remember_synthesis(query, misses, is_persona, fresh)
+
+    results = _top_results(_merge_synthesis(candidates_for_synthesis, cached, fresh))
+    _cache_results(key, watermark, results)
+    yield "done", results
+
+
+async def intelligent_bill_search_many(queries: List[str]) -> List[List[Dict[str, Any]]]:
+    """
+    Batch counterpart of intelligent_bill_search_async, returning one result
+    list per query in order. All queries' facets (or topic texts) are embedded
+    in one API call and searched in one statement; facet extraction and
+    synthesis run concurrently, at most BATCH_CONCURRENCY LLM calls at a time.
+    """
+    logging.info(f"Received batch of {len(queries)} queries")
+    pool = await _get_pool()
+    watermark = await _get_embeddings_watermark(pool)
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    pending: Dict[str, str] = {}  # normalized key -> first spelling of the query
+    for query in queries:
+        key = normalize_text(query)
+        if key in results or key in pending:
+            continue
+        cached = _cached_results(key, watermark)
+        if cached is not None:
+            results[key] = cached
+        else:
+            pending[key] = query
+
+    if pending:
+        fresh = await _search_bills_many(list(pending.values()), pool)
+        for key, query_results in zip(pending, fresh):
+            _cache_results(key, watermark, query_results)
+            results[key] = query_results
+
+    return [[dict(result) for result in results[normalize_text(query)]] for query in queries]
+
+
+async def _search_bills_many(queries: List[str], pool: asyncpg.Pool) -> List[List[Dict[str, Any]]]:
+    """Runs the persona/topic pipeline for distinct queries with shared embedding, search and detail calls."""
+    llm_slots = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def facets_for(query: str) -> List[str]:
+        facets = _cached_persona_facets(query)
+        if facets is None:
+            async with llm_slots:
+                facets = await _extract_persona_facets(query)
+        return facets
+
+    all_facets = await asyncio.gather(*(facets_for(query) for query in queries))
+
+    # Persona queries search their facets, topic queries the query itself
+    search_texts = [facets or [query] for query, facets in zip(queries, all_facets)]
+    topic_queries = [query for query, facets in zip(queries, all_facets) if not facets]
+    lexical_search = None
+    if ENABLE_HYBRID_SEARCH and topic_queries:
+        lexical_search = asyncio.ensure_future(asyncio.gather(*(_search_lexical(query, pool) for query in topic_queries)))
+    try:
+        embeddings = await _embed_texts([text for texts in search_texts for text in texts])
+        # Topic searches return more bills than facet searches; facet rows are trimmed below
+        rows = await _search_vectors(embeddings, CANDIDATE_BILL_COUNT_PER_FACET * 2, pool)
+        lexical_rows = iter(await lexical_search if lexical_search is not None else [])
+    except BaseException:
+        _discard(lexical_search)
+        raise
+
+    hits_per_text = [[] for _ in embeddings]
+    for text_index, bill_id, similarity, chunk_text in rows:
+        hits_per_text[text_index].append((bill_id, similarity, chunk_text))
+
+    ranked_per_query = []
+    offset = 0
+    for facets, texts in zip(all_facets, search_texts):
+        hits = hits_per_text[offset:offset + len(texts)]
+        offset += len(texts)
+        if facets:
+            facet_rows = [
+                (facet_index, *hit)
+                for facet_index, facet_hits in enumerate(hits)
+                for hit in facet_hits[:CANDIDATE_BILL_COUNT_PER_FACET]
+            ]
+            ranked = _rank_persona_candidates(facets, facet_rows)
+        else:
+            ranked = _rank_topic_candidates(hits[0])
+            if ENABLE_HYBRID_SEARCH:
+                ranked = _fuse_rankings(ranked, next(lexical_rows))
+        ranked_per_query.append(ranked)
+
+    bill_details = await _get_bill_details(
+        {bill_id for ranked in ranked_per_query for bill_id, _ in ranked[:CANDIDATE_POOL_SIZE]}, pool
+    )
+
+    async def finish(query: str, facets: List[str], ranked) -> List[Dict[str, Any]]:
+        candidates = _candidates_for_synthesis(ranked, bill_details)
+        candidates = await asyncio.to_thread(_rerank_candidates, query, candidates)
+        async with llm_slots:
+            final_results = await _synthesize(query, candidates, is_persona=bool(facets))
+        return _top_results(final_results)
+
+    return await asyncio.gather(*(
+        finish(query, facets, ranked) for query, facets, ranked in zip(queries, all_facets, ranked_per_query)
+    ))
+
+
+if __name__ == '__main__':
+    async def _main():
+        for query in (
+            "I'm a disabled military veteran who runs a small software business in rural Washington. I'm also a parent and concerned about government spending.",
+            "healthcare reform",
+        ):
+            print(f"--- Searching for: ---\n{query}\n")
+            print(json.dumps(await intelligent_bill_search_async(query), indent=2))
+        await close()
+
+    asyncio.run(_main())
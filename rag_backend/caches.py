@@ -0,0 +1,197 @@
+# In-process caches for the query engine: a thread-safe LRU with optional TTL,
+# and a two-tier embedding cache (LRU in front of a local SQLite store) so
+# recurring texts such as persona facets are only embedded once.
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Size-bounded, thread-safe LRU cache. Entries older than ttl seconds count as misses."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._data[key]
+                entry = _MISSING
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def normalize_text(text: str) -> str:
+    """Case- and whitespace-insensitive cache key for a piece of text."""
+    return " ".join(text.lower().split())
+
+
+class EmbeddingCache:
+    """Embeddings keyed by (model, normalized text): LRU first, then SQLite, then the API.
+
+    Set path to None to keep only the in-process tier. Pass persist=False for
+    texts that must not be written to disk (e.g. raw user queries).
+    """
+
+    def __init__(self, path: Optional[str] = None, maxsize: int = 4096):
+        self.memory = LRUCache(maxsize)
+        self.disk_hits = 0
+        self.api_texts = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    " model TEXT NOT NULL, text TEXT NOT NULL, embedding BLOB NOT NULL,"
+                    " PRIMARY KEY (model, text))"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logging.error(f"Embedding cache store {path} unavailable, using memory only: {e}")
+                self._db = None
+
+    def embed(self, model: str, texts: Sequence[str], embed_fn: Callable[[List[str]], List[List[float]]],
+              persist: bool = True) -> List[List[float]]:
+        """Returns embeddings for texts, calling embed_fn once with only the distinct misses."""
+        keys, found, missing, from_disk = self._lookup(model, texts)
+        if missing:
+            self._add(model, found, missing, embed_fn(list(missing.values())), persist)
+        return self._finish(keys, found, missing, from_disk)
+
+    async def embed_async(self, model: str, texts: Sequence[str], embed_fn: Callable[[List[str]], Awaitable[List[List[float]]]],
+                          persist: bool = True) -> List[List[float]]:
+        """Same as embed, for a coroutine embed_fn; SQLite reads and writes run off the event loop."""
+        keys, found, missing, from_disk = await self._off_loop(self._lookup, model, texts)
+        if missing:
+            embeddings = await embed_fn(list(missing.values()))
+            await self._off_loop(self._add, model, found, missing, embeddings, persist)
+        return self._finish(keys, found, missing, from_disk)
+
+    async def _off_loop(self, fn: Callable, *args):
+        """Runs fn on a worker thread if it may touch the SQLite store."""
+        if self._db is None:
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    def _lookup(self, model: str, texts: Sequence[str]) -> Tuple[List[str], Dict[str, List[float]], Dict[str, str], int]:
+        keys = [normalize_text(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+
+        for key in set(keys):
+            embedding = self.memory.get((model, key))
+            if embedding is not None:
+                found[key] = embedding
+
+        from_disk = self._load(model, [key for key in set(keys) if key not in found])
+        for key, embedding in from_disk.items():
+            self.memory.set((model, key), embedding)
+        found.update(from_disk)
+
+        # Embed the first original spelling of each missing key
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        return keys, found, missing, len(from_disk)
+
+    def _add(self, model: str, found: Dict[str, List[float]], missing: Dict[str, str], embeddings: List[List[float]],
+             persist: bool = True):
+        fresh = dict(zip(missing.keys(), embeddings))
+        for key, embedding in fresh.items():
+            self.memory.set((model, key), embedding)
+        if persist:
+            self._store(model, fresh)
+        found.update(fresh)
+
+    def _finish(self, keys: List[str], found: Dict[str, List[float]], missing: Dict[str, str], from_disk: int) -> List[List[float]]:
+        with self._lock:
+            self.disk_hits += from_disk
+            self.api_texts += len(missing)
+        logging.info(
+            f"Embedding cache: {len(set(keys)) - len(missing)}/{len(set(keys))} texts cached "
+            f"({from_disk} from disk); lifetime hit rate {self.hit_rate():.0%}"
+        )
+        return [found[key] for key in keys]
+
+    def hit_rate(self) -> float:
+        lookups = self.memory.hits + self.memory.misses
+        return (self.memory.hits + self.disk_hits) / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.memory.stats(),
+            "disk_hits": self.disk_hits,
+            "api_texts": self.api_texts,
+            "hit_rate": self.hit_rate(),
+        }
+
+    def _load(self, model: str, keys: List[str]) -> Dict[str, List[float]]:
+        if not self._db or not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        try:
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT text, embedding FROM embeddings WHERE model = ? AND text IN ({placeholders})",
+                    [model, *keys],
+                ).fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Embedding cache read failed: {e}")
+            return {}
+        return {text: array("f", blob).tolist() for text, blob in rows}
+
+    def _store(self, model: str, embeddings: Dict[str, List[float]]):
+        if not self._db or not embeddings:
+            return
+        rows = [(model, key, array("f", embedding).tobytes()) for key, embedding in embeddings.items()]
+        try:
+            with self._lock:
+                self._db.executemany("INSERT OR REPLACE INTO embeddings (model, text, embedding) VALUES (?, ?, ?)", rows)
+                self._db.commit()
+        except sqlite3.Error as e:
+            logging.error(f"Embedding cache write failed: {e}")
@@ -0,0 +1,71 @@
+# Checks that the query engine's vector searches are answered from the ANN
+# index on summary_embeddings rather than a sequential scan. Runs EXPLAIN on
+# each search statement with a random query vector and exits non-zero if a
+# plan does not use the index. Sequential scans are disabled for the check
+# (a small development table would otherwise legitimately prefer one), so a
+# failure means the query shape itself cannot use the index.
+#
+# Usage: python check_vector_index.py [--index NAME]
+# (the index defaults to the one serving the configured VECTOR_PRECISION)
+
+import argparse
+import json
+import random
+import sys
+
+import psycopg2
+
+from query_engine import (
+    EMBEDDING_DIMENSIONS,
+    PREPARED_STATEMENTS,
+    SUPABASE_DB_URL,
+    VECTOR_INDEX_NAMES,
+    VECTOR_PRECISION,
+    _search_limits,
+    _to_pyformat,
+    _vector_array_literal,
+)
+
+# Search statements and example parameters; $1 is the query vector(s)
+SEARCH_STATEMENTS = {
+    "search_chunks": lambda vec: (str(vec), *_search_limits(10)),
+    "search_facets": lambda vec: (_vector_array_literal([vec, vec]), *_search_limits(5)),
+}
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def check_statement(cur, name: str, index_name: str) -> bool:
+    vec = [random.uniform(-1, 1) for _ in range(EMBEDDING_DIMENSIONS)]
+    sql, params = _to_pyformat(PREPARED_STATEMENTS[name], SEARCH_STATEMENTS[name](vec))
+    cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    plan = cur.fetchone()[0]
+    plan = plan if isinstance(plan, list) else json.loads(plan)
+    nodes = list(_plan_nodes(plan[0]["Plan"]))
+    uses_index = any(node.get("Index Name") == index_name for node in nodes)
+    print(f"{'OK  ' if uses_index else 'FAIL'} {name}: " + " > ".join(node["Node Type"] for node in nodes))
+    return uses_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify vector searches use the ANN index")
+    parser.add_argument("--index", default=VECTOR_INDEX_NAMES[VECTOR_PRECISION], help="Expected index name")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(SUPABASE_DB_URL)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET enable_seqscan = off")
+            results = [check_statement(cur, name, args.index) for name in SEARCH_STATEMENTS]
+    finally:
+        conn.close()
+
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Process-wide Postgres connection pool for the query engine. Connections are
+# kept open between requests, health-checked after sitting idle, recycled after
+# a maximum lifetime and set up once (e.g. PREPARE statements) when created.
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import psycopg2
+from psycopg2 import pool as pg_pool
+
+
+class ConnectionPool:
+    """Blocking, thread-safe pool on top of psycopg2's ThreadedConnectionPool."""
+
+    def __init__(
+        self,
+        dsn: str,
+        minconn: int = 1,
+        maxconn: int = 10,
+        max_lifetime: float = 1800.0,
+        health_check_after: float = 30.0,
+        on_connect: Optional[Callable] = None,
+    ):
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self.on_connect = on_connect
+        self._pool = pg_pool.ThreadedConnectionPool(minconn, maxconn, dsn)
+        # getconn raises instead of waiting when the pool is exhausted
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._created_at: Dict[int, float] = {}
+        self._last_used: Dict[int, float] = {}
+
+    @contextmanager
+    def connection(self):
+        """Borrow a healthy connection; broken connections are discarded on return."""
+        self._slots.acquire()
+        conn = None
+        broken = False
+        try:
+            conn = self._checkout()
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            if conn is not None:
+                self._checkin(conn, broken or conn.closed != 0)
+            self._slots.release()
+
+    def warm_up(self):
+        """Open (and set up) one connection ahead of the first request."""
+        with self.connection():
+            pass
+
+    def close(self):
+        self._pool.closeall()
+
+    def _checkout(self):
+        while True:
+            conn = self._pool.getconn()
+            key = id(conn)
+            now = time.monotonic()
+            with self._lock:
+                created_at = self._created_at.get(key)
+                last_used = self._last_used.get(key, now)
+
+            if created_at is None:
+                self._setup(conn)
+                return conn
+
+            if conn.closed or now - created_at > self.max_lifetime:
+                self._discard(conn)
+                continue
+
+            if now - last_used > self.health_check_after and not self._is_healthy(conn):
+                logging.warning("Discarding unhealthy pooled database connection")
+                self._discard(conn)
+                continue
+
+            return conn
+
+    def _setup(self, conn):
+        conn.autocommit = True
+        try:
+            if self.on_connect:
+                self.on_connect(conn)
+        except Exception:
+            self._discard(conn)
+            raise
+        with self._lock:
+            self._created_at[id(conn)] = time.monotonic()
+
+    def _checkin(self, conn, broken: bool):
+        if broken:
+            self._discard(conn)
+            return
+        with self._lock:
+            self._last_used[id(conn)] = time.monotonic()
+        self._pool.putconn(conn)
+
+    def _discard(self, conn):
+        with self._lock:
+            self._created_at.pop(id(conn), None)
+            self._last_used.pop(id(conn), None)
+        self._pool.putconn(conn, close=True)
+
+    @staticmethod
+    def _is_healthy(conn) -> bool:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            return True
+        except psycopg2.Error:
+            return False
@@ -0,0 +1,68 @@
+# Incremental parser for streamed LLM output. Synthesis responses look like
+# {"results": [{...}, {...}]}; JsonArrayStream yields each object of the first
+# array as soon as its closing brace arrives, so results can be sent to the
+# client while the completion is still being generated. A malformed element is
+# yielded as an empty object so it still takes up its slot.
+
+import json
+import logging
+from typing import Any, Dict, List
+
+
+class JsonArrayStream:
+    """Feed text chunks; returns the objects of the first JSON array completed so far."""
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._array_depth = None  # depth of the first array's contents once it opens
+        self._object_start = None  # buffer offset of the element being read
+        self._in_string = False
+        self._escaped = False
+        self._offset = 0
+        self._done = False
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        completed = []
+        for char in chunk:
+            self._buffer.append(char)
+            position = self._offset
+            self._offset += 1
+            if self._done:
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "[{":
+                self._depth += 1
+                if char == "[" and self._array_depth is None:
+                    self._array_depth = self._depth
+                elif char == "{" and self._depth == (self._array_depth or -1) + 1:
+                    self._object_start = position
+            elif char in "]}":
+                if char == "}" and self._object_start is not None and self._depth == self._array_depth + 1:
+                    completed.extend(self._parse(self._object_start, position))
+                    self._object_start = None
+                elif char == "]" and self._depth == self._array_depth:
+                    self._done = True
+                self._depth -= 1
+        return completed
+
+    def _parse(self, start: int, end: int) -> List[Dict[str, Any]]:
+        text = "".join(self._buffer[start:end + 1])
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError as e:
+            # An empty placeholder keeps the element's slot, so consumers can still count elements
+            logging.error(f"Malformed streamed element: {e}. Element: {text}")
+            return [{}]
+        return [value] if isinstance(value, dict) else [{}]
@@ -0,0 +1,96 @@
+# Measures how much recall the compact first-pass searches (VECTOR_PRECISION
+# half/binary) give up against exact search, and what they cost. Samples
+# stored chunk embeddings as queries, computes the exact top-k bills with index
+# scans disabled, then runs the query engine's bill search at each precision and
+# reports recall@k, mean latency and the size of each precision's index.
+#
+# Usage: python measure_vector_recall.py [--samples 50] [--k 10] [--overfetch 4]
+
+import argparse
+import statistics
+import time
+
+import psycopg2
+
+from query_engine import (
+    SUPABASE_DB_URL,
+    VECTOR_INDEX_NAMES,
+    _search_limits,
+    _to_pyformat,
+    _vector_search_statements,
+)
+
+# Exact top-k distinct bills, matching the bill-level collapse of the searches
+EXACT_SQL = """
+    SELECT bill_table_id
+    FROM (
+        SELECT DISTINCT ON (bill_table_id) bill_table_id, embedding <=> %s::vector AS distance
+        FROM public.summary_embeddings
+        ORDER BY bill_table_id, distance
+    ) best_chunks
+    ORDER BY distance
+    LIMIT %s
+"""
+
+
+def exact_top_k(cur, embedding: str, k: int):
+    cur.execute("SET enable_indexscan = off")
+    try:
+        cur.execute(EXACT_SQL, (embedding, k))
+        return {row[0] for row in cur.fetchall()}
+    finally:
+        cur.execute("RESET enable_indexscan")
+
+
+def index_sizes(cur):
+    cur.execute(
+        "SELECT indexrelname, pg_relation_size(indexrelid) FROM pg_stat_user_indexes"
+        " WHERE relname = 'summary_embeddings'"
+    )
+    return dict(cur.fetchall())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure recall of compact vector search against exact search")
+    parser.add_argument("--samples", type=int, default=50, help="Number of sampled query vectors")
+    parser.add_argument("--k", type=int, default=10, help="Bills per search")
+    parser.add_argument("--overfetch", type=int, default=4, help="Compact first-pass rows per exactly re-scored row")
+    parser.add_argument("--precisions", nargs="+", default=list(VECTOR_INDEX_NAMES), choices=list(VECTOR_INDEX_NAMES))
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(SUPABASE_DB_URL)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            # An HNSW scan returns at most ef_search rows
+            largest_first_pass = max(_search_limits(args.k, precision, args.overfetch)[1] for precision in args.precisions)
+            cur.execute("SET hnsw.ef_search = %s", (max(40, largest_first_pass),))
+            cur.execute("SELECT embedding::text FROM public.summary_embeddings ORDER BY random() LIMIT %s", (args.samples,))
+            queries = [row[0] for row in cur.fetchall()]
+            truth = [exact_top_k(cur, embedding, args.k) for embedding in queries]
+            sizes = index_sizes(cur)
+
+            print(f"{len(queries)} queries, bill recall@{args.k}, compact first pass over-fetches x{args.overfetch}")
+            for precision in args.precisions:
+                sql = _vector_search_statements(precision)["search_chunks"]
+                limits = _search_limits(args.k, precision, args.overfetch)
+                recalls, latencies = [], []
+                for embedding, expected in zip(queries, truth):
+                    started = time.perf_counter()
+                    cur.execute(*_to_pyformat(sql, (embedding, *limits)))
+                    found = {row[0] for row in cur.fetchall()}
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    recalls.append(len(found & expected) / len(expected) if expected else 1.0)
+
+                index = VECTOR_INDEX_NAMES[precision]
+                size = f"{sizes[index] / 2**20:.1f} MB" if index in sizes else "missing"
+                print(
+                    f"{precision:>6}: recall {statistics.mean(recalls):.3f}, "
+                    f"mean {statistics.mean(latencies):.1f} ms, index {index} {size}"
+                )
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Token accounting for LLM prompts. Counts and truncates text with the
+# model's tiktoken encoding so prompts can be held to a fixed budget, and
+# detects snippets that only repeat text already in the prompt.
+
+import logging
+import re
+from typing import List
+
+TRUNCATION_MARKER = "…"
+
+_WORD = re.compile(r"\w+")
+
+
+class TokenCounter:
+    """tiktoken-backed counting and truncation; falls back to ~4 characters per token."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self._encoding = None
+        try:
+            import tiktoken
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            logging.error(f"tiktoken unavailable for {model}, estimating token counts: {e}")
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is None:
+            return (len(text) + 3) // 4
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cuts text to at most max_tokens tokens (marker included)."""
+        if not text or max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        keep = max(max_tokens - 1, 0)
+        if self._encoding is None:
+            cut = text[:keep * 4]
+        else:
+            cut = self._encoding.decode(self._encoding.encode(text, disallowed_special=())[:keep])
+        # Prefer ending on a word boundary
+        boundary = cut.rfind(" ")
+        if boundary > len(cut) // 2:
+            cut = cut[:boundary]
+        return cut.rstrip() + TRUNCATION_MARKER
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def is_redundant(snippet: str, text: str, threshold: float = 0.8) -> bool:
+    """True if most of snippet's words already appear in text (e.g. a chunk cut from the summary)."""
+    snippet_words = _words(snippet)
+    if not snippet_words:
+        return True
+    text_words = set(_words(text))
+    covered = sum(1 for word in snippet_words if word in text_words)
+    return covered / len(snippet_words) >= threshold
@@ -2,14 +2,24 @@
 # bills, processes them to generate LLM summaries and relevance scores.
 
 import os
+import re
 import json
 import psycopg2
 import logging
-from typing import List, Dict, Any, Tuple, Set
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Tuple, Set
 
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from caches import EmbeddingCache, LRUCache, normalize_text
+from db_pool import ConnectionPool
+from query_router import TOPIC, route_query
+from prompt_builder import TokenCounter, is_redundant
+from reranker import Reranker
+
 # --- Configuration ---
 # Load environment variables from a .env file for local development
 load_dotenv()
@@ -24,6 +34,278 @@ MAX_FINAL_RESULTS = 5 # As requested, cap the final output to 5 bills.
 CANDIDATE_BILL_COUNT_PER_FACET = 5 # How many bills to fetch for each individual facet.
 TOP_CANDIDATE_BILLS_FOR_SYNTHESIS = 7 # How many top candidates to send to the final LLM call.
 
+# Synthesis prompts are held to a token budget: the query, each bill's title and
+# matched facets are capped, candidates split what is left of
+# SYNTHESIS_PROMPT_MAX_TOKENS (up to SYNTHESIS_CANDIDATE_MAX_TOKENS each), and
+# long summaries and snippets are truncated to fit.
+SYNTHESIS_PROMPT_MAX_TOKENS = int(os.getenv("SYNTHESIS_PROMPT_MAX_TOKENS", "3000"))
+SYNTHESIS_CANDIDATE_MAX_TOKENS = int(os.getenv("SYNTHESIS_CANDIDATE_MAX_TOKENS", "300"))
+SYNTHESIS_QUERY_MAX_TOKENS = 200
+SYNTHESIS_TITLE_MAX_TOKENS = 48
+SYNTHESIS_FACETS_MAX_TOKENS = 32
+
+# Cross-encoder reranking: the top RERANK_DEPTH bills from the vector search are
+# rescored against the query and only the best RERANK_TOP_N go to synthesis
+# (instead of TOP_CANDIDATE_BILLS_FOR_SYNTHESIS by vector score).
+ENABLE_RERANKER = os.getenv("ENABLE_RERANKER", "true").lower() == "true"
+RERANKER_MODEL = os.getenv("RERANKER_MODEL", "cross-encoder/ms-marco-TinyBERT-L-2-v2")
+RERANK_DEPTH = int(os.getenv("RERANK_DEPTH", "20"))
+RERANK_TOP_N = int(os.getenv("RERANK_TOP_N", "5"))
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "32"))
+# How many ranked bills get details fetched and are considered for synthesis
+CANDIDATE_POOL_SIZE = RERANK_DEPTH if ENABLE_RERANKER else TOP_CANDIDATE_BILLS_FOR_SYNTHESIS
+
+# Embedding cache: an in-process LRU in front of a local SQLite store. Set
+# EMBEDDING_CACHE_PATH to an empty string to keep only the in-process tier.
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "embedding_cache.sqlite3")
+
+# Facet extraction results are memoized by normalized persona text for
+# FACET_CACHE_TTL seconds. Obvious topic queries skip extraction entirely
+# when the local query router is enabled.
+FACET_CACHE_SIZE = int(os.getenv("FACET_CACHE_SIZE", "2048"))
+FACET_CACHE_TTL = float(os.getenv("FACET_CACHE_TTL", "3600"))
+ENABLE_QUERY_ROUTER = os.getenv("ENABLE_QUERY_ROUTER", "true").lower() == "true"
+
+# Final results are cached by normalized query for RESULT_CACHE_TTL seconds and
+# dropped as soon as summary_embeddings gains or loses rows (max(id) and the row
+# count are checked at most every EMBEDDINGS_WATERMARK_INTERVAL seconds).
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "512"))
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "900"))
+EMBEDDINGS_WATERMARK_INTERVAL = float(os.getenv("EMBEDDINGS_WATERMARK_INTERVAL", "30"))
+
+# Per-bill synthesis results (summary_point, relevance_score) are reused across
+# queries, keyed by the persona facets the bill matched (or the topic), the bill
+# and its summary version. Only uncached candidates are sent to the LLM.
+SYNTHESIS_CACHE_SIZE = int(os.getenv("SYNTHESIS_CACHE_SIZE", "8192"))
+SYNTHESIS_CACHE_TTL = float(os.getenv("SYNTHESIS_CACHE_TTL", "86400"))
+
+# Connection pool: connections are reused across requests, health-checked after
+# sitting idle and recycled after a maximum lifetime (seconds).
+DB_POOL_MIN_CONNECTIONS = int(os.getenv("DB_POOL_MIN_CONNECTIONS", "1"))
+DB_POOL_MAX_CONNECTIONS = int(os.getenv("DB_POOL_MAX_CONNECTIONS", "10"))
+DB_CONNECTION_MAX_LIFETIME = float(os.getenv("DB_CONNECTION_MAX_LIFETIME", "1800"))
+DB_HEALTH_CHECK_AFTER = float(os.getenv("DB_HEALTH_CHECK_AFTER", "30"))
+# Server-side prepared statements; disable when connecting through a
+# transaction-mode pooler (e.g. Supabase's port 6543), which does not keep them.
+USE_PREPARED_STATEMENTS = os.getenv("USE_PREPARED_STATEMENTS", "true").lower() == "true"
+
+# ANN search tuning applied to every pooled connection; empty keeps the
+# server default. ef_search (HNSW) and probes (IVFFlat) trade recall for speed.
+HNSW_EF_SEARCH = os.getenv("HNSW_EF_SEARCH", "")
+IVFFLAT_PROBES = os.getenv("IVFFLAT_PROBES", "")
+
+# VECTOR_SEARCH_MODE=memory loads summary_embeddings into an in-process index at
+# startup (about 6 KB of RAM per chunk) and answers facet/topic searches there,
+# polling for new rows every VECTOR_INDEX_REFRESH_INTERVAL seconds. Searches use
+# the database until the first load completes.
+VECTOR_SEARCH_MODE = os.getenv("VECTOR_SEARCH_MODE", "database").lower()
+VECTOR_INDEX_REFRESH_INTERVAL = float(os.getenv("VECTOR_INDEX_REFRESH_INTERVAL", "60"))
+VECTOR_INDEX_BATCH_SIZE = int(os.getenv("VECTOR_INDEX_BATCH_SIZE", "5000"))
+
+# Hybrid retrieval for topic queries: a Postgres full-text search over bill
+# titles and AI summaries (catches program names and acronyms such as "SNAP"
+# or "PFAS" that embeddings miss) runs alongside the vector search, and the two
+# rankings are merged with reciprocal rank fusion (score = sum of 1 / (RRF_K + rank)).
+ENABLE_HYBRID_SEARCH = os.getenv("ENABLE_HYBRID_SEARCH", "true").lower() == "true"
+LEXICAL_CANDIDATE_COUNT = int(os.getenv("LEXICAL_CANDIDATE_COUNT", "10"))
+RRF_K = int(os.getenv("RRF_K", "60"))
+
+# Compact first-pass search: with VECTOR_PRECISION=half (halfvec) or binary
+# (binary_quantize), the ANN search runs on a smaller expression index and
+# over-fetches RESCORE_OVERFETCH times the rows, which are then re-ranked
+# exactly against the full-precision vectors. Needs the indexes from the
+# compact index migration.
+VECTOR_PRECISION = os.getenv("VECTOR_PRECISION", "full").lower()
+RESCORE_OVERFETCH = int(os.getenv("RESCORE_OVERFETCH", "4"))
+EMBEDDING_DIMENSIONS = 1536
+
+# Searches return distinct bills (each with its best chunk), collapsed in SQL.
+# Bills have several chunks each (what_it_does, key changes, affected groups),
+# so the ANN scan fetches BILL_OVERFETCH chunks per bill requested.
+BILL_OVERFETCH = int(os.getenv("BILL_OVERFETCH", "4"))
+
+# ANN index serving each precision, and the first-pass distance expression it
+# indexes ({e} is the stored embedding, {q} the query vector)
+VECTOR_INDEX_NAMES = {
+    "full": "summary_embeddings_embedding_idx",
+    "half": "summary_embeddings_embedding_half_idx",
+    "binary": "summary_embeddings_embedding_bit_idx",
+}
+_FIRST_PASS_DISTANCE = {
+    "full": "{e} <=> {q}",
+    "half": f"{{e}}::halfvec({EMBEDDING_DIMENSIONS}) <=> {{q}}::halfvec({EMBEDDING_DIMENSIONS})",
+    "binary": f"binary_quantize({{e}})::bit({EMBEDDING_DIMENSIONS}) <~> binary_quantize({{q}})",
+}
+if VECTOR_PRECISION not in _FIRST_PASS_DISTANCE:
+    raise SystemExit(f"Error: VECTOR_PRECISION must be one of {', '.join(_FIRST_PASS_DISTANCE)}")
+
+def _vector_search_statements(precision: str) -> Dict[str, str]:
+    """
+    Bill search SQL for a precision. $1 is the query vector(s), $2 the number
+    of distinct bills returned and $3 the number of first-pass chunks. The ANN
+    scan orders by the raw distance expression (not the similarity alias) so
+    the planner can use the HNSW index; the over-fetched chunks are re-scored
+    exactly and collapsed to the best chunk per bill.
+    """
+    distance = _FIRST_PASS_DISTANCE[precision]
+    return {
+        "search_chunks": f"""
+    SELECT
+        bill_table_id,
+        similarity,
+        chunk_text
+    FROM (
+        SELECT DISTINCT ON (bill_table_id)
+            bill_table_id,
+            1 - (embedding <=> $1::vector) AS similarity,
+            chunk_text
+        FROM (
+            SELECT
+                bill_table_id,
+                chunk_text,
+                embedding
+            FROM
+                public.summary_embeddings
+            ORDER BY
+                {distance.format(e="embedding", q="$1::vector")}
+            LIMIT $3
+        ) candidates
+        ORDER BY
+            bill_table_id, embedding <=> $1::vector
+    ) best_chunks
+    ORDER BY
+        similarity DESC
+    LIMIT $2
+    """,
+        # Top-k bills for every facet embedding in one round trip. $1 is a text[]
+        # of vector literals, which both psycopg2 and asyncpg can send as is.
+        "search_facets": f"""
+    SELECT
+        q.facet_index - 1 AS facet_index,
+        c.bill_table_id,
+        c.similarity,
+        c.chunk_text
+    FROM
+        unnest($1::text[]::vector[]) WITH ORDINALITY AS q(embedding, facet_index)
+    CROSS JOIN LATERAL (
+        SELECT
+            best_chunks.bill_table_id,
+            best_chunks.similarity,
+            best_chunks.chunk_text
+        FROM (
+            SELECT DISTINCT ON (candidates.bill_table_id)
+                candidates.bill_table_id,
+                1 - (candidates.embedding <=> q.embedding) AS similarity,
+                candidates.chunk_text
+            FROM (
+                SELECT
+                    e.bill_table_id,
+                    e.chunk_text,
+                    e.embedding
+                FROM
+                    public.summary_embeddings e
+                ORDER BY
+                    {distance.format(e="e.embedding", q="q.embedding")}
+                LIMIT $3
+            ) candidates
+            ORDER BY
+                candidates.bill_table_id, candidates.embedding <=> q.embedding
+        ) best_chunks
+        ORDER BY
+            best_chunks.similarity DESC
+        LIMIT $2
+    ) c
+    ORDER BY
+        q.facet_index, c.similarity DESC
+    """,
+    }
+
+def _search_limits(limit: int, precision: str = VECTOR_PRECISION, rescore_overfetch: int = RESCORE_OVERFETCH) -> Tuple[int, int]:
+    """($2, $3) for a search returning limit bills."""
+    first_pass = limit * BILL_OVERFETCH
+    return limit, first_pass if precision == "full" else first_pass * rescore_overfetch
+
+def _hnsw_ef_search() -> Optional[int]:
+    """
+    hnsw.ef_search for pooled connections. An HNSW scan returns at most
+    ef_search rows (default 40), so it is raised to cover the largest first pass.
+    """
+    needed = _search_limits(CANDIDATE_BILL_COUNT_PER_FACET * 2)[1]
+    if HNSW_EF_SEARCH:
+        return max(int(HNSW_EF_SEARCH), needed)
+    return needed if needed > 40 else None
+
+# Queries prepared once per pooled connection. Facet and topic searches share
+# the bill search and differ only in their limit.
+PREPARED_STATEMENTS = {
+    **_vector_search_statements(VECTOR_PRECISION),
+    # Full-text matches on bill titles (weighted double) and AI summaries, one
+    # row per bill with a snippet of the summary around the matched terms.
+    # Both predicates match the GIN expression indexes on these columns.
+    "search_lexical": """
+    WITH query AS (
+        SELECT websearch_to_tsquery('english', $1) AS tsq
+    ),
+    matches AS (
+        SELECT
+            b.id AS bill_table_id,
+            ts_rank_cd(to_tsvector('english', b.title), query.tsq) * 2 AS rank
+        FROM
+            public.bills b, query
+        WHERE
+            to_tsvector('english', b.title) @@ query.tsq
+            AND EXISTS (SELECT 1 FROM public.ai_bill_summaries s WHERE s.bill_table_id = b.id)
+        UNION ALL
+        SELECT
+            s.bill_table_id,
+            ts_rank_cd(to_tsvector('english', s.what_it_does), query.tsq) AS rank
+        FROM
+            public.ai_bill_summaries s, query
+        WHERE
+            to_tsvector('english', s.what_it_does) @@ query.tsq
+    ),
+    ranked AS (
+        SELECT
+            bill_table_id,
+            sum(rank) AS rank
+        FROM
+            matches
+        GROUP BY
+            bill_table_id
+        ORDER BY
+            rank DESC
+        LIMIT $2
+    )
+    SELECT
+        r.bill_table_id,
+        r.rank,
+        ts_headline('english', s.what_it_does, query.tsq, 'MaxFragments=1, MaxWords=40, MinWords=15, StartSel=*, StopSel=*') AS snippet
+    FROM
+        ranked r
+    JOIN
+        public.ai_bill_summaries s ON s.bill_table_id = r.bill_table_id
+    CROSS JOIN
+        query
+    ORDER BY
+        r.rank DESC
+    """,
+    "bill_details": """
+    SELECT
+        b.id,
+        b.bill_id as bill_short_name,
+        b.title,
+        s.what_it_does,
+        s.bill_text_hash
+    FROM
+        public.bills b
+    JOIN
+        public.ai_bill_summaries s ON b.id = s.bill_table_id
+    WHERE
+        b.id = ANY($1::int[])
+    """,
+}
+
 # --- Initialize Clients ---
 try:
     OPENAI_API_KEY = os.environ["OPENAI_API_KEY"]
@@ -33,22 +315,188 @@ except KeyError as e:
     logging.error(f"FATAL: Missing environment variable: {e}")
     raise SystemExit(f"Error: Missing environment variable: {e}. Please set it before running.")
 
+embedding_cache = EmbeddingCache(EMBEDDING_CACHE_PATH or None, EMBEDDING_CACHE_SIZE)
+facet_cache = LRUCache(FACET_CACHE_SIZE, FACET_CACHE_TTL)
+result_cache = LRUCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL)
+synthesis_cache = LRUCache(SYNTHESIS_CACHE_SIZE, SYNTHESIS_CACHE_TTL)
+reranker = Reranker(RERANKER_MODEL, RERANK_BATCH_SIZE)
+token_counter = TokenCounter(LLM_MODEL)
+vector_index = None
+if VECTOR_SEARCH_MODE == "memory":
+    from vector_index import VectorIndex
+    vector_index = VectorIndex()
+
 # --- Helper Functions ---
 
-def _get_db_connection():
-    """Establishes a connection to the Supabase PostgreSQL database."""
-    try:
-        conn = psycopg2.connect(SUPABASE_DB_URL)
-        return conn
-    except psycopg2.OperationalError as e:
-        logging.error(f"Database connection failed: {e}")
-        raise
+_db_pool = None
+_db_pool_lock = threading.Lock()
 
-def _extract_persona_facets(persona: str) -> List[str]:
+def _setup_connection(conn):
+    """Applies ANN session settings and prepares the search queries on a new pooled connection."""
+    with conn.cursor() as cur:
+        if _hnsw_ef_search():
+            cur.execute("SET hnsw.ef_search = %s", (_hnsw_ef_search(),))
+        if IVFFLAT_PROBES:
+            cur.execute("SET ivfflat.probes = %s", (int(IVFFLAT_PROBES),))
+        if USE_PREPARED_STATEMENTS:
+            for name, sql in PREPARED_STATEMENTS.items():
+                cur.execute(f"PREPARE {name} AS {sql}")
+
+def _get_db_pool() -> ConnectionPool:
+    """Returns the process-wide connection pool, creating it on first use."""
+    global _db_pool
+    if _db_pool is None:
+        with _db_pool_lock:
+            if _db_pool is None:
+                try:
+                    _db_pool = ConnectionPool(
+                        SUPABASE_DB_URL,
+                        minconn=DB_POOL_MIN_CONNECTIONS,
+                        maxconn=DB_POOL_MAX_CONNECTIONS,
+                        max_lifetime=DB_CONNECTION_MAX_LIFETIME,
+                        health_check_after=DB_HEALTH_CHECK_AFTER,
+                        on_connect=_setup_connection,
+                    )
+                except psycopg2.OperationalError as e:
+                    logging.error(f"Database connection failed: {e}")
+                    raise
+    return _db_pool
+
+@contextmanager
+def _get_db_connection():
+    """Borrows a connection to the Supabase PostgreSQL database from the pool."""
+    with _get_db_pool().connection() as conn:
+        yield conn
+
+def _to_pyformat(sql: str, params: Tuple) -> Tuple[str, Tuple]:
+    """Rewrites $n placeholders for psycopg2, repeating params that are referenced more than once."""
+    order = []
+    def placeholder(match):
+        order.append(int(match.group(1)) - 1)
+        return "%s"
+    sql = re.sub(r"\$(\d+)", placeholder, sql)
+    return sql, tuple(params[i] for i in order)
+
+def _execute_statement(cur, name: str, params: Tuple):
+    """Runs one of PREPARED_STATEMENTS, as EXECUTE or as plain SQL if preparing is disabled."""
+    if USE_PREPARED_STATEMENTS:
+        placeholders = ", ".join(["%s"] * len(params))
+        cur.execute(f"EXECUTE {name} ({placeholders})", params)
+    else:
+        cur.execute(*_to_pyformat(PREPARED_STATEMENTS[name], params))
+
+EMBEDDINGS_WATERMARK_SQL = "SELECT max(id), count(*) FROM public.summary_embeddings"
+
+_watermark = {"value": None, "checked_at": 0.0}
+_watermark_lock = threading.Lock()
+
+def _cached_watermark() -> Tuple[bool, Any]:
+    """Returns (fresh, value) for the last summary_embeddings watermark read."""
+    with _watermark_lock:
+        fresh = time.monotonic() - _watermark["checked_at"] < EMBEDDINGS_WATERMARK_INTERVAL
+        return fresh, _watermark["value"]
+
+def _record_watermark(value: Any):
+    """Stores a newly read watermark, clearing the result cache if it moved."""
+    with _watermark_lock:
+        if value != _watermark["value"] and _watermark["value"] is not None:
+            logging.info(f"Summary embeddings changed (max id, rows: {value}), clearing result cache")
+            result_cache.clear()
+        _watermark.update(value=value, checked_at=time.monotonic())
+
+def _get_embeddings_watermark(conn) -> Any:
     """
-    Uses an LLM to deconstruct a user persona into a list of searchable facets.
-    Returns an empty list if the persona is too vague or nonsensical.
+    Returns the highest summary_embeddings id and the row count (which catches
+    deletions), re-reading them at most every EMBEDDINGS_WATERMARK_INTERVAL
+    seconds. Cached results from an older watermark are stale.
     """
+    fresh, value = _cached_watermark()
+    if fresh:
+        return value
+    with conn.cursor() as cur:
+        cur.execute(EMBEDDINGS_WATERMARK_SQL)
+        value = tuple(cur.fetchone())
+    _record_watermark(value)
+    return value
+
+def _cached_results(key: str, watermark: Any) -> Optional[List[Dict[str, Any]]]:
+    """Returns a copy of the cached results for a query key if they match the watermark."""
+    cached = result_cache.get(key)
+    if cached is not None and cached[0] == watermark:
+        logging.info(f"Result cache hit (hit rate {result_cache.stats()['hit_rate']:.0%})")
+        return [dict(result) for result in cached[1]]
+    return None
+
+def _cache_results(key: str, watermark: Any, results: List[Dict[str, Any]]):
+    # Empty results are not cached: they may come from a transient LLM failure
+    if results:
+        result_cache.set(key, (watermark, [dict(result) for result in results]))
+
+def load_reranker():
+    """Loads the cross-encoder ahead of the first request (a no-op when reranking is disabled)."""
+    if ENABLE_RERANKER:
+        reranker.load()
+
+def _fetch_embeddings_after(last_id: int, limit: int) -> List[Tuple[int, int, str, str]]:
+    """Next batch of (id, bill_table_id, chunk_text, embedding_text) rows for the vector index."""
+    with _get_db_connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            "SELECT id, bill_table_id, chunk_text, embedding::text FROM public.summary_embeddings"
+            " WHERE id > %s ORDER BY id LIMIT %s",
+            (last_id, limit),
+        )
+        return cur.fetchall()
+
+def _count_embeddings_through(last_id: int) -> int:
+    """Rows with an id up to last_id; fewer than the vector index holds means rows were deleted."""
+    with _get_db_connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT count(*) FROM public.summary_embeddings WHERE id <= %s", (last_id,))
+        return cur.fetchone()[0]
+
+def start_vector_index():
+    """Starts loading (and then refreshing) the in-process index when VECTOR_SEARCH_MODE=memory."""
+    if vector_index is not None:
+        vector_index.start_refresh(
+            _fetch_embeddings_after, VECTOR_INDEX_REFRESH_INTERVAL, VECTOR_INDEX_BATCH_SIZE, _count_embeddings_through
+        )
+
+def _use_vector_index() -> bool:
+    return vector_index is not None and vector_index.ready
+
+def _best_chunk_per_bill(hits, limit: int) -> List[Tuple[int, float, str]]:
+    """Keeps the first (best) hit for each bill, up to limit bills."""
+    seen = set()
+    best = []
+    for hit in hits:
+        if hit[0] not in seen:
+            seen.add(hit[0])
+            best.append(hit)
+            if len(best) == limit:
+                break
+    return best
+
+def _index_search_for_facets(facet_embeddings: List[List[float]], limit: int = CANDIDATE_BILL_COUNT_PER_FACET) -> List[Tuple[int, int, float, str]]:
+    """In-process equivalent of the search_facets statement."""
+    hits = vector_index.search(facet_embeddings, limit * BILL_OVERFETCH)
+    return [
+        (facet_index, *hit)
+        for facet_index, facet_hits in enumerate(hits)
+        for hit in _best_chunk_per_bill(facet_hits, limit)
+    ]
+
+def _index_search_for_topic(query_embedding: List[float]) -> List[Tuple[int, float, str]]:
+    """In-process equivalent of the search_chunks statement for a topic query."""
+    limit = CANDIDATE_BILL_COUNT_PER_FACET * 2
+    return _best_chunk_per_bill(vector_index.search([query_embedding], limit * BILL_OVERFETCH)[0], limit)
+
+def warm_up():
+    """Opens the pool and its first connection, loads the reranker and starts the vector index."""
+    load_reranker()
+    _get_db_pool().warm_up()
+    start_vector_index()
+
+def _facet_extraction_request(persona: str) -> Dict[str, Any]:
+    """Chat completion arguments for deconstructing a persona into facets."""
     prompt = f"""
     Analyze the following user persona. Extract a list of distinct, concise attributes such as demographics, occupations, interests, locations, and financial situations.
     These attributes should be factual and suitable for a semantic search.
@@ -67,32 +515,78 @@ def _extract_persona_facets(persona: str) -> List[str]:
 
     Persona: "{persona}"
     """
+    return {
+        "model": LLM_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.0,
+        "response_format": {"type": "json_object"},
+    }
+
+def _json_list(content: str) -> List[Any]:
+    """
+    The prompts ask for a JSON array, but response_format wraps it in a dict.
+    Returns the first list value found in the object, or an empty list.
+    """
+    data = json.loads(content)
+    for value in data.values():
+        if isinstance(value, list):
+            return value
+    return []
+
+def _parse_facets(content: Optional[str]) -> List[str]:
+    """Extracts the facet list from a facet extraction response."""
+    if content is None:
+        logging.error("LLM returned None content")
+        return []
     try:
-        print(prompt)
-        response = openai_client.chat.completions.create(
-            model=LLM_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.0,
-            response_format={"type": "json_object"},
-        )
-        # The prompt asks for a JSON array, but response_format wraps it in a dict.
-        # We need to gracefully extract the list, assuming it might be under a key.
-        content = response.choices[0].message.content
-        print(content)
-        if content is None:
-            logging.error("LLM returned None content")
-            return []
-        data = json.loads(content)
-        # Find the list within the JSON object
-        for value in data.values():
-            if isinstance(value, list):
-                return [item for item in value if isinstance(item, str)]
-        return [] # Return empty if no list is found
-    except (json.JSONDecodeError, IndexError, KeyError) as e:
-        logging.error(f"Failed to extract facets from LLM response: {e}. Response: {response.choices[0].message.content}")
+        return [item for item in _json_list(content) if isinstance(item, str)]
+    except (json.JSONDecodeError, AttributeError) as e:
+        logging.error(f"Failed to extract facets from LLM response: {e}. Response: {content}")
+        return []
+
+def _extract_persona_facets(persona: str) -> List[str]:
+    """
+    Uses an LLM to deconstruct a user persona into a list of searchable facets.
+    Returns an empty list if the persona is too vague or nonsensical.
+    """
+    response = openai_client.chat.completions.create(**_facet_extraction_request(persona))
+    return _parse_facets(response.choices[0].message.content)
+
+def _cached_persona_facets(query: str) -> Optional[List[str]]:
+    """
+    Returns [] for queries routed locally to TOPIC, the memoized facets for a
+    known persona, or None when the LLM has to decide.
+    """
+    if ENABLE_QUERY_ROUTER and route_query(query) == TOPIC:
+        logging.info("Query routed to TOPIC locally, skipping facet extraction")
         return []
 
+    facets = facet_cache.get(normalize_text(query))
+    if facets is not None:
+        logging.info(f"Facet cache hit (hit rate {facet_cache.stats()['hit_rate']:.0%})")
+    return facets
+
+def _remember_facets(query: str, facets: List[str]):
+    # Empty results are not memoized: they may come from a transient LLM failure
+    if facets:
+        facet_cache.set(normalize_text(query), facets)
+
+def _get_persona_facets(query: str) -> List[str]:
+    """
+    Returns the persona facets for a query, or an empty list for topic queries.
+    Obvious topics are routed locally; otherwise facets come from the memo or the LLM.
+    """
+    facets = _cached_persona_facets(query)
+    if facets is None:
+        facets = _extract_persona_facets(query)
+        _remember_facets(query, facets)
+    return facets
+
 def _embed_texts(texts: List[str]) -> List[List[float]]:
+    """Returns embeddings for a list of texts, only calling OpenAI for texts not already cached."""
+    return embedding_cache.embed(EMBEDDING_MODEL, texts, _embed_texts_uncached)
+
+def _embed_texts_uncached(texts: List[str]) -> List[List[float]]:
     """Generates embeddings for a list of texts using OpenAI's API."""
     response = openai_client.embeddings.create(
         model=EMBEDDING_MODEL,
@@ -100,29 +594,24 @@ def _embed_texts(texts: List[str]) -> List[List[float]]:
     )
     return [item.embedding for item in response.data]
 
-def _search_for_facet(facet_embedding: List[float], conn) -> List[Tuple[int, float, str]]:
+def _vector_array_literal(embeddings: List[List[float]]) -> str:
+    """Formats embeddings as a Postgres array literal that casts to vector[]."""
+    return "{" + ",".join(f'"{embedding}"' for embedding in embeddings) + "}"
+
+def _search_for_facets(facet_embeddings: List[List[float]], conn) -> List[Tuple[int, int, float, str]]:
     """
-    Performs a vector search in the database for a single facet's embedding.
-    Returns a list of (bill_table_id, similarity_score, chunk_text).
+    Performs the vector searches for all facet embeddings in a single statement.
+    Returns a list of (facet_index, bill_table_id, similarity_score, chunk_text).
     """
-    query = """
-    SELECT
-        bill_table_id,
-        1 - (embedding <=> %s) AS similarity,
-        chunk_text
-    FROM
-        public.summary_embeddings
-    ORDER BY
-        similarity DESC
-    LIMIT %s;
-    """
-    # psycopg2 requires the vector to be a string, not a list
-    embedding_str = str(facet_embedding)
+    if not facet_embeddings:
+        return []
+    if _use_vector_index():
+        return _index_search_for_facets(facet_embeddings)
     results = []
     with conn.cursor() as cur:
-        cur.execute(query, (embedding_str, CANDIDATE_BILL_COUNT_PER_FACET))
+        _execute_statement(cur, "search_facets", (_vector_array_literal(facet_embeddings), *_search_limits(CANDIDATE_BILL_COUNT_PER_FACET)))
         for row in cur.fetchall():
-            results.append((row[0], row[1], row[2])) # bill_id, similarity, chunk_text
+            results.append((row[0], row[1], row[2], row[3])) # facet_index, bill_id, similarity, chunk_text
     return results
 
 def _search_for_topic(query_embedding: List[float], conn) -> List[Tuple[int, float, str]]:
@@ -130,322 +619,392 @@ def _search_for_topic(query_embedding: List[float], conn) -> List[Tuple[int, flo
     Performs a vector search in the database for a topic query embedding against summary_embeddings.
     Returns a list of (bill_table_id, similarity_score, chunk_text).
     """
-    query = """
-    SELECT
-        bill_table_id,
-        1 - (embedding <=> %s) AS similarity,
-        chunk_text
-    FROM
-        public.summary_embeddings
-    ORDER BY
-        similarity DESC
-    LIMIT %s;
-    """
+    if _use_vector_index():
+        return _index_search_for_topic(query_embedding)
     embedding_str = str(query_embedding)
     results = []
     with conn.cursor() as cur:
         # Fetch more candidates for initial topic search to allow LLM more choice
-        cur.execute(query, (embedding_str, CANDIDATE_BILL_COUNT_PER_FACET * 2)) 
+        _execute_statement(cur, "search_chunks", (embedding_str, *_search_limits(CANDIDATE_BILL_COUNT_PER_FACET * 2)))
         for row in cur.fetchall():
             results.append((row[0], row[1], row[2])) # bill_id, similarity, chunk_text
     return results
 
+def _search_lexical(query: str, conn) -> List[Tuple[int, float, str]]:
+    """
+    Full-text search over bill titles and summaries.
+    Returns a list of (bill_table_id, text_rank, snippet), best first.
+    """
+    with conn.cursor() as cur:
+        _execute_statement(cur, "search_lexical", (query, LEXICAL_CANDIDATE_COUNT))
+        return [(row[0], row[1], row[2]) for row in cur.fetchall()]
+
+def _bill_details_from_rows(rows) -> Dict[int, Dict[str, Any]]:
+    """Maps bill_details rows to {bill_table_id: details}."""
+    return {
+        row[0]: {
+            "bill_short_name": row[1],
+            "title": row[2],
+            "what_it_does": row[3],
+            # Changes when the summary is regenerated for new bill text
+            "summary_version": row[4]
+        }
+        for row in rows
+    }
+
 def _get_bill_details(bill_ids: Set[int], conn) -> Dict[int, Dict[str, Any]]:
     """Fetches bill title and summary for a set of candidate bill IDs."""
     if not bill_ids:
         return {}
 
-    query = """
-    SELECT
-        b.id,
-        b.bill_id as bill_short_name,
-        b.title,
-        s.what_it_does
-    FROM
-        public.bills b
-    JOIN
-        public.ai_bill_summaries s ON b.id = s.bill_table_id
-    WHERE
-        b.id IN %s;
-    """
-    bill_details = {}
     with conn.cursor() as cur:
-        cur.execute(query, (tuple(bill_ids),))
-        for row in cur.fetchall():
-            bill_details[row[0]] = {
-                "bill_short_name": row[1],
-                "title": row[2],
-                "what_it_does": row[3]
-            }
-    return bill_details
+        _execute_statement(cur, "bill_details", (list(bill_ids),))
+        return _bill_details_from_rows(cur.fetchall())
 
-def _synthesize_final_results(persona: str, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _rank_persona_candidates(facets: List[str], search_results) -> List[Tuple[int, Dict[str, Any]]]:
     """
-    Uses an LLM to generate the final, user-facing summary and relevance score for each candidate bill.
-    This is done in a single batch call.
+    Groups facet search rows by bill and ranks bills by max similarity plus a
+    bonus for each matching facet.
     """
-    if not candidates:
-        return []
+    all_search_results = {} # {bill_id: {'max_similarity': float, 'matched_facets': set(), 'top_chunk_text': str}}
+    for facet_index, bill_id, similarity, chunk_text in search_results:
+        if bill_id not in all_search_results:
+            all_search_results[bill_id] = {
+                "max_similarity": 0.0,
+                "matched_facets": set(),
+                "top_chunk_text": ""
+            }
 
-    # Construct a detailed prompt with all candidate information
-    candidate_prompts = []
-    for i, cand in enumerate(candidates):
-        candidate_prompts.append(
-            f"""
-            Candidate {i+1}:
-            - Bill ID: {cand['bill_id']}
-            - Bill Title: {cand['details']['title']}
-            - Bill Summary: {cand['details']['what_it_does']}
-            - Matched Persona Facets: {list(cand['matched_facets'])}
-            - Most Relevant Snippet Found: "{cand['top_chunk_text']}"
-            """
-        )
+        if similarity > all_search_results[bill_id]["max_similarity"]:
+            all_search_results[bill_id]["max_similarity"] = similarity
+            all_search_results[bill_id]["top_chunk_text"] = chunk_text
+
+        all_search_results[bill_id]["matched_facets"].add(facets[facet_index])
+
+    return sorted(
+        all_search_results.items(),
+        key=lambda item: item[1]['max_similarity'] + (len(item[1]['matched_facets']) * 0.1),
+        reverse=True
+    )
 
-    system_prompt = """
+def _rank_topic_candidates(search_results) -> List[Tuple[int, Dict[str, Any]]]:
+    """Groups topic search rows by bill and ranks bills by max similarity."""
+    all_search_results = {} # {bill_id: {'max_similarity': float, 'top_chunk_text': str}}
+    for bill_id, similarity, chunk_text in search_results:
+        if bill_id not in all_search_results:
+            all_search_results[bill_id] = {
+                "max_similarity": 0.0,
+                "top_chunk_text": ""
+            }
+        if similarity > all_search_results[bill_id]["max_similarity"]:
+            all_search_results[bill_id]["max_similarity"] = similarity
+            all_search_results[bill_id]["top_chunk_text"] = chunk_text
+
+    return sorted(
+        all_search_results.items(),
+        key=lambda item: item[1]['max_similarity'],
+        reverse=True
+    )
+
+def _fuse_rankings(vector_ranked, lexical_results) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Merges ranked vector candidates with full-text results by reciprocal rank
+    fusion. Bills found only lexically use their summary snippet as top chunk.
+    """
+    fused = {}
+    for rank, (bill_id, data) in enumerate(vector_ranked, start=1):
+        fused[bill_id] = {**data, "rrf_score": 1.0 / (RRF_K + rank)}
+    for rank, (bill_id, _text_rank, snippet) in enumerate(lexical_results, start=1):
+        entry = fused.setdefault(bill_id, {"max_similarity": 0.0, "top_chunk_text": snippet or "", "rrf_score": 0.0})
+        entry["rrf_score"] += 1.0 / (RRF_K + rank)
+
+    return sorted(fused.items(), key=lambda item: item[1]["rrf_score"], reverse=True)
+
+def _candidates_for_synthesis(ranked_candidates, bill_details: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Attaches bill details to the top CANDIDATE_POOL_SIZE candidates; bills without details are skipped."""
+    candidates = []
+    for bill_id, data in ranked_candidates[:CANDIDATE_POOL_SIZE]:
+        if bill_id in bill_details:
+            candidates.append({
+                "bill_id": bill_id,
+                "details": bill_details[bill_id],
+                **data
+            })
+    return candidates
+
+def _rerank_text(candidate: Dict[str, Any]) -> str:
+    """The bill text the cross-encoder compares against the query."""
+    details = candidate["details"]
+    return f"{details['title']}. {details['what_it_does'] or ''} {candidate['top_chunk_text']}"
+
+def _rerank_candidates(query: str, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Narrows the candidate pool to the bills sent to synthesis, by cross-encoder score when enabled."""
+    if not ENABLE_RERANKER:
+        return candidates[:TOP_CANDIDATE_BILLS_FOR_SYNTHESIS]
+    return reranker.rerank(query, candidates, _rerank_text, RERANK_TOP_N)
+
+_SYNTHESIS_SYSTEM_PROMPTS = {
+    True: """
     You are a helpful and concise US policy analyst. Your task is to analyze a user's persona and a list of potentially relevant congressional bills.
     For each bill, you will generate a single, compelling sentence explaining its relevance to the user and a relevance score.
-    The final output MUST be a JSON array of objects. Each object must have two keys: "summary_point" (string) and "relevance_score" (integer 0-100).
+    The final output MUST be a JSON array of objects. Each object must have three keys: "candidate" (integer, the candidate's number), "summary_point" (string) and "relevance_score" (integer 0-100).
     Base the relevance score on how direct and significant the impact on the user's specific persona is. A bill naming a post office for a veteran is less impactful than one changing their healthcare benefits.
+    """,
+    False: """
+    You are a helpful and concise US policy analyst. Your task is to analyze a user's specific policy or issue query and a list of potentially relevant congressional bills.
+    For each bill, you will generate a single, compelling sentence explaining its relevance to the user's query and a relevance score.
+    The final output MUST be a JSON array of objects. Each object must have three keys: "candidate" (integer, the candidate's number), "summary_point" (string) and "relevance_score" (integer 0-100).
+    The relevance score should be based on how directly and significantly the bill addresses or relates to the provided query.
+    """,
+}
+
+def _candidate_block(number: int, cand: Dict[str, Any], is_persona: bool, budget: int) -> str:
+    """
+    One candidate's section of the synthesis prompt, held to budget tokens. The
+    title and facets are capped first; the summary and the matched snippet share
+    what is left, and a snippet that only repeats the summary is dropped.
+    """
+    details = cand["details"]
+    summary = details["what_it_does"] or ""
+    snippet = cand["top_chunk_text"] or ""
+    if is_redundant(snippet, f"{details['title']} {summary}"):
+        snippet = ""
+
+    lines = [
+        f"Candidate {number}:",
+        f"- Bill ID: {cand['bill_id']}",
+        f"- Bill Title: {token_counter.truncate(details['title'] or '', SYNTHESIS_TITLE_MAX_TOKENS)}",
+    ]
+    if is_persona:
+        facets = ", ".join(sorted(cand["matched_facets"]))
+        lines.append(f"- Matched Persona Facets: {token_counter.truncate(facets, SYNTHESIS_FACETS_MAX_TOKENS)}")
+
+    summary_label = "- Bill Summary: "
+    snippet_label = '- Most Relevant Snippet Found: ""'
+    remaining = budget - token_counter.count("\n".join(lines + [summary_label] + ([snippet_label] if snippet else [])))
+    summary = token_counter.truncate(summary, remaining * 3 // 5 if snippet else remaining)
+    lines.append(summary_label + summary)
+    snippet = token_counter.truncate(snippet, remaining - token_counter.count(summary))
+    if snippet:
+        lines.append(f'- Most Relevant Snippet Found: "{snippet}"')
+    return "\n".join(lines)
+
+def _synthesis_request(query: str, candidates: List[Dict[str, Any]], is_persona: bool) -> Dict[str, Any]:
     """
+    Chat completion arguments for summarizing and scoring candidates against a
+    persona or topic. Candidates share what is left of SYNTHESIS_PROMPT_MAX_TOKENS
+    after the instructions, up to SYNTHESIS_CANDIDATE_MAX_TOKENS each.
+    """
+    system_prompt = _SYNTHESIS_SYSTEM_PROMPTS[is_persona]
+    query = token_counter.truncate(query, SYNTHESIS_QUERY_MAX_TOKENS)
+    subject = f'User Persona: "{query}"' if is_persona else f'User Query: "{query}"'
+    basis = "this persona" if is_persona else "this query"
+
     user_prompt = f"""
-    User Persona: "{persona}"
+    {subject}
 
-    Based on this persona, I have found the following candidate bills. Please analyze each one and generate the required JSON output.
-    Return ONLY the JSON array, with one object for each candidate bill. Do not include the bill_id in your output.
+    Based on {basis}, I have found the following candidate bills. Please analyze each one and generate the required JSON output.
+    Return ONLY the JSON array, with one object for each candidate bill, each carrying that candidate's number. Do not include the bill_id in your output.
 
     Candidates:
-    {"".join(candidate_prompts)}
     """
-
+    available = SYNTHESIS_PROMPT_MAX_TOKENS - token_counter.count(system_prompt) - token_counter.count(user_prompt)
+    # Two tokens per candidate for the blank line separating the blocks
+    budget = min(SYNTHESIS_CANDIDATE_MAX_TOKENS, available // max(len(candidates), 1) - 2)
+    user_prompt += "\n\n".join(
+        _candidate_block(i + 1, cand, is_persona, budget) for i, cand in enumerate(candidates)
+    ) + "\n"
+
+    logging.info(
+        f"Synthesis prompt: {token_counter.count(system_prompt) + token_counter.count(user_prompt)} tokens "
+        f"for {len(candidates)} candidates ({budget} per candidate)"
+    )
+    return {
+        "model": LLM_MODEL,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        "temperature": 0.2,
+        "response_format": {"type": "json_object"},
+    }
+
+def _parse_synthesis(content: Optional[str], candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Combines the LLM's per-candidate output with our internal bill_id, matched on the echoed candidate number."""
+    if content is None:
+        logging.error("LLM returned None content for synthesis")
+        return []
     try:
-        response = openai_client.chat.completions.create(
-            model=LLM_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.2,
-            response_format={"type": "json_object"}
+        llm_results = _json_list(content)
+    except (json.JSONDecodeError, AttributeError) as e:
+        logging.error(f"LLM synthesis returned malformed data: {e}. Response: {content}")
+        return []
+
+    final_results = {}
+    for res in llm_results:
+        result = _synthesis_result(res, candidates)
+        if result is None:
+            logging.error(f"Skipping malformed synthesis result: {res}")
+        elif result["bill_id"] not in final_results:
+            final_results[result["bill_id"]] = result
+    return list(final_results.values())
+
+def _synthesis_result(res: Any, candidates: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Pairs one LLM output object with the candidate whose number it echoes, or None if it is malformed."""
+    if not (isinstance(res, dict) and 'summary_point' in res and 'relevance_score' in res):
+        return None
+    number = res.get('candidate')
+    if isinstance(number, str) and number.strip().isdigit():
+        number = int(number)
+    if isinstance(number, bool) or not isinstance(number, int) or not 1 <= number <= len(candidates):
+        return None
+    return {
+        "bill_id": candidates[number - 1]['bill_id'],
+        "summary_point": res['summary_point'],
+        "relevance_score": res['relevance_score']
+    }
+
+def _top_results(final_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sorts synthesized results by relevance and caps them at MAX_FINAL_RESULTS."""
+    final_results.sort(key=lambda x: x['relevance_score'], reverse=True)
+    return final_results[:MAX_FINAL_RESULTS]
+
+def _synthesis_cache_key(query: str, candidate: Dict[str, Any], is_persona: bool) -> Tuple:
+    """
+    Persona sentences are shared by every persona matching the bill on the same
+    facets; topic sentences by the same normalized topic. The summary version
+    retires entries when a bill's summary is regenerated.
+    """
+    if is_persona:
+        subject = ("persona", tuple(sorted(normalize_text(facet) for facet in candidate["matched_facets"])))
+    else:
+        subject = ("topic", normalize_text(query))
+    return subject + (candidate["bill_id"], candidate["details"].get("summary_version"))
+
+def _split_synthesis_cache(query: str, candidates: List[Dict[str, Any]], is_persona: bool) -> Tuple[Dict[int, Dict[str, Any]], List[Dict[str, Any]]]:
+    """Returns ({bill_id: cached result}, candidates that still need the LLM)."""
+    cached, misses = {}, []
+    for cand in candidates:
+        hit = synthesis_cache.get(_synthesis_cache_key(query, cand, is_persona))
+        if hit is not None:
+            cached[cand["bill_id"]] = {"bill_id": cand["bill_id"], **hit}
+        else:
+            misses.append(cand)
+    if cached:
+        logging.info(f"Synthesis cache: {len(cached)}/{len(candidates)} candidates cached")
+    return cached, misses
+
+def _remember_synthesis(query: str, candidates: List[Dict[str, Any]], is_persona: bool, results: List[Dict[str, Any]]):
+    """Caches a synthesis response, unless it left candidates out (a sign the model lost track of them)."""
+    if len(results) != len(candidates):
+        logging.warning(f"Not caching synthesis: {len(results)} results for {len(candidates)} candidates")
+        return
+    by_bill = {cand["bill_id"]: cand for cand in candidates}
+    for result in results:
+        synthesis_cache.set(
+            _synthesis_cache_key(query, by_bill[result["bill_id"]], is_persona),
+            {"summary_point": result["summary_point"], "relevance_score": result["relevance_score"]},
         )
-        content = response.choices[0].message.content
-        # As before, extract the list from the returned JSON object
-        if content is None:
-            logging.error("LLM returned None content")
-            return []
-        data = json.loads(content)
-        llm_results = []
-        for value in data.values():
-            if isinstance(value, list):
-                llm_results = value
-                break
 
-        # Combine LLM results with our internal bill_id
-        final_results = []
-        for i, res in enumerate(llm_results):
-            if i < len(candidates):
-                # Ensure the LLM result is well-formed before adding
-                if 'summary_point' in res and 'relevance_score' in res:
-                    final_results.append({
-                        "bill_id": candidates[i]['bill_id'],
-                        "summary_point": res['summary_point'],
-                        "relevance_score": res['relevance_score']
-                    })
-        return final_results
-    except (json.JSONDecodeError, IndexError, KeyError) as e:
-        logging.error(f"LLM synthesis failed or returned malformed data: {e}")
+def _merge_synthesis(candidates: List[Dict[str, Any]], cached: Dict[int, Dict[str, Any]], fresh: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Cached and freshly generated results, in candidate rank order."""
+    results = {**cached, **{result["bill_id"]: result for result in fresh}}
+    return [results[cand["bill_id"]] for cand in candidates if cand["bill_id"] in results]
+
+def _synthesize(query: str, candidates: List[Dict[str, Any]], is_persona: bool) -> List[Dict[str, Any]]:
+    """Generates results for the candidates not in the synthesis cache in one LLM call."""
+    if not candidates:
         return []
+    cached, misses = _split_synthesis_cache(query, candidates, is_persona)
+    fresh = []
+    if misses:
+        response = openai_client.chat.completions.create(**_synthesis_request(query, misses, is_persona))
+        fresh = _parse_synthesis(response.choices[0].message.content, misses)
+        _remember_synthesis(query, misses, is_persona, fresh)
+    return _merge_synthesis(candidates, cached, fresh)
+
+def _synthesize_final_results(persona: str, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Uses an LLM to generate the final, user-facing summary and relevance score for each candidate bill.
+    This is done in a single batch call, for the candidates not already in the synthesis cache.
+    """
+    return _synthesize(persona, candidates, is_persona=True)
 
 def _synthesize_topic_results(query: str, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Uses an LLM to generate the final, user-facing summary and relevance score for each candidate bill
     based on a generic topic query.
     """
-    if not candidates:
-        return []
+    return _synthesize(query, candidates, is_persona=False)
 
-    candidate_prompts = []
-    for i, cand in enumerate(candidates):
-        candidate_prompts.append(
-            f"""
-            Candidate {i+1}:
-            - Bill ID: {cand['bill_id']}
-            - Bill Title: {cand['details']['title']}
-            - Bill Summary: {cand['details']['what_it_does']}
-            - Most Relevant Snippet Found: "{cand['top_chunk_text']}"
-            """
-        )
 
-    system_prompt = """
-    You are a helpful and concise US policy analyst. Your task is to analyze a user's specific policy or issue query and a list of potentially relevant congressional bills.
-    For each bill, you will generate a single, compelling sentence explaining its relevance to the user's query and a relevance score.
-    The final output MUST be a JSON array of objects. Each object must have two keys: "summary_point" (string) and "relevance_score" (integer 0-100).
-    The relevance score should be based on how directly and significantly the bill addresses or relates to the provided query.
+# --- Main Orchestration Function ---
+
+def intelligent_bill_search(query: str) -> List[Dict[str, Any]]:
     """
-    user_prompt = f"""
-    User Query: "{query}"
+    Intelligently searches for relevant bills based on whether the query is a persona or a generic topic.
+    Repeat queries are answered from the result cache until new embeddings land or the entry expires.
+    """
+    logging.info(f"Received query: '{query}'")
+    key = normalize_text(query)
 
-    Based on this query, I have found the following candidate bills. Please analyze each one and generate the required JSON output.
-    Return ONLY the JSON array, with one object for each candidate bill. Do not include the bill_id in your output.
+    with _get_db_connection() as conn:
+        watermark = _get_embeddings_watermark(conn)
+        cached = _cached_results(key, watermark)
+        if cached is not None:
+            return cached
 
-    Candidates:
-    {"".join(candidate_prompts)}
-    """
+        results = _search_bills(query, conn)
 
-    try:
-        response = openai_client.chat.completions.create(
-            model=LLM_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.2,
-            response_format={"type": "json_object"}
-        )
-        content = response.choices[0].message.content
-        if content is None:
-            logging.error("LLM returned None content for topic synthesis")
+    _cache_results(key, watermark, results)
+    return results
+
+def _search_bills(query: str, conn) -> List[Dict[str, Any]]:
+    """Runs the persona or topic search pipeline for a query on a borrowed connection."""
+    # Attempt to extract persona facets first
+    facets = _get_persona_facets(query)
+
+    if facets:
+        logging.info(f"Query identified as PERSONA. Facets: {facets}")
+        facet_embeddings = _embed_texts(facets)
+
+        logging.info(f"Performing vector search for {len(facets)} facets...")
+        ranked_candidates = _rank_persona_candidates(facets, _search_for_facets(facet_embeddings, conn))
+        if not ranked_candidates:
+            logging.info("No bills found matching any facets.")
             return []
-        data = json.loads(content)
-        llm_results = []
-        for value in data.values():
-            if isinstance(value, list):
-                llm_results = value
-                break
 
-        final_results = []
-        for i, res in enumerate(llm_results):
-            if i < len(candidates):
-                if 'summary_point' in res and 'relevance_score' in res:
-                    final_results.append({
-                        "bill_id": candidates[i]['bill_id'],
-                        "summary_point": res['summary_point'],
-                        "relevance_score": res['relevance_score']
-                    })
-        return final_results
-    except (json.JSONDecodeError, IndexError, KeyError) as e:
-        logging.error(f"LLM synthesis for topic query failed or returned malformed data: {e}. Response: {response.choices[0].message.content if 'response' in locals() else 'N/A'}")
-        return []
+        top_candidate_ids = {item[0] for item in ranked_candidates[:CANDIDATE_POOL_SIZE]}
+        candidates = _candidates_for_synthesis(ranked_candidates, _get_bill_details(top_candidate_ids, conn))
+        candidates_for_synthesis = _rerank_candidates(query, candidates)
 
+        logging.info("Synthesizing final results for persona with LLM...")
+        final_results = _synthesize_final_results(query, candidates_for_synthesis)
 
-# --- Main Orchestration Function ---
+        logging.info(f"Successfully generated {len(final_results)} persona results. Returning top {MAX_FINAL_RESULTS}.")
+        return _top_results(final_results)
 
-def intelligent_bill_search(query: str) -> List[Dict[str, Any]]:
-    """
-    Intelligently searches for relevant bills based on whether the query is a persona or a generic topic.
-    """
-    logging.info(f"Received query: '{query}'")
+    else:
+        logging.info(f"Query identified as TOPIC: {query}")
+        query_embedding = _embed_texts([query])[0]
 
-    conn = _get_db_connection()
-    try:
-        # Attempt to extract persona facets first
-        facets = _extract_persona_facets(query)
+        logging.info("Performing vector search for topic...")
+        ranked_candidates = _rank_topic_candidates(_search_for_topic(query_embedding, conn))
+        if ENABLE_HYBRID_SEARCH:
+            ranked_candidates = _fuse_rankings(ranked_candidates, _search_lexical(query, conn))
+        if not ranked_candidates:
+            logging.info("No bills found matching the topic query.")
+            return []
 
-        if facets:
-            logging.info(f"Query identified as PERSONA. Facets: {facets}")
-            # Persona path: re-using logic from original answer_persona_query
-            facet_embeddings = _embed_texts(facets)
-            all_search_results = {} # {bill_id: {'max_similarity': float, 'facets': set(), 'chunks': list}}
-
-            logging.info("Performing vector search for each facet...")
-            for i, facet in enumerate(facets):
-                facet_embedding = facet_embeddings[i]
-                search_results = _search_for_facet(facet_embedding, conn)
-
-                for bill_id, similarity, chunk_text in search_results:
-                    if bill_id not in all_search_results:
-                        all_search_results[bill_id] = {
-                            "max_similarity": 0.0,
-                            "matched_facets": set(),
-                            "top_chunk_text": ""
-                        }
-
-                    if similarity > all_search_results[bill_id]["max_similarity"]:
-                        all_search_results[bill_id]["max_similarity"] = similarity
-                        all_search_results[bill_id]["top_chunk_text"] = chunk_text
-                    
-                    all_search_results[bill_id]["matched_facets"].add(facet)
-
-            if not all_search_results:
-                logging.info("No bills found matching any facets.")
-                return []
-
-            # Score is based on max similarity plus a bonus for each matching facet
-            ranked_candidates = sorted(
-                all_search_results.items(),
-                key=lambda item: item[1]['max_similarity'] + (len(item[1]['matched_facets']) * 0.1),
-                reverse=True
-            )
-            
-            top_candidate_ids = {item[0] for item in ranked_candidates[:TOP_CANDIDATE_BILLS_FOR_SYNTHESIS]}
-            bill_details = _get_bill_details(top_candidate_ids, conn)
-            
-            candidates_for_synthesis = []
-            for bill_id, data in ranked_candidates[:TOP_CANDIDATE_BILLS_FOR_SYNTHESIS]:
-                if bill_id in bill_details:
-                    candidates_for_synthesis.append({
-                        "bill_id": bill_id,
-                        "details": bill_details[bill_id],
-                        **data
-                    })
-
-            logging.info("Synthesizing final results for persona with LLM...")
-            final_results = _synthesize_final_results(query, candidates_for_synthesis)
-            final_results.sort(key=lambda x: x['relevance_score'], reverse=True)
-            
-            logging.info(f"Successfully generated {len(final_results)} persona results. Returning top {MAX_FINAL_RESULTS}.")
-            return final_results[:MAX_FINAL_RESULTS]
+        top_candidate_ids = {item[0] for item in ranked_candidates[:CANDIDATE_POOL_SIZE]}
+        candidates = _candidates_for_synthesis(ranked_candidates, _get_bill_details(top_candidate_ids, conn))
+        candidates_for_synthesis = _rerank_candidates(query, candidates)
 
-        else:
-            logging.info(f"Query identified as TOPIC: {query}")
-            # Topic path
-            query_embedding = _embed_texts([query])[0]
-
-            logging.info("Performing vector search for topic...")
-            search_results = _search_for_topic(query_embedding, conn)
-
-            all_search_results = {} # {bill_id: {'max_similarity': float, 'top_chunk_text': str}}
-            for bill_id, similarity, chunk_text in search_results:
-                if bill_id not in all_search_results:
-                    all_search_results[bill_id] = {
-                        "max_similarity": 0.0,
-                        "top_chunk_text": ""
-                    }
-                if similarity > all_search_results[bill_id]["max_similarity"]:
-                    all_search_results[bill_id]["max_similarity"] = similarity
-                    all_search_results[bill_id]["top_chunk_text"] = chunk_text
-            
-            if not all_search_results:
-                logging.info("No bills found matching the topic query.")
-                return []
-
-            # Rank candidates simply by max_similarity
-            ranked_candidates = sorted(
-                all_search_results.items(),
-                key=lambda item: item[1]['max_similarity'],
-                reverse=True
-            )
-
-            top_candidate_ids = {item[0] for item in ranked_candidates[:TOP_CANDIDATE_BILLS_FOR_SYNTHESIS]}
-            bill_details = _get_bill_details(top_candidate_ids, conn)
-            
-            candidates_for_synthesis = []
-            for bill_id, data in ranked_candidates[:TOP_CANDIDATE_BILLS_FOR_SYNTHESIS]:
-                if bill_id in bill_details:
-                    candidates_for_synthesis.append({
-                        "bill_id": bill_id,
-                        "details": bill_details[bill_id],
-                        **data
-                    })
-
-            logging.info("Synthesizing final results for topic with LLM...")
-            final_results = _synthesize_topic_results(query, candidates_for_synthesis)
-            final_results.sort(key=lambda x: x['relevance_score'], reverse=True)
-            
-            logging.info(f"Successfully generated {len(final_results)} topic results. Returning top {MAX_FINAL_RESULTS}.")
-            return final_results[:MAX_FINAL_RESULTS]
-    finally:
-        if conn:
-            conn.close()
+        logging.info("Synthesizing final results for topic with LLM...")
+        final_results = _synthesize_topic_results(query, candidates_for_synthesis)
+
+        logging.info(f"Successfully generated {len(final_results)} topic results. Returning top {MAX_FINAL_RESULTS}.")
+        return _top_results(final_results)
 
 # Example usage for local testing
 if __name__ == '__main__':
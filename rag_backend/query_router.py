@@ -0,0 +1,98 @@
+# Local router that decides, without an LLM call, whether a search query is
+# obviously a topic ("healthcare reform") rather than a persona ("I'm a nurse
+# in Ohio with two kids"). A handful of weighted lexical features feed a
+# logistic score; only queries that score low and name a policy subject skip
+# facet extraction, everything else still goes to the LLM, which has the
+# final say.
+
+import math
+import re
+from typing import List, Tuple
+
+TOPIC = "topic"
+UNDECIDED = "undecided"
+
+# Persona probability below which a query is routed straight to topic search
+TOPIC_ROUTE_THRESHOLD = 0.25
+
+_BIAS = -1.0
+# Phrased as a subject to look up
+_LOOKUP_PHRASING = re.compile(
+    r"^(bills?|legislation|laws?|polic(y|ies))\b|\b(bills?|legislation|laws?) (about|on|for|regarding|related to)\b"
+)
+_POLICY_TERMS = re.compile(r"\b(reform|act|program|funding|regulation|tax credits?|subsid(y|ies))\b")
+# Policy areas; a query needs one of these (or the patterns above) to be routed as a topic
+_POLICY_AREAS = re.compile(
+    r"\b(health ?care|medicare|medicaid|insurance|prescription drugs?|immigration|border|climate|emissions|"
+    r"energy|renewables?|oil|gas|water|environment(al)?|education|schools?|student loans?|housing|rent control|"
+    r"guns?|firearms?|abortion|infrastructure|broadband|transportation|defense|military|national security|"
+    r"taxe?s|tariffs?|trade|budget|deficit|social security|pensions?|wages?|minimum wage|labor|unions?|"
+    r"agriculture|farm bill|food|nutrition|snap|privacy|cybersecurity|artificial intelligence|ai|crypto\w*|"
+    r"elections?|voting|campaign finance|criminal justice|policing|drugs?|opioids?|cannabis|marijuana|"
+    r"child care|childcare|disability|veterans affairs|civil rights|foreign aid|sanctions)\b"
+)
+_FEATURES: List[Tuple["re.Pattern[str]", float]] = [
+    # Talking about oneself
+    (re.compile(r"\b(i|i'm|im|i've|i'd|i'll|me|my|mine|myself|we|we're|our|ours|us)\b"), 3.0),
+    (re.compile(r"\bas an? \w+"), 2.0),
+    # Self-description: age, family, occupation, residence
+    (re.compile(
+        r"\b(\d+[\s-]*years?[\s-]*old|married|single|divorced|widowed|kids?|children|son|daughter|"
+        r"retired|retiree|veteran|student|parent|mom|mother|dad|father|grandparent|pregnant|"
+        r"unemployed|self-employed|homeowner|renter|living in|live in|lives in|work as|working as|works as)\b"
+    ), 1.5),
+    # A bare occupation, role or group ("nurse", "small business owner", "farmer in Iowa")
+    (re.compile(
+        r"\b(nurses?|teachers?|farmers?|ranchers?|doctors?|physicians?|pharmacists?|dentists?|therapists?|"
+        r"(business|home|restaurant|shop|store) owners?|entrepreneurs?|freelancers?|contractors?|"
+        r"engineers?|developers?|programmers?|scientists?|researchers?|professors?|lawyers?|accountants?|"
+        r"truck drivers?|truckers?|drivers?|electricians?|plumbers?|mechanics?|miners?|fishermen|fisherman|"
+        r"factory workers?|workers?|employees?|caregivers?|firefighters?|police officers?|soldiers?|"
+        r"social workers?|waiters?|waitress(es)?|servers?|bartenders?|cashiers?|artists?|musicians?|"
+        r"immigrants?|refugees?|seniors?|senior citizens?|landlords?|tenants?|disabled|gig workers?|"
+        r"small business|union members?|grad(uate)? students?|"
+        # Generic roles that make any policy word personal ("gun owner", "Medicare recipient")
+        r"owners?|recipients?|beneficiar(y|ies)|holders?|enrollees?|patients?|borrowers?|taxpayers?|"
+        r"policyholders?|consumers?|customers?|residents?|citizens?|voters?|employers?|survivors?|"
+        r"users?|earners?|applicants?|claimants?|dependents?|caretakers?)\b"
+    ), 2.5),
+    (_LOOKUP_PHRASING, -1.5),
+    (_POLICY_TERMS, -1.0),
+]
+
+# Patterns that mark a query as being about a subject
+_TOPIC_SIGNALS = (_LOOKUP_PHRASING, _POLICY_TERMS, _POLICY_AREAS)
+
+
+def persona_probability(query: str) -> float:
+    """Estimated probability that a query describes a person rather than a topic."""
+    text = " ".join(query.lower().split())
+    words = len(text.split())
+
+    score = _BIAS
+    for pattern, weight in _FEATURES:
+        if pattern.search(text):
+            score += weight
+    if words <= 4:
+        score -= 1.5
+    elif words > 12:
+        score += 1.0
+
+    return 1.0 / (1.0 + math.exp(-score))
+
+
+def has_topic_signal(query: str) -> bool:
+    """True if the query names a policy subject or is phrased as a lookup."""
+    text = " ".join(query.lower().split())
+    return any(pattern.search(text) for pattern in _TOPIC_SIGNALS)
+
+
+def route_query(query: str, threshold: float = TOPIC_ROUTE_THRESHOLD) -> str:
+    """TOPIC for obvious topic queries, UNDECIDED when the LLM should decide.
+
+    A low persona score alone is not enough: short persona inputs ("nurse")
+    score low too, so the query must also carry a positive topic signal.
+    """
+    if persona_probability(query) < threshold and has_topic_signal(query):
+        return TOPIC
+    return UNDECIDED
@@ -0,0 +1,69 @@
+# Cross-encoder reranking for the query engine. The vector search ranks bills
+# by raw chunk similarity; a small cross-encoder (pre-downloaded in the
+# Dockerfile) reads each (query, bill text) pair and gives a much better
+# ordering, so fewer candidates need to be sent to the LLM for synthesis.
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class Reranker:
+    """Lazily loaded sentence-transformers CrossEncoder scoring (query, passage) pairs in batches."""
+
+    def __init__(self, model_name: str, batch_size: int = 32, max_length: int = 512):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self._model = None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        """Loads the model once; returns False (and stays disabled) if it cannot be loaded."""
+        if self._model is not None or self._failed:
+            return self._model is not None
+        with self._lock:
+            if self._model is None and not self._failed:
+                try:
+                    from sentence_transformers import CrossEncoder
+                    started = time.monotonic()
+                    self._model = CrossEncoder(self.model_name, max_length=self.max_length)
+                    logging.info(f"Loaded reranker {self.model_name} in {time.monotonic() - started:.1f}s")
+                except Exception as e:
+                    logging.error(f"Could not load reranker {self.model_name}, keeping vector order: {e}")
+                    self._failed = True
+        return self._model is not None
+
+    def score(self, query: str, passages: List[str]) -> Optional[List[float]]:
+        """Relevance scores for each passage, or None if the model is unavailable."""
+        if not passages or not self.load():
+            return None
+        scores = self._model.predict(
+            [(query, passage) for passage in passages],
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+        )
+        return [float(score) for score in scores]
+
+    def rerank(
+        self,
+        query: str,
+        candidates: List[Dict[str, Any]],
+        text_fn: Callable[[Dict[str, Any]], str],
+        top_n: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the top_n candidates by cross-encoder score, each annotated with
+        "rerank_score". Falls back to the incoming order if scoring is unavailable.
+        """
+        started = time.monotonic()
+        scores = self.score(query, [text_fn(candidate) for candidate in candidates])
+        if scores is None:
+            return candidates[:top_n]
+        for candidate, score in zip(candidates, scores):
+            candidate["rerank_score"] = score
+        reranked = sorted(candidates, key=lambda candidate: candidate["rerank_score"], reverse=True)
+        logging.info(f"Reranked {len(candidates)} candidates in {(time.monotonic() - started) * 1000:.0f}ms")
+        return reranked[:top_n]
@@ -1,8 +1,12 @@
 # server.py
 # FastAPI server that provides an HTTP wrapper for our two RAG endpoints.
-# Exposes two endpoints /search_bills and /ask
+# Exposes two endpoints /search_bills (also streamed at /search_bills/stream and
+# batched at /search_bills/batch) and /ask
 import os
+import json
+import logging
 from fastapi import FastAPI, HTTPException, Depends, Header
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from dotenv import load_dotenv
@@ -22,16 +26,40 @@ API_KEY = os.getenv("API_KEY")
 if not API_KEY:
     raise ValueError("API_KEY environment variable not set")
 
+# Largest number of queries accepted by /search_bills/batch
+MAX_BATCH_QUERIES = int(os.getenv("MAX_BATCH_QUERIES", "50"))
+
 # Initialize FastAPI app
 app = FastAPI(title="PolGen API", version="1.0.0")
 
 # Security scheme
 security = HTTPBearer()
 
+def _bill_search():
+    """Import the /search_bills engine, which validates its configuration at import time."""
+    try:
+        import async_query_engine
+    except SystemExit as e:
+        # A misconfigured search stack must not take down the server (and /ask with it)
+        raise RuntimeError(f"Bill search is not configured: {e}") from None
+    return async_query_engine
+
+@app.on_event("startup")
+async def warm_up_search():
+    """Open the /search_bills connection pool before the first request arrives."""
+    try:
+        await _bill_search().warm_up()
+    except Exception as e:
+        # /search_bills will retry on demand and report its own errors
+        logging.exception(f"Could not warm up bill search: {e}")
+
 # --- Original Models for /search_bills ---
 class PersonaRequest(BaseModel):
     query: str
 
+class BatchPersonaRequest(BaseModel):
+    queries: List[str]
+
 class BillSummary(BaseModel):
     summary_point: str
     bill_id: int
@@ -119,14 +147,59 @@ async def search_bills(
     Requires Bearer token authentication with API_KEY from environment.
     """
     try:
-        # Call the new intelligent search function
-        from query_engine import intelligent_bill_search
-        results = intelligent_bill_search(request.query)
+        # Call the async search pipeline, which overlaps its I/O-bound stages
+        results = await _bill_search().intelligent_bill_search_async(request.query)
         return results
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
 
 
+@app.post("/search_bills/batch", response_model=list[list[BillSummary]])
+async def search_bills_batch(
+    request: BatchPersonaRequest,
+    _api_key: str = Depends(verify_api_key)
+):
+    """
+    Run /search_bills for several queries at once (e.g. precomputing per-persona feeds).
+    Returns one result list per query, in request order. Embeddings, vector searches
+    and bill lookups are shared across the batch.
+    """
+    if len(request.queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_QUERIES} queries per batch")
+    try:
+        return await _bill_search().intelligent_bill_search_many(request.queries)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing queries: {str(e)}")
+
+
+@app.post("/search_bills/stream")
+async def search_bills_stream(
+    request: PersonaRequest,
+    _api_key: str = Depends(verify_api_key)
+):
+    """
+    Same search as /search_bills, streamed as Server-Sent Events so results can be
+    rendered before synthesis finishes. Events, each with a JSON payload:
+      candidates - ranked bills [{bill_id, bill_short_name, title, similarity}] after retrieval
+      result     - one {bill_id, summary_point, relevance_score} as soon as it is generated
+      done       - the final sorted results, identical to the /search_bills response
+      error      - {detail} if the search fails part-way
+    """
+    async def events():
+        try:
+            async for event, data in _bill_search().stream_bill_search(request.query):
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': f'Error processing query: {str(e)}'})}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Stop proxies (e.g. nginx) from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
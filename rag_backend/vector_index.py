@@ -0,0 +1,134 @@
+# In-process exact vector index over summary_embeddings. All chunk embeddings
+# are held in one normalized float32 matrix, so a batch of query vectors is
+# answered with a single matrix multiply instead of a database round trip.
+# New rows are picked up by polling for ids above the last one loaded. Rows do
+# get deleted (removing a bill cascades to its chunks), so each refresh also
+# counts the rows up to that id; fewer than the index holds means some were
+# deleted, and the index is rebuilt from scratch while the old copy keeps
+# serving. Memory cost is about 6 KB per chunk (1536 float32 dimensions).
+
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (bill_table_id, similarity, chunk_text)
+Hit = Tuple[int, float, str]
+
+
+class VectorIndex:
+    """Append-only cosine similarity index; searches run lock-free on a consistent snapshot."""
+
+    def __init__(self, dimensions: int = 1536):
+        self.dimensions = dimensions
+        self.last_id = 0
+        self.ready = False
+        # (matrix, bill_ids, chunk_texts, size) swapped as one tuple so readers see a consistent snapshot
+        self._state = (np.empty((0, dimensions), dtype=np.float32), np.empty(0, dtype=np.int64), [], 0)
+        self._write_lock = threading.Lock()
+        self._thread = None
+
+    def __len__(self) -> int:
+        return self._state[3]
+
+    def add_rows(self, rows: Sequence[Tuple[int, int, str, str]]):
+        """Appends (id, bill_table_id, chunk_text, embedding_text) rows, ordered by id."""
+        if not rows:
+            return
+        embeddings = np.vstack([
+            np.fromstring(embedding.strip("[]"), dtype=np.float32, sep=",") for _, _, _, embedding in rows
+        ])
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.where(norms == 0, 1, norms)
+
+        with self._write_lock:
+            matrix, bill_ids, chunk_texts, size = self._state
+            needed = size + len(rows)
+            if needed > len(matrix):
+                # Grow geometrically; readers keep using the old arrays until the swap
+                capacity = max(needed, 2 * len(matrix), 1024)
+                matrix = np.empty((capacity, self.dimensions), dtype=np.float32)
+                matrix[:size] = self._state[0][:size]
+                bill_ids = np.empty(capacity, dtype=np.int64)
+                bill_ids[:size] = self._state[1][:size]
+            # Rows past size are invisible to readers of the current snapshot
+            matrix[size:needed] = embeddings
+            bill_ids[size:needed] = [row[1] for row in rows]
+            chunk_texts.extend(row[2] for row in rows)
+            self._state = (matrix, bill_ids, chunk_texts, needed)
+            self.last_id = rows[-1][0]
+
+    def search(self, queries: Sequence[Sequence[float]], k: int) -> List[List[Hit]]:
+        """Top-k chunks by cosine similarity for each query vector, best first."""
+        matrix, bill_ids, chunk_texts, size = self._state
+        if size == 0 or len(queries) == 0:
+            return [[] for _ in queries]
+
+        query_matrix = np.array(queries, dtype=np.float32)
+        query_matrix /= np.maximum(np.linalg.norm(query_matrix, axis=1, keepdims=True), 1e-12)
+        scores = query_matrix @ matrix[:size].T
+
+        k = min(k, size)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row_scores, row_top in zip(scores, top):
+            order = row_top[np.argsort(-row_scores[row_top])]
+            results.append([(int(bill_ids[i]), float(row_scores[i]), chunk_texts[i]) for i in order])
+        return results
+
+    def refresh(self, fetch_rows: Callable[[int, int], Sequence[Tuple[int, int, str, str]]], batch_size: int = 5000,
+                count_rows: Optional[Callable[[int], int]] = None) -> int:
+        """
+        Loads every row with an id above last_id; returns how many were added.
+        With count_rows (rows with id <= a given id), rebuilds the index when rows were deleted.
+        """
+        if count_rows is not None and len(self) and count_rows(self.last_id) < len(self):
+            self._rebuild(fetch_rows, batch_size)
+            return 0
+        added = 0
+        while True:
+            rows = fetch_rows(self.last_id, batch_size)
+            self.add_rows(rows)
+            added += len(rows)
+            if len(rows) < batch_size:
+                return added
+
+    def _rebuild(self, fetch_rows, batch_size: int):
+        """Reloads every row into a fresh index, then swaps it in; searches keep using the old one meanwhile."""
+        started = time.monotonic()
+        fresh = VectorIndex(self.dimensions)
+        fresh.refresh(fetch_rows, batch_size)
+        with self._write_lock:
+            before = len(self)
+            self._state = fresh._state
+            self.last_id = fresh.last_id
+        logging.info(f"Vector index rebuilt after deletions: {before} -> {len(self)} chunks in {time.monotonic() - started:.1f}s")
+
+    def start_refresh(self, fetch_rows: Callable[[int, int], Sequence[Tuple[int, int, str, str]]], interval: float,
+                      batch_size: int = 5000, count_rows: Optional[Callable[[int], int]] = None):
+        """Loads the index and keeps it current from a background thread (idempotent)."""
+        with self._write_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._refresh_loop, args=(fetch_rows, interval, batch_size, count_rows),
+                name="vector-index-refresh", daemon=True
+            )
+        self._thread.start()
+
+    def _refresh_loop(self, fetch_rows, interval: float, batch_size: int, count_rows):
+        while True:
+            started = time.monotonic()
+            try:
+                added = self.refresh(fetch_rows, batch_size, count_rows)
+                if not self.ready:
+                    self.ready = True
+                    logging.info(f"Vector index loaded {len(self)} chunks in {time.monotonic() - started:.1f}s")
+                elif added:
+                    logging.info(f"Vector index added {added} chunks ({len(self)} total)")
+            except Exception as e:
+                # Searches fall back to the database until the first load completes
+                logging.error(f"Vector index refresh failed: {e}")
+            time.sleep(interval)
@@ -0,0 +1,82 @@
+-- Migration to coordinate multiple scraper workers through expiring work leases
+CREATE TABLE IF NOT EXISTS scraper_work_leases (
+    bill_key TEXT PRIMARY KEY,
+    worker_id TEXT NOT NULL,
+
+    -- 'leased' while a worker is processing the bill, 'done' once it has been
+    -- stored and 'released' when a worker gave it up unfinished
+    status TEXT NOT NULL DEFAULT 'leased' CHECK (status IN ('leased', 'done', 'released')),
+
+    -- A lease can be claimed by another worker once this has passed. Workers
+    -- push it forward with heartbeats; finished work keeps it for a cooldown
+    -- so other workers in the same run do not redo it.
+    lease_expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    heartbeat_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    claimed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    completed_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_scraper_work_leases_worker ON scraper_work_leases(worker_id) WHERE status = 'leased';
+CREATE INDEX IF NOT EXISTS idx_scraper_work_leases_expires ON scraper_work_leases(lease_expires_at);
+
+-- RLS: only the service role (scraper) touches this table
+ALTER TABLE scraper_work_leases ENABLE ROW LEVEL SECURITY;
+
+-- Atomically claim the given keys for a worker. Keys whose lease is held by a
+-- different worker and has not expired are skipped. Returns the claimed keys.
+CREATE OR REPLACE FUNCTION claim_scraper_leases(
+    p_worker_id TEXT,
+    p_bill_keys TEXT[],
+    p_lease_seconds INTEGER
+) RETURNS SETOF TEXT AS $$
+    INSERT INTO scraper_work_leases AS l (bill_key, worker_id, status, lease_expires_at, heartbeat_at, claimed_at, completed_at)
+    SELECT DISTINCT k, p_worker_id, 'leased', NOW() + make_interval(secs => p_lease_seconds), NOW(), NOW(), NULL::TIMESTAMPTZ
+    FROM unnest(p_bill_keys) AS k
+    ON CONFLICT (bill_key) DO UPDATE
+        SET worker_id = EXCLUDED.worker_id,
+            status = 'leased',
+            lease_expires_at = EXCLUDED.lease_expires_at,
+            heartbeat_at = NOW(),
+            claimed_at = NOW(),
+            completed_at = NULL
+        WHERE l.lease_expires_at < NOW()
+           OR (l.worker_id = p_worker_id AND l.status = 'leased')
+    RETURNING l.bill_key;
+$$ LANGUAGE sql;
+
+-- Extend every active lease held by a worker. Returns the number extended.
+CREATE OR REPLACE FUNCTION heartbeat_scraper_leases(
+    p_worker_id TEXT,
+    p_lease_seconds INTEGER
+) RETURNS INTEGER AS $$
+    WITH extended AS (
+        UPDATE scraper_work_leases
+        SET lease_expires_at = NOW() + make_interval(secs => p_lease_seconds),
+            heartbeat_at = NOW()
+        WHERE worker_id = p_worker_id AND status = 'leased'
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM extended;
+$$ LANGUAGE sql;
+
+-- Release leases held by a worker. Completed work is marked 'done' and kept
+-- for p_cooldown_seconds; unfinished work becomes claimable immediately.
+CREATE OR REPLACE FUNCTION release_scraper_leases(
+    p_worker_id TEXT,
+    p_bill_keys TEXT[],
+    p_completed BOOLEAN,
+    p_cooldown_seconds INTEGER
+) RETURNS INTEGER AS $$
+    WITH released AS (
+        UPDATE scraper_work_leases
+        SET status = CASE WHEN p_completed THEN 'done' ELSE 'released' END,
+            completed_at = CASE WHEN p_completed THEN NOW() ELSE NULL END,
+            lease_expires_at = CASE WHEN p_completed THEN NOW() + make_interval(secs => p_cooldown_seconds) ELSE NOW() END
+        WHERE worker_id = p_worker_id
+          AND status = 'leased'
+          AND bill_key = ANY(p_bill_keys)
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM released;
+$$ LANGUAGE sql;
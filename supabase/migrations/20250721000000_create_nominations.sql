@@ -0,0 +1,30 @@
+-- Migration to store presidential nominations synced from Congress.gov
+CREATE TABLE IF NOT EXISTS nominations (
+    id SERIAL PRIMARY KEY,
+    citation VARCHAR(20) NOT NULL UNIQUE,   -- e.g. PN123 or PN123-1 for partitioned nominations
+    congress INTEGER NOT NULL,
+    number INTEGER,
+    part_number VARCHAR(10),
+    description TEXT,
+    organization VARCHAR(255),
+    is_civilian BOOLEAN,
+    is_military BOOLEAN,
+    received_date DATE,
+    latest_action_date DATE,
+    latest_action_text TEXT,
+    update_date TIMESTAMP WITH TIME ZONE,
+    raw_data JSONB,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_nominations_congress ON nominations(congress);
+CREATE INDEX IF NOT EXISTS idx_nominations_received_date ON nominations(received_date DESC);
+CREATE INDEX IF NOT EXISTS idx_nominations_organization ON nominations(organization);
+
+-- RLS: readable by everyone, written only by the service role (scraper)
+ALTER TABLE nominations ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Nominations are viewable by everyone" ON nominations
+    FOR SELECT USING (true);
@@ -0,0 +1,38 @@
+-- Migration to make vector search over summary_embeddings index-backed
+
+-- HNSW cosine index. Databases created from the remote schema dump already
+-- have it under this name, in which case this is a no-op.
+CREATE INDEX IF NOT EXISTS summary_embeddings_embedding_idx
+    ON public.summary_embeddings
+    USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- Order by the distance expression itself rather than the similarity alias,
+-- otherwise the planner cannot use the index and scans every row.
+CREATE OR REPLACE FUNCTION public.match_summary_chunks(
+    query_embedding vector,
+    match_threshold double precision,
+    match_count integer
+) RETURNS TABLE(id bigint, summary_id bigint, bill_table_id integer, chunk_text text, source_column text, similarity double precision)
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  RETURN QUERY
+  SELECT
+    se.id,
+    se.summary_id,
+    se.bill_table_id,
+    se.chunk_text,
+    se.source_column,
+    1 - (se.embedding <=> query_embedding) AS similarity
+  FROM
+    summary_embeddings AS se
+  WHERE 1 - (se.embedding <=> query_embedding) > match_threshold
+  ORDER BY
+    se.embedding <=> query_embedding
+  LIMIT
+    match_count;
+END;
+$$;
+
+ANALYZE public.summary_embeddings;
@@ -0,0 +1,19 @@
+-- Migration adding compact ANN indexes over summary_embeddings for the query
+-- engine's first-pass search (VECTOR_PRECISION=half or binary in rag_backend).
+-- Rows keep their full-precision vector, which is used to re-score the
+-- over-fetched candidates exactly. Requires pgvector 0.7 or later.
+
+-- Half precision: half the size of the full-precision index, near-identical recall
+CREATE INDEX IF NOT EXISTS summary_embeddings_embedding_half_idx
+    ON public.summary_embeddings
+    USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- Binary quantization: 1 bit per dimension (32x smaller vectors); relies on
+-- over-fetching and exact re-scoring to recover recall
+CREATE INDEX IF NOT EXISTS summary_embeddings_embedding_bit_idx
+    ON public.summary_embeddings
+    USING hnsw ((binary_quantize(embedding)::bit(1536)) bit_hamming_ops)
+    WITH (m = 16, ef_construction = 64);
+
+ANALYZE public.summary_embeddings;
@@ -0,0 +1,15 @@
+-- Migration adding the full-text indexes behind the query engine's hybrid
+-- (lexical + vector) bill search. Expressions must match the search_lexical
+-- statement in rag_backend/query_engine.py exactly for the planner to use them.
+
+-- Already present in databases created from the remote schema dump
+CREATE INDEX IF NOT EXISTS idx_bills_title
+    ON public.bills
+    USING gin (to_tsvector('english', title));
+
+CREATE INDEX IF NOT EXISTS idx_ai_bill_summaries_what_it_does
+    ON public.ai_bill_summaries
+    USING gin (to_tsvector('english', what_it_does));
+
+ANALYZE public.bills;
+ANALYZE public.ai_bill_summaries;
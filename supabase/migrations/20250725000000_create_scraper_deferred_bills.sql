@@ -0,0 +1,17 @@
+-- Migration to persist the scraper's deferred bill queue between runs. Bills
+-- short-circuited by an open Congress API circuit breaker or left over when a
+-- run budget ran out are stored here and resumed by the next run, which starts
+-- on a fresh runner with no local state.
+CREATE TABLE IF NOT EXISTS scraper_deferred_bills (
+    bill_id TEXT PRIMARY KEY,
+
+    -- The bill's listing entry, as returned by the Congress API bill listing
+    bill_data JSONB NOT NULL,
+    deferred_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_scraper_deferred_bills_deferred_at ON scraper_deferred_bills(deferred_at);
+
+-- RLS: only the service role (scraper) touches this table
+ALTER TABLE scraper_deferred_bills ENABLE ROW LEVEL SECURITY;